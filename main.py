@@ -22,16 +22,206 @@ sys.path.insert(0, str(src_path))
 import inquirer
 from dotenv import load_dotenv
 from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.planning import PlanCache, RequestClassifier
+from bedtime_story_generator.core.prejudge import PreJudge, fix_formatting
+from bedtime_story_generator.core.revision_policy import RevisionPolicy
+from bedtime_story_generator.core.story_state import StoryStore
+from bedtime_story_generator.utils.feedback_index import FeedbackIndex
 from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import load_recent_sessions
 
 load_dotenv()
 
 
+def stream_to_terminal(chunks):
+    """Return a callback that prints story text as it arrives and records it in chunks."""
+    def on_delta(delta):
+        chunks.append(delta)
+        print(delta, end='', flush=True)
+    return on_delta
+
+
+def replaced_draft(orchestrator, text, streamed):
+    """Whether a revision replaced the streamed draft, rather than the pre-judge only tidying its formatting."""
+    draft = ''.join(streamed)
+    if orchestrator.pre_judge:
+        draft = fix_formatting(draft)
+    return text != draft
+
+
+def run_long_story(orchestrator, logger, store, state):
+    """Write a long story chapter by chapter, checkpointing each accepted chapter so it can be resumed."""
+    user_request = state.user_request
+    narrative_plan = state.narrative_plan
+    max_chapters = state.max_chapters
+
+    def accept(chapter, evaluation):
+        memory = orchestrator.latest_memory(user_request, state.chapters + [chapter])
+        store.checkpoint_chapter(state, chapter, evaluation, memory)
+
+    for chapter_num in range(state.next_chapter_number, max_chapters + 1):
+        print(f"\n{'='*60}")
+        print(f"CHAPTER {chapter_num}")
+        print(f"{'='*60}\n")
+        streamed = []
+        chapter, evaluation = orchestrator.generate_next_chapter(
+            user_request, narrative_plan, list(state.chapters), chapter_num, state.next_chapter_feedback,
+            on_delta=stream_to_terminal(streamed)
+        )
+        show_chapter = replaced_draft(orchestrator, chapter, streamed)
+        if show_chapter:
+            print(f"\n\nHere is an improved version of Chapter {chapter_num}:")
+        else:
+            print(f"\n\n{'='*60}\n")
+
+        # Chapter revision loop
+        while True:
+            if show_chapter:
+                print(f"\n{'='*60}")
+                print(f"CHAPTER {chapter_num}")
+                print(f"{'='*60}\n")
+                print(chapter)
+                print(f"\n{'='*60}\n")
+            show_chapter = True
+
+            if chapter_num < max_chapters:
+                # Start writing the next chapter while the reader reads this one
+                orchestrator.prefetch_next_chapter(
+                    user_request, narrative_plan, state.chapters + [chapter], chapter_num + 1
+                )
+                chapter_questions = [
+                    inquirer.List(
+                        'action',
+                        message="What would you like to do?",
+                        choices=[
+                            'Continue to next chapter',
+                            'Revise this chapter',
+                            'Add feedback for next chapter',
+                            'End story here',
+                            'Exit and provide feedback'
+                        ],
+                        carousel=True
+                    )
+                ]
+            else:
+                chapter_questions = [
+                    inquirer.List(
+                        'action',
+                        message="Final chapter - what would you like to do?",
+                        choices=[
+                            'Story is complete',
+                            'Revise this chapter',
+                            'Exit and provide feedback'
+                        ],
+                        carousel=True
+                    )
+                ]
+
+            chapter_answer = inquirer.prompt(chapter_questions)
+
+            if not chapter_answer:
+                orchestrator.cancel_prefetch(user_request)
+                accept(chapter, evaluation)
+                return
+
+            action = chapter_answer['action']
+            if action != 'Continue to next chapter':
+                orchestrator.cancel_prefetch(user_request)
+
+            if action == 'Continue to next chapter' or action == 'Story is complete':
+                accept(chapter, evaluation)
+                break
+            elif action == 'End story here':
+                accept(chapter, evaluation)
+                store.mark_complete(state)
+                return
+            elif action == 'Exit and provide feedback':
+                accept(chapter, evaluation)
+                # Get exit feedback
+                full_story = '\n\n'.join([f"CHAPTER {i+1}\n\n{ch}" for i, ch in enumerate(state.chapters)])
+                exit_feedback = input('\nWhat feedback would you like to provide about this story? ').strip()
+                if exit_feedback:
+                    logger.log_user_exit_feedback(exit_feedback, full_story)
+                    print("\nThank you for your feedback! It will help improve future stories.")
+                if state.can_resume:
+                    print("Your story is saved - choose 'Resume story' next time to continue it.")
+                return
+            elif action == 'Revise this chapter':
+                feedback = input('\nWhat would you like changed in this chapter? ').strip()
+                if feedback:
+                    chapter = orchestrator.revise_chapter_with_feedback(
+                        chapter, user_request, narrative_plan, feedback, chapter_num
+                    )
+                    evaluation = None
+                # Loop continues to show revised chapter
+            elif action == 'Add feedback for next chapter':
+                next_chapter_feedback = input('\nWhat should the next chapter include or focus on? ').strip()
+                accept(chapter, evaluation)
+                if next_chapter_feedback:
+                    store.set_next_chapter_feedback(state, next_chapter_feedback)
+                    print(f"\nFeedback noted for Chapter {chapter_num + 1}")
+                break
+
+        if chapter_num >= max_chapters:
+            store.mark_complete(state)
+            print(f"\nYou've reached the maximum of {max_chapters} chapters!")
+            break
+
+
+def choose_story_to_resume(store):
+    """Offer unfinished long stories; return the one chosen, None for a new story, or False to quit."""
+    stories = store.list_stories()
+    if not stories:
+        return None
+    choices = {'Start a new story': None}
+    for state in stories[:10]:
+        choices[f"Resume story: {state.describe()}"] = state
+    answer = inquirer.prompt([
+        inquirer.List('story', message="Start a new story or resume one?", choices=list(choices), carousel=True)
+    ])
+    if not answer:
+        return False
+    return choices[answer['story']]
+
+
 def main():
     """Run the bedtime story generator CLI application."""
     print("\nBEDTIME STORY GENERATOR\n")
-    logger = FeedbackLogger()
-    orchestrator = StoryOrchestrator(feedback_logger=logger)
+    logger = FeedbackLogger(background=True, index=FeedbackIndex('feedback_logs/feedback_index.db'))
+    # one pass over the logs, shared by everything that learns from them
+    sessions = load_recent_sessions(logger.log_dir)
+    orchestrator = StoryOrchestrator(
+        feedback_logger=logger,
+        revision_policy=RevisionPolicy.from_sessions(sessions),
+        pre_judge=PreJudge(),
+        planning='pipelined',
+        plan_cache=PlanCache.from_sessions(sessions),
+        request_classifier=RequestClassifier.from_sessions(sessions)
+    )
+    store = StoryStore()
+    try:
+        run_cli(orchestrator, logger, store)
+    finally:
+        # compacts the session and flushes any writes still queued
+        orchestrator.close()
+        logger.close()
+
+
+def run_cli(orchestrator, logger, store):
+    """Ask for a story (or one to resume) and tell it."""
+    resumed = choose_story_to_resume(store)
+    if resumed is False:
+        print('Goodbye!')
+        return
+    if resumed:
+        # plan, chapters and memory come from the checkpoint, so nothing is re-planned
+        logger.start_session(resumed.user_request, "long")
+        # so this session's chapters are filed under the story's plan like the original's
+        logger.log_narrative_plan(resumed.narrative_plan)
+        orchestrator.resume_long_story(resumed)
+        print(f"\nResuming \"{resumed.user_request}\" at Chapter {resumed.next_chapter_number}")
+        run_long_story(orchestrator, logger, store, resumed)
+        return
 
     user_request = input('What kind of story do you want to hear?\n').strip()
     if not user_request:
@@ -58,12 +248,23 @@ def main():
     if answers['length'].startswith('Short'):
         # Short story mode
         logger.start_session(user_request, "short")
-        story, evaluation, _revision_count = orchestrator.create_short_story(user_request)
+        print('\n' + '='*60 + '\n')
+        streamed = []
+        story, evaluation, _revision_count = orchestrator.create_short_story(
+            user_request, on_delta=stream_to_terminal(streamed)
+        )
+        show_story = replaced_draft(orchestrator, story, streamed)
+        if show_story:
+            print('\n\nHere is an improved version of your story:')
+        else:
+            print('\n\n' + '='*60 + '\n')
 
         while True:
-            print('\n' + '='*60 + '\n')
-            print(story)
-            print('\n' + '='*60 + '\n')
+            if show_story:
+                print('\n' + '='*60 + '\n')
+                print(story)
+                print('\n' + '='*60 + '\n')
+            show_story = True
 
             # Ask if user wants to revise
             revision_questions = [
@@ -107,93 +308,7 @@ def main():
         # Long story mode
         logger.start_session(user_request, "long")
         narrative_plan = orchestrator.init_long_story(user_request)
-        chapters = []
-        max_chapters = 20
-        next_chapter_feedback = None
-
-        for chapter_num in range(1, max_chapters + 1):
-            chapter, _evaluation = orchestrator.generate_next_chapter(
-                user_request, narrative_plan, chapters, chapter_num, next_chapter_feedback
-            )
-            next_chapter_feedback = None  # Clear feedback after use
-
-            # Chapter revision loop
-            while True:
-                print(f"\n{'='*60}")
-                print(f"CHAPTER {chapter_num}")
-                print(f"{'='*60}\n")
-                print(chapter)
-                print(f"\n{'='*60}\n")
-
-                if chapter_num < max_chapters:
-                    chapter_questions = [
-                        inquirer.List(
-                            'action',
-                            message="What would you like to do?",
-                            choices=[
-                                'Continue to next chapter',
-                                'Revise this chapter',
-                                'Add feedback for next chapter',
-                                'End story here',
-                                'Exit and provide feedback'
-                            ],
-                            carousel=True
-                        )
-                    ]
-                else:
-                    chapter_questions = [
-                        inquirer.List(
-                            'action',
-                            message="Final chapter - what would you like to do?",
-                            choices=[
-                                'Story is complete',
-                                'Revise this chapter',
-                                'Exit and provide feedback'
-                            ],
-                            carousel=True
-                        )
-                    ]
-
-                chapter_answer = inquirer.prompt(chapter_questions)
-
-                if not chapter_answer:
-                    chapters.append(chapter)
-                    return
-
-                action = chapter_answer['action']
-
-                if action == 'Continue to next chapter' or action == 'Story is complete':
-                    chapters.append(chapter)
-                    break
-                elif action == 'End story here':
-                    chapters.append(chapter)
-                    return
-                elif action == 'Exit and provide feedback':
-                    chapters.append(chapter)
-                    # Get exit feedback
-                    full_story = '\n\n'.join([f"CHAPTER {i+1}\n\n{ch}" for i, ch in enumerate(chapters)])
-                    exit_feedback = input('\nWhat feedback would you like to provide about this story? ').strip()
-                    if exit_feedback:
-                        logger.log_user_exit_feedback(exit_feedback, full_story)
-                        print("\nThank you for your feedback! It will help improve future stories.")
-                    return
-                elif action == 'Revise this chapter':
-                    feedback = input('\nWhat would you like changed in this chapter? ').strip()
-                    if feedback:
-                        chapter = orchestrator.revise_chapter_with_feedback(
-                            chapter, user_request, narrative_plan, feedback, chapter_num
-                        )
-                    # Loop continues to show revised chapter
-                elif action == 'Add feedback for next chapter':
-                    next_chapter_feedback = input('\nWhat should the next chapter include or focus on? ').strip()
-                    if next_chapter_feedback:
-                        print(f"\nFeedback noted for Chapter {chapter_num + 1}")
-                    chapters.append(chapter)
-                    break
-
-            if chapter_num >= max_chapters:
-                print(f"\nYou've reached the maximum of {max_chapters} chapters!")
-                break
+        run_long_story(orchestrator, logger, store, store.create(user_request, narrative_plan))
 
 
 if __name__ == "__main__":
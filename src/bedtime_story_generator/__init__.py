@@ -13,6 +13,7 @@ from bedtime_story_generator.core.models import (
     JudgeEvaluation,
     ChapterContext
 )
+from bedtime_story_generator.core.memory import NarrativeMemory
 from bedtime_story_generator.core.orchestrator import StoryOrchestrator
 from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
 
@@ -20,6 +21,7 @@ __all__ = [
     "NarrativePlan",
     "JudgeEvaluation",
     "ChapterContext",
+    "NarrativeMemory",
     "StoryOrchestrator",
     "FeedbackLogger",
 ]
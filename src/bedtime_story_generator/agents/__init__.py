@@ -3,6 +3,9 @@
 from bedtime_story_generator.agents.narrative_director import narrative_director
 from bedtime_story_generator.agents.storyteller import storyteller
 from bedtime_story_generator.agents.judge import judge
-from bedtime_story_generator.agents.revision import revision_agent
+from bedtime_story_generator.agents.revision import revision_agent, targeted_revision_agent
+from bedtime_story_generator.agents.memory_keeper import memory_keeper
+from bedtime_story_generator.agents.providers import FakeModelConfig, FakeModelProvider, fake_run_config
 
-__all__ = ['narrative_director', 'storyteller', 'judge', 'revision_agent']
+__all__ = ['narrative_director', 'storyteller', 'judge', 'revision_agent', 'targeted_revision_agent', 'memory_keeper',
+           'FakeModelConfig', 'FakeModelProvider', 'fake_run_config']
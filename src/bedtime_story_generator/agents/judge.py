@@ -2,6 +2,8 @@
 
 from agents import Agent, ModelSettings
 
+from bedtime_story_generator.agents.schemas import JudgeEvaluationOutput
+
 judge = Agent(
     name='Judge',
     instructions='''
@@ -21,21 +23,23 @@ judge = Agent(
     9. Continuity: Does it maintain consistency with previous chapters?
     10. Chapter ending: Does it provide closure while inviting continuation?
 
-    Return evaluation in JSON format:
-    {
-        'overall_score': 0.0-10.0,
-        'age_appropriate': true/false,
-        'feedback': 'detailed evaluation',
-        'strengths': ['strength1', 'strength2'],
-        'improvements_needed': ['improvement1', 'improvement2'],
-        'needs_revision': true/false,
-        'open_endedness_score': 0.0-10.0 (for long-form only)
-    }
+    Return your evaluation with these fields:
+    - overall_score: 0.0-10.0
+    - age_appropriate: true/false
+    - feedback: detailed evaluation
+    - strengths: list of strengths
+    - improvements_needed: list of specific improvements
+    - needs_revision: true/false
+    - open_endedness_score: 0.0-10.0 for long-form, null otherwise
+    - paragraph_issues: for problems confined to particular paragraphs, one entry per
+      paragraph with its number (as marked [n] in the story) and what to fix there;
+      leave empty when the problems run through the whole story
 
     Approval criteria:
     - overall_score >= 8.0 AND age_appropriate = true AND no critical issues
     - For long-form: open_endedness_score >= 7.0
 	''',
+    output_type=JudgeEvaluationOutput,
     model_settings=ModelSettings(
         model='gpt-3.5-turbo',
         temperature=0.1
@@ -0,0 +1,34 @@
+'''Memory Keeper Agent - Maintains a compact running memory of a long story.'''
+
+from agents import Agent, ModelSettings
+
+from bedtime_story_generator.agents.schemas import MemoryUpdateOutput
+
+memory_keeper = Agent(
+    name='MemoryKeeper',
+    instructions='''
+	You keep the running memory of a multi-chapter children's bedtime story.
+
+    You receive the current story memory and the newest chapter. Update the memory so
+    the next chapter can be written from it alone:
+    - story_so_far: a short summary of the whole story so far, oldest events most compressed
+    - characters: each named character with a one-line description (traits, relationships, where they are now)
+    - open_threads: unresolved plot threads, promises and mysteries still to pay off
+
+    Rules:
+    - Keep the summary under 150 words no matter how many chapters there are
+    - Drop threads that were resolved in the newest chapter
+    - Keep character descriptions consistent with what the story established
+    - Never invent events that did not happen
+
+    Return the updated memory with:
+    - story_so_far: the summary
+    - characters: a list of objects with the character's name and description
+    - open_threads: a list of the open threads
+	''',
+    output_type=MemoryUpdateOutput,
+    model_settings=ModelSettings(
+        model='gpt-3.5-turbo',
+        temperature=0.2
+    )
+)
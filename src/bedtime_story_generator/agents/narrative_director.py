@@ -2,6 +2,8 @@
 
 from agents import Agent, ModelSettings
 
+from bedtime_story_generator.agents.schemas import NarrativePlanOutput
+
 narrative_director = Agent(
     name='NarrativeDirector',
     instructions='''
@@ -22,18 +24,17 @@ narrative_director = Agent(
     - Are there natural chapter break points?
     - Does it allow for episodic adventures while maintaining continuity?
 
-    Return your analysis in JSON format:
-    {
-        'story_category': 'category name',
-        'story_arc': 'arc type',
-        'themes': ['theme1', 'theme2'],
-        'target_length': 'short or long',
-        'complexity_level': 'description',
-        'key_elements': ['element1', 'element2'],
-        'is_suitable_for_long_form': true/false,
-        'open_endedness_score': 0.0-10.0
-    }
+    Return your analysis with these fields:
+    - story_category: category name
+    - story_arc: arc type
+    - themes: list of themes
+    - target_length: short or long
+    - complexity_level: description
+    - key_elements: list of key story elements
+    - is_suitable_for_long_form: true/false
+    - open_endedness_score: 0.0-10.0
 	''',
+    output_type=NarrativePlanOutput,
     model_settings=ModelSettings(
         model='gpt-3.5-turbo',
         temperature=0.3
@@ -0,0 +1,320 @@
+'''Model Providers - Pluggable model backends for the story agents.
+
+``FakeModelProvider`` is a deterministic, offline stand-in for the OpenAI models.
+It recognises which of the story agents is calling from the agent's instructions
+and output schema, returns canned stories, plans, evaluations and memories, and
+simulates latency and token usage so the full pipeline can be exercised and
+benchmarked without network access or an API key.
+'''
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agents import ModelProvider, ModelResponse, ModelSettings, RunConfig, Usage
+from agents.models.interface import Model
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+CHARACTERS = ['Hazel', 'Pippin', 'Luna', 'Milo', 'Juniper', 'Otis', 'Willow', 'Fern']
+PLACES = ['the whispering meadow', 'the old oak grove', 'the quiet riverbank', 'the moonlit hill', 'the garden gate']
+SENTENCES = [
+    '{a} and {b} wandered toward {place}, where the grass was soft and cool.',
+    '{a} noticed a tiny glimmer of light and pointed it out to {b}.',
+    '"Let\'s follow it together," whispered {b}, holding {a}\'s paw.',
+    'The evening breeze carried the smell of clover and warm earth.',
+    '{a} remembered that being brave sometimes means asking for help.',
+    'They shared a snack of berries and laughed at the fireflies.',
+    '{b} found a smooth stone that shone like a little moon.',
+    'Step by step, the friends worked out the puzzle, taking turns to think.',
+    'An old owl blinked slowly and told them the way home was always close.',
+    'By the time the stars came out, {a} and {b} felt calm and happy.',
+]
+
+
+@dataclass
+class FakeModelConfig:
+    '''Behaviour of the fake model'''
+    latency_seconds: float = 0.0
+    seconds_per_output_token: float = 0.0
+    latency_jitter: float = 0.0
+    story_words: int = 500
+    judge_score: float = 8.5
+    revision_rate: float = 0.0
+    chars_per_token: float = 4.0
+    stream_chunk_words: int = 8
+    # fraction of stories that break the formatting rules or stop mid-sentence
+    flaw_rate: float = 0.0
+    # fraction of calls rejected with a rate-limit error
+    error_rate: float = 0.0
+
+
+class FakeRateLimitError(Exception):
+    '''Stand-in for a provider's HTTP 429 response'''
+    status_code = 429
+
+
+def _input_text(input: Any) -> str:
+    if isinstance(input, str):
+        return input
+    return json.dumps(input, default=str)
+
+
+def _seed(*parts: str) -> int:
+    return int(hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:12], 16)
+
+
+def _zero_counts(details_type: Any) -> Any:
+    '''Token-details object with every counter at zero, whatever the openai version'''
+    return details_type(**{name: 0 for name in details_type.model_fields})
+
+
+class FakeModel(Model):
+    '''Deterministic offline model returning canned agent outputs'''
+
+    def __init__(self, config: FakeModelConfig):
+        self.config = config
+        self._errors = random.Random(0)
+
+    def _maybe_reject(self):
+        if self.config.error_rate and self._errors.random() < self.config.error_rate:
+            raise FakeRateLimitError('Rate limit reached (simulated)')
+
+    async def get_response(
+            self,
+            system_instructions: Optional[str],
+            input: Any,
+            model_settings: ModelSettings,
+            tools: List[Any],
+            output_schema: Any,
+            handoffs: List[Any],
+            tracing: Any,
+            *,
+            previous_response_id: Optional[str] = None,
+            conversation_id: Optional[str] = None,
+            prompt: Any = None,
+            **kwargs: Any
+        ) -> ModelResponse:
+        self._maybe_reject()
+        text, usage = self._respond(system_instructions or '', _input_text(input), output_schema)
+        await asyncio.sleep(self._latency(text, usage.output_tokens))
+        return ModelResponse(output=[self._message(text)], usage=usage, response_id=None)
+
+    async def stream_response(
+            self,
+            system_instructions: Optional[str],
+            input: Any,
+            model_settings: ModelSettings,
+            tools: List[Any],
+            output_schema: Any,
+            handoffs: List[Any],
+            tracing: Any,
+            *,
+            previous_response_id: Optional[str] = None,
+            conversation_id: Optional[str] = None,
+            prompt: Any = None,
+            **kwargs: Any
+        ) -> AsyncIterator[Any]:
+        self._maybe_reject()
+        text, usage = self._respond(system_instructions or '', _input_text(input), output_schema)
+        words = text.split(' ')
+        chunk_size = max(1, self.config.stream_chunk_words)
+        chunks = [' '.join(words[i:i + chunk_size]) for i in range(0, len(words), chunk_size)]
+        delay = self._latency(text, usage.output_tokens) / max(1, len(chunks))
+
+        for index, chunk in enumerate(chunks):
+            await asyncio.sleep(delay)
+            yield ResponseTextDeltaEvent(
+                type='response.output_text.delta',
+                item_id='fake-message',
+                output_index=0,
+                content_index=0,
+                delta=chunk if index == len(chunks) - 1 else chunk + ' ',
+                logprobs=[],
+                sequence_number=index
+            )
+
+        yield ResponseCompletedEvent(
+            type='response.completed',
+            response=Response(
+                id='fake-response',
+                created_at=0,
+                model='fake-model',
+                object='response',
+                output=[self._message(text)],
+                tool_choice='none',
+                tools=[],
+                top_p=None,
+                parallel_tool_calls=False,
+                status='completed',
+                usage=ResponseUsage(
+                    input_tokens=usage.input_tokens,
+                    output_tokens=usage.output_tokens,
+                    total_tokens=usage.total_tokens,
+                    input_tokens_details=_zero_counts(InputTokensDetails),
+                    output_tokens_details=_zero_counts(OutputTokensDetails)
+                )
+            ),
+            sequence_number=len(chunks)
+        )
+
+    def _respond(self, instructions: str, input_text: str, output_schema: Any):
+        '''Produce the canned output text and simulated usage for a call'''
+        role = self._role(instructions, output_schema)
+        rng = random.Random(_seed(role, input_text))
+
+        if role == 'director':
+            output: Any = self._plan(input_text)
+        elif role == 'judge':
+            output = self._evaluation(rng, input_text)
+        elif role == 'memory':
+            output = self._memory(input_text)
+        elif role == 'paragraphs':
+            output = self._paragraph_revision(rng, input_text)
+        else:
+            output = self._story(rng)
+
+        if not isinstance(output, str):
+            wrapped = output_schema is not None and 'response' in output_schema.json_schema().get('properties', {})
+            output = json.dumps({'response': output} if wrapped else output)
+
+        input_tokens = int(len(instructions + input_text) / self.config.chars_per_token)
+        output_tokens = int(len(output) / self.config.chars_per_token)
+        usage = Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens
+        )
+        return output, usage
+
+    def _role(self, instructions: str, output_schema: Any) -> str:
+        if output_schema is not None:
+            name = output_schema.name()
+            if 'Judge' in name:
+                return 'judge'
+            if 'NarrativePlan' in name:
+                return 'director'
+            if 'ParagraphRevision' in name:
+                return 'paragraphs'
+            if 'MemoryUpdate' in name:
+                return 'memory'
+        lowered = instructions.lower()
+        if 'running memory' in lowered:
+            return 'memory'
+        if 'quality assurance' in lowered:
+            return 'judge'
+        if 'narrative planning' in lowered:
+            return 'director'
+        return 'story'
+
+    def _latency(self, text: str, output_tokens: int) -> float:
+        latency = self.config.latency_seconds + output_tokens * self.config.seconds_per_output_token
+        if self.config.latency_jitter:
+            latency *= 1 + random.Random(_seed('latency', text)).uniform(-1, 1) * self.config.latency_jitter
+        return max(0.0, latency)
+
+    def _story(self, rng: random.Random) -> str:
+        a, b = rng.sample(CHARACTERS, 2)
+        paragraphs, words = [], 0
+        while words < self.config.story_words:
+            paragraph = ' '.join(
+                rng.choice(SENTENCES).format(a=a, b=b, place=rng.choice(PLACES)) for _ in range(5)
+            )
+            paragraphs.append(paragraph)
+            words += len(paragraph.split())
+        paragraphs.append(f'{a} and {b} snuggled into their cozy beds and drifted off to sleep.')
+        if self.config.flaw_rate and rng.random() < self.config.flaw_rate:
+            if rng.random() < 0.5:
+                paragraphs[0] = f'# The Adventure of **{a}** and **{b}**\n\n{paragraphs[0]} 🌙'
+            else:
+                paragraphs[-1] = f'{a} and {b} snuggled into their cozy'
+        return '\n\n'.join(paragraphs)
+
+    def _plan(self, input_text: str) -> Dict[str, Any]:
+        is_long = 'Target length: long' in input_text
+        return {
+            'story_category': 'adventure',
+            'story_arc': 'Discovery',
+            'themes': ['friendship', 'courage'],
+            'target_length': 'long' if is_long else 'short',
+            'complexity_level': 'age 5-10',
+            'key_elements': ['two friends', 'a gentle mystery'],
+            'is_suitable_for_long_form': is_long,
+            'open_endedness_score': 8.0 if is_long else 0.0
+        }
+
+    def _evaluation(self, rng: random.Random, input_text: str) -> Dict[str, Any]:
+        needs_revision = rng.random() < self.config.revision_rate
+        score = self.config.judge_score - (2.0 if needs_revision else 0.0)
+        # flag the second of the numbered paragraphs, like a judge asking to tighten the middle
+        numbered = re.findall(r'\[(\d+)\] ', input_text)
+        flagged = min(2, len(numbered)) if needs_revision else 0
+        return {
+            'overall_score': score,
+            'age_appropriate': True,
+            'feedback': 'A warm, gentle story.' if not needs_revision else 'The middle drags a little.',
+            'strengths': ['gentle tone', 'clear structure'],
+            'improvements_needed': ['tighten the middle'] if needs_revision else [],
+            'needs_revision': needs_revision,
+            'open_endedness_score': 8.0 if 'LONG-FORM' in input_text else None,
+            'paragraph_issues': [{'paragraph': flagged, 'issue': 'tighten the middle'}] if flagged else []
+        }
+
+    def _paragraph_revision(self, rng: random.Random, input_text: str) -> Dict[str, Any]:
+        a, b = rng.sample(CHARACTERS, 2)
+        numbers = [int(number) for number in re.findall(r'Paragraph (\d+) issue:', input_text)]
+        return {'replacements': [
+            {
+                'paragraph': number,
+                'text': ' '.join(rng.choice(SENTENCES).format(a=a, b=b, place=rng.choice(PLACES)) for _ in range(5))
+            }
+            for number in numbers
+        ]}
+
+    def _memory(self, input_text: str) -> Dict[str, Any]:
+        chapter_count = input_text.count('Newest chapter (Chapter')
+        return {
+            'story_so_far': f'The friends have shared {chapter_count or 1} gentle adventures together.',
+            'characters': [
+                {'name': 'Hazel', 'description': 'a curious rabbit'},
+                {'name': 'Pippin', 'description': 'a thoughtful rabbit'}
+            ],
+            'open_threads': ['where the glimmer of light comes from']
+        }
+
+    def _message(self, text: str) -> ResponseOutputMessage:
+        return ResponseOutputMessage(
+            id='fake-message',
+            type='message',
+            role='assistant',
+            status='completed',
+            content=[ResponseOutputText(text=text, type='output_text', annotations=[], logprobs=[])]
+        )
+
+
+class FakeModelProvider(ModelProvider):
+    '''Model provider that serves every agent from the same FakeModel'''
+
+    def __init__(self, config: Optional[FakeModelConfig] = None):
+        self.config = config or FakeModelConfig()
+        self._model = FakeModel(self.config)
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self._model
+
+
+def fake_run_config(config: Optional[FakeModelConfig] = None) -> RunConfig:
+    '''RunConfig that routes every agent to the fake model with tracing off'''
+    return RunConfig(model_provider=FakeModelProvider(config), tracing_disabled=True)
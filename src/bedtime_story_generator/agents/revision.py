@@ -1,7 +1,9 @@
-'''Revision Agent - Improves stories based on judge feedback.'''
+'''Revision Agents - Improve stories based on judge feedback.'''
 
 from agents import Agent, ModelSettings
 
+from bedtime_story_generator.agents.schemas import ParagraphRevisionOutput
+
 revision_agent = Agent(
     name='RevisionAgent',
     instructions='''
@@ -26,3 +28,23 @@ revision_agent = Agent(
         temperature=0.7
     )
 )
+
+targeted_revision_agent = Agent(
+    name='TargetedRevisionAgent',
+    instructions='''
+	You are a story improvement specialist for children's literature.
+
+    You receive a story with numbered paragraphs and the paragraphs the judge wants
+    changed. Rewrite only those paragraphs:
+    - Return one replacement per listed paragraph, with its number and new text
+    - Fix the issue given for that paragraph and nothing else
+    - Keep each replacement consistent with the paragraphs before and after it
+    - Keep names, events and tone unchanged unless the issue asks otherwise
+    - Plain text only - no bold, italics, numbering, or special formatting
+	''',
+    output_type=ParagraphRevisionOutput,
+    model_settings=ModelSettings(
+        model='gpt-3.5-turbo',
+        temperature=0.7
+    )
+)
@@ -0,0 +1,72 @@
+'''Structured output schemas for agents that return data rather than prose.
+
+These mirror ``NarrativePlan`` and ``JudgeEvaluation`` field for field, but
+without default values so they translate to strict JSON schemas. Paragraph
+issues and replacements are plain objects so they serialize into the logs as is.
+Strict schemas cannot have free-form mappings, so the memory's characters are a
+list of name and description pairs.
+'''
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class NarrativePlanOutput:
+    '''Narrative Director output'''
+    story_category: str
+    story_arc: str
+    themes: List[str]
+    target_length: str
+    complexity_level: str
+    key_elements: List[str]
+    is_suitable_for_long_form: bool
+    open_endedness_score: float
+
+
+@dataclass
+class ParagraphIssueOutput:
+    '''A problem the judge found in one numbered paragraph'''
+    paragraph: int
+    issue: str
+
+
+@dataclass
+class JudgeEvaluationOutput:
+    '''Judge output'''
+    overall_score: float
+    age_appropriate: bool
+    feedback: str
+    strengths: List[str]
+    improvements_needed: List[str]
+    needs_revision: bool
+    open_endedness_score: Optional[float]
+    paragraph_issues: List[ParagraphIssueOutput]
+
+
+@dataclass
+class ParagraphReplacementOutput:
+    '''New text for one numbered paragraph'''
+    paragraph: int
+    text: str
+
+
+@dataclass
+class ParagraphRevisionOutput:
+    '''Targeted Revision Agent output'''
+    replacements: List[ParagraphReplacementOutput]
+
+
+@dataclass
+class CharacterOutput:
+    '''One character in the story memory'''
+    name: str
+    description: str
+
+
+@dataclass
+class MemoryUpdateOutput:
+    '''Memory Keeper output'''
+    story_so_far: str
+    characters: List[CharacterOutput]
+    open_threads: List[str]
@@ -5,11 +5,25 @@ from bedtime_story_generator.core.models import (
     JudgeEvaluation,
     ChapterContext
 )
+from bedtime_story_generator.core.cache import ResponseCache
+from bedtime_story_generator.core.memory import NarrativeMemory
 from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.planning import PlanCache, RequestClassifier
+from bedtime_story_generator.core.prejudge import PreJudge
+from bedtime_story_generator.core.revision_policy import RevisionPolicy
+from bedtime_story_generator.core.story_state import StoryState, StoryStore
 
 __all__ = [
     'NarrativePlan',
     'JudgeEvaluation',
     'ChapterContext',
+    'NarrativeMemory',
     'StoryOrchestrator',
+    'ResponseCache',
+    'PlanCache',
+    'PreJudge',
+    'RequestClassifier',
+    'RevisionPolicy',
+    'StoryState',
+    'StoryStore',
 ]
\ No newline at end of file
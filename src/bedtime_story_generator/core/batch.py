@@ -0,0 +1,222 @@
+'''Batch Runner - Generates short stories for a JSONL file of requests.
+
+Each input line is a JSON object with a ``user_request`` field and an optional
+``id``. Results are appended to the output JSONL as each story finishes, so an
+interrupted run can be resumed by pointing it at the same output file.
+
+Usage:
+    python -m bedtime_story_generator.core.batch requests.jsonl stories.jsonl --concurrency 8
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Set
+
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.scheduler import RequestScheduler
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+
+@dataclass
+class BatchReport:
+    '''Summary of a batch run'''
+    total_requests: int
+    skipped: int
+    completed: int
+    failed: int
+    elapsed_seconds: float
+    input_tokens: int
+    output_tokens: int
+
+    @property
+    def stories_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.completed * 60.0 / self.elapsed_seconds
+
+    @property
+    def tokens_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.input_tokens + self.output_tokens) * 60.0 / self.elapsed_seconds
+
+    def summary(self) -> str:
+        return (
+            f'{self.completed} completed, {self.failed} failed, {self.skipped} skipped '
+            f'of {self.total_requests} in {self.elapsed_seconds:.1f}s '
+            f'({self.stories_per_minute:.1f} stories/min, {self.tokens_per_minute:.0f} tokens/min)'
+        )
+
+
+def load_requests(input_path: str) -> List[Dict[str, str]]:
+    '''Load batch requests from a JSONL file, assigning line-number IDs where missing'''
+    requests = []
+    with open(input_path, 'r') as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if not entry.get('user_request'):
+                raise ValueError(f'{input_path}:{line_num} is missing "user_request"')
+            requests.append({
+                'id': str(entry.get('id', line_num)),
+                'user_request': entry['user_request']
+            })
+    return requests
+
+
+def _ends_with_newline(path: str) -> bool:
+    '''Whether a non-empty file ends in a newline (false after an interrupted write)'''
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    '''IDs that already have a successful result in the output file'''
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # a partially written last line from an interrupted run
+                continue
+            if not entry.get('error'):
+                completed.add(str(entry.get('id')))
+    return completed
+
+
+class BatchRunner:
+    '''Runs the plan/generate/judge/revise pipeline over many requests with bounded concurrency'''
+
+    def __init__(
+            self,
+            concurrency: int = 4,
+            log_dir: str = 'feedback_logs',
+            orchestrator_factory: Optional[Callable[[FeedbackLogger], StoryOrchestrator]] = None,
+            scheduler: Optional[RequestScheduler] = None
+        ):
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+        self.log_dir = log_dir
+        # shared by every worker, so together they stay within the provider's rate limits
+        self.scheduler = scheduler or RequestScheduler()
+        self.orchestrator_factory = orchestrator_factory or (
+            lambda logger: StoryOrchestrator(
+                show_spinner=False, feedback_logger=logger, scheduler=self.scheduler, priority='batch'
+            )
+        )
+
+    async def run(self, input_path: str, output_path: str) -> BatchReport:
+        '''Process every request not already completed in output_path'''
+        requests = load_requests(input_path)
+        done_ids = load_completed_ids(output_path)
+        pending = [r for r in requests if r['id'] not in done_ids]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for request in pending:
+            queue.put_nowait(request)
+
+        # workers share one logger; each story logs to its own session handle
+        logger = FeedbackLogger(log_dir=self.log_dir, background=True)
+        orchestrators = [
+            self.orchestrator_factory(logger)
+            for _ in range(min(self.concurrency, len(pending)))
+        ]
+        counts = {'completed': 0, 'failed': 0}
+        start = time.perf_counter()
+
+        with open(output_path, 'a') as out:
+            if not _ends_with_newline(output_path):
+                out.write('\n')
+
+            async def worker(orchestrator: StoryOrchestrator):
+                while True:
+                    try:
+                        request = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    result = await self._run_one(orchestrator, request)
+                    counts['failed' if result.get('error') else 'completed'] += 1
+                    out.write(json.dumps(result) + '\n')
+                    out.flush()
+
+            try:
+                await asyncio.gather(*[worker(o) for o in orchestrators])
+            finally:
+                logger.close()
+
+        return BatchReport(
+            total_requests=len(requests),
+            skipped=len(requests) - len(pending),
+            completed=counts['completed'],
+            failed=counts['failed'],
+            elapsed_seconds=time.perf_counter() - start,
+            input_tokens=sum(o.total_input_tokens for o in orchestrators),
+            output_tokens=sum(o.total_output_tokens for o in orchestrators)
+        )
+
+    async def _run_one(self, orchestrator: StoryOrchestrator, request: Dict[str, str]) -> dict:
+        '''Generate a single story, capturing failures as result entries'''
+        start = time.perf_counter()
+        input_before = orchestrator.total_input_tokens
+        output_before = orchestrator.total_output_tokens
+        result = {'id': request['id'], 'user_request': request['user_request']}
+
+        session = orchestrator.logger.start_session(request['user_request'], 'short')
+        try:
+            story, evaluation, revision_count = await orchestrator.create_short_story_async(
+                request['user_request'], session=session
+            )
+            result.update({
+                'story': story,
+                'evaluation': asdict(evaluation),
+                'revision_count': revision_count
+            })
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+        finally:
+            session.end()
+
+        result['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+        result['input_tokens'] = orchestrator.total_input_tokens - input_before
+        result['output_tokens'] = orchestrator.total_output_tokens - output_before
+        return result
+
+
+def main():
+    '''Command-line entry point for batch generation'''
+    parser = argparse.ArgumentParser(description='Generate bedtime stories for a JSONL file of requests.')
+    parser.add_argument('input', help='JSONL file with one {"user_request": ...} object per line')
+    parser.add_argument('output', help='JSONL file to append results to (re-run to resume)')
+    parser.add_argument('--concurrency', type=int, default=4, help='maximum stories in flight')
+    parser.add_argument('--log-dir', default='feedback_logs', help='feedback log directory')
+    parser.add_argument('--requests-per-minute', type=float, help="the model provider's request rate limit")
+    parser.add_argument('--tokens-per-minute', type=float, help="the model provider's token rate limit")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    scheduler = RequestScheduler(
+        requests_per_minute=args.requests_per_minute, tokens_per_minute=args.tokens_per_minute
+    )
+    runner = BatchRunner(concurrency=args.concurrency, log_dir=args.log_dir, scheduler=scheduler)
+    report = asyncio.run(runner.run(args.input, args.output))
+    print(report.summary())
+
+
+if __name__ == '__main__':
+    main()
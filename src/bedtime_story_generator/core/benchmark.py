@@ -0,0 +1,268 @@
+'''Benchmark - End-to-end pipeline benchmarks against the offline fake model.
+
+Runs ``create_short_story`` and a multi-chapter long story sequentially and under
+concurrent load, with every agent served by ``FakeModelProvider``, and reports
+latency percentiles and throughput. With the default zero simulated latency the
+numbers measure the orchestration overhead itself, so regressions show up in CI
+without network access or API spend.
+
+Usage:
+    python -m bedtime_story_generator.core.benchmark --runs 20 --concurrency 8 --chapters 20
+'''
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.planning import PLANNING_MODES
+from bedtime_story_generator.core.prejudge import PreJudge
+from bedtime_story_generator.core.scheduler import RequestScheduler
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+
+def percentile(values: List[float], pct: float) -> float:
+    '''Linearly interpolated percentile of values (pct in 0-100)'''
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class ScenarioResult:
+    '''Latency and throughput for one benchmark scenario'''
+    name: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    # seconds until the first story text, for jobs that report it
+    first_story_seconds: List[float] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    agent_calls: int = 0
+    accepted: int = 0
+    judge_calls_avoided: int = 0
+    retries: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def runs(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        '''Completed runs per second'''
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.runs / self.elapsed_seconds
+
+    @property
+    def calls_per_accepted(self) -> float:
+        '''Agent calls per short story or chapter handed back, the headline cost metric'''
+        return self.agent_calls / self.accepted if self.accepted else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'concurrency': self.concurrency,
+            'runs': self.runs,
+            'elapsed_seconds': round(self.elapsed_seconds, 4),
+            'throughput_per_second': round(self.throughput, 3),
+            'p50_seconds': round(percentile(self.latencies, 50), 4),
+            'p90_seconds': round(percentile(self.latencies, 90), 4),
+            'p99_seconds': round(percentile(self.latencies, 99), 4),
+            'time_to_first_story_p50_seconds': round(percentile(self.first_story_seconds, 50), 4),
+            'agent_calls': self.agent_calls,
+            'calls_per_accepted': round(self.calls_per_accepted, 3),
+            'judge_calls_avoided': self.judge_calls_avoided,
+            'retries': self.retries,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens
+        }
+
+    def summary(self) -> str:
+        avoided = f', {self.judge_calls_avoided} judge calls avoided' if self.judge_calls_avoided else ''
+        avoided += f', {self.retries} retries' if self.retries else ''
+        if self.first_story_seconds:
+            avoided += f', first story p50={percentile(self.first_story_seconds, 50) * 1000:.1f}ms'
+        return (
+            f'{self.name:<24} x{self.runs:<4} c={self.concurrency:<3} '
+            f'p50={percentile(self.latencies, 50) * 1000:8.1f}ms '
+            f'p90={percentile(self.latencies, 90) * 1000:8.1f}ms '
+            f'p99={percentile(self.latencies, 99) * 1000:8.1f}ms '
+            f'{self.throughput:7.2f}/s {self.agent_calls} calls ({self.calls_per_accepted:.2f} per accepted{avoided})'
+        )
+
+
+async def short_story_job(orchestrator: StoryOrchestrator, index: int, chapters: int) -> float:
+    '''One short story, end to end, returning the seconds until the first draft'''
+    request = f'A bunny who learns to share, variation {index}'
+    session = orchestrator.logger.start_session(request, 'short')
+    await orchestrator.create_short_story_async(request, session=session)
+    session.end()
+    return session.data['metrics']['time_to_first_story']['seconds']
+
+
+async def long_story_job(orchestrator: StoryOrchestrator, index: int, chapters: int):
+    '''A plan followed by ``chapters`` chapters, each built on the ones before'''
+    request = f'A dragon who is afraid of the dark, variation {index}'
+    session = orchestrator.logger.start_session(request, 'long')
+    narrative_plan = await orchestrator.init_long_story_async(request, session=session)
+    written: List[str] = []
+    for chapter_num in range(1, chapters + 1):
+        chapter, _ = await orchestrator.generate_next_chapter_async(
+            request, narrative_plan, written, chapter_num, session=session
+        )
+        written.append(chapter)
+    session.end()
+
+
+class Benchmark:
+    '''Runs benchmark scenarios with one orchestrator per concurrent worker and a shared logger'''
+
+    def __init__(
+            self,
+            model_config: Optional[FakeModelConfig] = None,
+            log_dir: Optional[str] = None,
+            orchestrator_factory: Optional[Callable[[FeedbackLogger], StoryOrchestrator]] = None
+        ):
+        self.model_config = model_config or FakeModelConfig()
+        self.log_dir = log_dir
+        self.orchestrator_factory = orchestrator_factory or (
+            lambda logger: StoryOrchestrator(
+                show_spinner=False,
+                feedback_logger=logger,
+                run_config=fake_run_config(self.model_config)
+            )
+        )
+
+    async def run_scenario(
+            self,
+            name: str,
+            job: Callable[[StoryOrchestrator, int, int], Any],
+            runs: int,
+            concurrency: int = 1,
+            chapters: int = 0
+        ) -> ScenarioResult:
+        '''Run ``job`` ``runs`` times with up to ``concurrency`` in flight'''
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        log_dir = self.log_dir or tempfile.mkdtemp(prefix='story-benchmark-')
+        result = ScenarioResult(name=name, concurrency=concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(runs):
+            queue.put_nowait(index)
+
+        logger = FeedbackLogger(log_dir=log_dir, background=True)
+        orchestrators = [self.orchestrator_factory(logger) for _ in range(min(concurrency, runs))]
+
+        async def worker(orchestrator: StoryOrchestrator):
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                first_story = await job(orchestrator, index, chapters)
+                result.latencies.append(time.perf_counter() - start)
+                if first_story is not None:
+                    result.first_story_seconds.append(first_story)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*[worker(o) for o in orchestrators])
+        finally:
+            result.elapsed_seconds = time.perf_counter() - start
+            logger.close()
+            if self.log_dir is None:
+                shutil.rmtree(log_dir, ignore_errors=True)
+
+        for orchestrator in orchestrators:
+            totals = orchestrator.usage.summary()['total']
+            result.agent_calls += totals['calls']
+            result.retries += totals['retries']
+            result.accepted += orchestrator.revision_stats['accepted']
+            result.judge_calls_avoided += orchestrator.prejudge_stats['judge_calls_avoided']
+            result.input_tokens += orchestrator.total_input_tokens
+            result.output_tokens += orchestrator.total_output_tokens
+        return result
+
+    async def run(self, runs: int = 20, concurrency: int = 8, chapters: int = 20) -> List[ScenarioResult]:
+        '''Short and long stories, each sequentially and under concurrent load'''
+        long_runs = max(1, runs // 4)
+        return [
+            await self.run_scenario('short/sequential', short_story_job, runs),
+            await self.run_scenario('short/concurrent', short_story_job, runs, concurrency),
+            await self.run_scenario(f'long-{chapters}/sequential', long_story_job, long_runs, 1, chapters),
+            await self.run_scenario(f'long-{chapters}/concurrent', long_story_job, long_runs, concurrency, chapters),
+        ]
+
+
+def main():
+    '''Command-line entry point for the benchmark suite'''
+    parser = argparse.ArgumentParser(description='Benchmark the story pipeline against the offline fake model.')
+    parser.add_argument('--runs', type=int, default=20, help='short stories per scenario (long stories run a quarter as many)')
+    parser.add_argument('--concurrency', type=int, default=8, help='stories in flight for the concurrent scenarios')
+    parser.add_argument('--chapters', type=int, default=20, help='chapters per long story')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per model call')
+    parser.add_argument('--seconds-per-token', type=float, default=0.0, help='simulated seconds per output token')
+    parser.add_argument('--revision-rate', type=float, default=0.0, help='fraction of evaluations that ask for a revision')
+    parser.add_argument('--candidates', type=int, default=1,
+                        help='write this many short-story candidates at once and keep the best (best-of-N)')
+    parser.add_argument('--flaw-rate', type=float, default=0.0,
+                        help='fraction of stories with markdown or a cut-off ending')
+    parser.add_argument('--prejudge', action='store_true',
+                        help='run the local pre-judge checks before calling the judge')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of model calls rejected with a simulated rate-limit error')
+    parser.add_argument('--planning', choices=PLANNING_MODES, default='sequential',
+                        help="'pipelined' drafts short stories while the plan is made")
+    parser.add_argument('--requests-per-minute', type=float, help='rate limit for the scheduler to respect')
+    parser.add_argument('--tokens-per-minute', type=float, help='token rate limit for the scheduler to respect')
+    parser.add_argument('--json', dest='json_path', help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    model_config = FakeModelConfig(
+        latency_seconds=args.latency,
+        seconds_per_output_token=args.seconds_per_token,
+        revision_rate=args.revision_rate,
+        flaw_rate=args.flaw_rate,
+        error_rate=args.error_rate
+    )
+    # one scheduler for every orchestrator, as the limits belong to the provider account
+    scheduler = RequestScheduler(
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute,
+        base_delay=0.05
+    )
+    orchestrator_factory = lambda logger: StoryOrchestrator(
+        show_spinner=False,
+        feedback_logger=logger,
+        run_config=fake_run_config(model_config),
+        quality_strategy='best_of_n' if args.candidates > 1 else 'sequential',
+        candidate_count=args.candidates,
+        pre_judge=PreJudge() if args.prejudge else None,
+        scheduler=scheduler,
+        planning=args.planning
+    )
+    benchmark = Benchmark(model_config, orchestrator_factory=orchestrator_factory)
+    results = asyncio.run(benchmark.run(args.runs, args.concurrency, args.chapters))
+    for result in results:
+        print(result.summary())
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+'''Response Cache - Content-addressed cache for agent outputs.
+
+Entries are keyed on the agent's name, instructions and model settings plus a
+hash of the prompt, so any change to an agent definition naturally misses. An
+in-memory LRU sits in front of an optional SQLite file that survives restarts.
+'''
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# storyteller and revision outputs are meant to vary, so only deterministic agents are cached
+DEFAULT_CACHED_AGENTS = ('NarrativeDirector', 'Judge')
+
+
+class ResponseCache:
+    '''LRU cache of agent outputs with optional SQLite persistence'''
+
+    def __init__(
+            self,
+            enabled_agents: Iterable[str] = DEFAULT_CACHED_AGENTS,
+            max_entries: int = 1024,
+            ttl_seconds: Optional[float] = 24 * 60 * 60,
+            max_temperature: Optional[float] = 0.5,
+            db_path: Optional[str] = None,
+            max_disk_entries: int = 100_000
+        ):
+        self.enabled_agents = set(enabled_agents)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.max_disk_entries = max_disk_entries
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        self._memory: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, agent TEXT, value TEXT, created_at REAL, last_access REAL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)')
+            self._db.commit()
+
+    def is_enabled_for(self, agent: Any) -> bool:
+        '''Whether outputs from this agent may be cached'''
+        if agent.name not in self.enabled_agents:
+            return False
+        temperature = getattr(agent.model_settings, 'temperature', None)
+        if self.max_temperature is not None and temperature is not None:
+            return temperature <= self.max_temperature
+        return True
+
+    def make_key(self, agent: Any, prompt: str) -> str:
+        '''Content hash of the agent definition, model settings and prompt'''
+        settings = asdict(agent.model_settings) if is_dataclass(agent.model_settings) else repr(agent.model_settings)
+        identity = json.dumps({
+            'agent': agent.name,
+            'model': str(agent.model),
+            'instructions': agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions),
+            'model_settings': settings,
+        }, sort_keys=True, default=repr)
+        digest = hashlib.sha256()
+        digest.update(identity.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, agent: Any, prompt: str) -> Optional[Any]:
+        '''Return the cached output for this call, or None on a miss'''
+        key = self.make_key(agent, prompt)
+        now = time.time()
+        value = None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and not self._expired(entry[0], now):
+                self._memory.move_to_end(key)
+                value = entry[1]
+            elif entry:
+                del self._memory[key]
+
+            if value is None and self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, created_at FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row and not self._expired(row[1], now):
+                    value = row[0]
+                    self._db.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+                    self._db.commit()
+                    self._remember(key, row[1], value)
+                elif row:
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._db.commit()
+
+            agent_stats = self.stats.setdefault(agent.name, {'hits': 0, 'misses': 0})
+            agent_stats['hits' if value is not None else 'misses'] += 1
+
+        if value is None:
+            return None
+        data = json.loads(value)
+        # structured outputs are stored as plain dicts and rebuilt as the agent's output type
+        output_type = getattr(agent, 'output_type', None)
+        if isinstance(data, dict) and is_dataclass(output_type):
+            try:
+                return output_type(**data)
+            except TypeError:
+                # stored under an older version of the schema
+                return None
+        return data
+
+    def set(self, agent: Any, prompt: str, output: Any):
+        '''Store an agent output'''
+        key = self.make_key(agent, prompt)
+        now = time.time()
+        value = json.dumps(asdict(output) if is_dataclass(output) else output)
+
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses (key, agent, value, created_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, agent.name, value, now, now)
+                )
+                self._db.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    'SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                    (self.max_disk_entries,)
+                )
+                self._db.commit()
+
+    def clear(self):
+        '''Drop every cached entry'''
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def close(self):
+        '''Close the SQLite backend, if any'''
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, created_at: float, value: str):
+        '''Insert into the in-memory LRU, evicting the least recently used entries'''
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
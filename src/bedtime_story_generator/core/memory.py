@@ -0,0 +1,103 @@
+'''Narrative Memory - Compact story-so-far state for long stories.
+
+Instead of pasting every previous chapter into the chapter prompt, long stories
+carry a rolling memory (summary, character sheet, open plot threads) that is
+updated once per chapter and always trimmed to a fixed token budget, so the
+prompt for chapter 20 is no larger than the prompt for chapter 3.
+'''
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+DEFAULT_TOKEN_BUDGET = 400
+# characters of the previous chapter's ending passed verbatim for a smooth hand-off
+PREVIOUS_ENDING_CHARS = 600
+
+
+def estimate_tokens(text: str) -> int:
+    '''Rough token count (about four characters per token for English prose)'''
+    return (len(text) + 3) // 4
+
+
+def _trim_to_chars(text: str, max_chars: int, keep_end: bool = True) -> str:
+    '''Trim text to max_chars on a sentence boundary where possible'''
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    if keep_end:
+        clipped = text[-max_chars:]
+        boundary = re.search(r'(?<=[.!?])\s+', clipped)
+        return clipped[boundary.end():] if boundary else clipped
+    clipped = text[:max_chars]
+    boundary = max(clipped.rfind('. '), clipped.rfind('! '), clipped.rfind('? '))
+    return clipped[:boundary + 1] if boundary > 0 else clipped
+
+
+@dataclass
+class NarrativeMemory:
+    '''Rolling memory of a long story, kept within a token budget'''
+    story_so_far: str = ''
+    characters: Dict[str, str] = field(default_factory=dict)
+    open_threads: List[str] = field(default_factory=list)
+    previous_ending: str = ''
+    chapters_covered: int = 0
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+
+    def to_prompt(self) -> str:
+        '''Render the memory as a prompt section'''
+        if not self.chapters_covered:
+            return ''
+
+        lines = [f'Story so far (chapters 1-{self.chapters_covered}):', self.story_so_far or '(none)']
+        if self.characters:
+            lines.append('\nCharacters:')
+            lines.extend(f'- {name}: {description}' for name, description in self.characters.items())
+        if self.open_threads:
+            lines.append('\nOpen plot threads:')
+            lines.extend(f'- {thread}' for thread in self.open_threads)
+        if self.previous_ending:
+            lines.append(f'\nHow Chapter {self.chapters_covered} ended:\n{self.previous_ending}')
+        return '\n'.join(lines)
+
+    def fit_to_budget(self) -> 'NarrativeMemory':
+        '''Trim the memory in place until its prompt fits the token budget'''
+        self.previous_ending = _trim_to_chars(self.previous_ending, PREVIOUS_ENDING_CHARS)
+        # threads and characters first, then the oldest parts of the summary
+        while estimate_tokens(self.to_prompt()) > self.token_budget and len(self.open_threads) > 3:
+            self.open_threads.pop(0)
+        while estimate_tokens(self.to_prompt()) > self.token_budget and len(self.characters) > 4:
+            self.characters.pop(next(iter(self.characters)))
+        for name, description in self.characters.items():
+            self.characters[name] = _trim_to_chars(description, 120, keep_end=False)
+        self.open_threads = [_trim_to_chars(thread, 120, keep_end=False) for thread in self.open_threads]
+
+        overflow = estimate_tokens(self.to_prompt()) - self.token_budget
+        if overflow > 0:
+            max_chars = max(0, len(self.story_so_far) - overflow * 4)
+            self.story_so_far = _trim_to_chars(self.story_so_far, max_chars)
+        overflow = estimate_tokens(self.to_prompt()) - self.token_budget
+        if overflow > 0:
+            self.previous_ending = _trim_to_chars(self.previous_ending, max(0, len(self.previous_ending) - overflow * 4))
+        return self
+
+
+def fallback_memory_update(memory: NarrativeMemory, chapter: str) -> NarrativeMemory:
+    '''Fold a chapter into the memory without a model call
+
+    Used when the Memory Keeper's output fails its schema even after retries: the
+    chapter's first sentence is appended to the summary and the budget trims the
+    oldest events.
+    '''
+    sentences = re.split(r'(?<=[.!?])\s+', chapter.strip())
+    opening = sentences[0] if sentences and sentences[0] else ''
+    chapter_num = memory.chapters_covered + 1
+    summary = f'{memory.story_so_far} Chapter {chapter_num}: {opening}'.strip()
+    return NarrativeMemory(
+        story_so_far=summary,
+        characters=dict(memory.characters),
+        open_threads=list(memory.open_threads),
+        previous_ending=chapter,
+        chapters_covered=chapter_num,
+        token_budget=memory.token_budget
+    ).fit_to_budget()
@@ -1,7 +1,9 @@
 '''Data models for the bedtime story system.'''
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from bedtime_story_generator.core.memory import NarrativeMemory
 
 
 @dataclass
@@ -27,6 +29,10 @@ class JudgeEvaluation:
     improvements_needed: List[str]
     needs_revision: bool
     open_endedness_score: Optional[float] = None
+    # {'paragraph': n, 'issue': ...} for problems confined to numbered paragraphs
+    paragraph_issues: List[Dict[str, Any]] = field(default_factory=list)
+    # set when local pre-judge checks failed the story without calling the judge
+    prejudged: bool = False
 
 
 @dataclass
@@ -35,4 +41,5 @@ class ChapterContext:
     chapter_number: int
     previous_chapters: List[str]
     narrative_plan: NarrativePlan
-    user_request: str
\ No newline at end of file
+    user_request: str
+    memory: Optional[NarrativeMemory] = None
@@ -1,62 +1,390 @@
 """Story Orchestrator - Coordinates multi-agent storytelling workflow."""
 
-import json
-from typing import List, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple, TypeVar
 from halo import Halo
-from agents import Runner
+from agents import ModelBehaviorError, RunConfig, Runner
+from agents.models import get_default_model
+from openai.types.responses import ResponseTextDeltaEvent
 
-from bedtime_story_generator.agents import narrative_director, storyteller, judge, revision_agent
+from bedtime_story_generator.agents import (
+    narrative_director, storyteller, judge, revision_agent, targeted_revision_agent, memory_keeper
+)
+from bedtime_story_generator.core.cache import ResponseCache
+from bedtime_story_generator.core.memory import NarrativeMemory, estimate_tokens, fallback_memory_update
 from bedtime_story_generator.core.models import NarrativePlan, JudgeEvaluation, ChapterContext
-from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.core.paragraphs import flagged_paragraphs, number_paragraphs, split_paragraphs, splice_paragraphs
+from bedtime_story_generator.core.planning import PLANNING_MODES, PlanCache, RequestClassifier, fallback_plan
+from bedtime_story_generator.core.prejudge import PreJudge, fix_formatting
+from bedtime_story_generator.core.revision_policy import REVISION_DECISIONS, RevisionPolicy
+from bedtime_story_generator.core.scheduler import PRIORITIES, RequestScheduler
+from bedtime_story_generator.core.story_state import StoryState
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger, FeedbackSession
+from bedtime_story_generator.utils.instrumentation import AGENT_STAGES, CallMetrics, UsageTracker
+
+T = TypeVar('T')
+
+# 'sequential' drafts one short story and revises it until the judge approves;
+# 'best_of_n' drafts several at once and keeps the best
+QUALITY_STRATEGIES = ('sequential', 'best_of_n')
+# judge's approval bar (see the judge instructions)
+ACCEPTANCE_SCORE = 8.0
+# 'targeted' rewrites only the paragraphs the judge flagged when it can; 'full' always rewrites everything
+REVISION_MODES = ('targeted', 'full')
+
+# token counter for the current task, used to attribute spend to speculative work
+_task_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar('task_usage', default=None)
+# calls made in the current task since its last logged generation
+_pending_calls: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar('pending_calls', default=None)
+# whether the current task's latest agent call was answered by the response cache
+_served_from_cache: ContextVar[bool] = ContextVar('served_from_cache', default=False)
+# feedback session that the current task logs to
+_feedback_session: ContextVar[Optional[FeedbackSession]] = ContextVar('feedback_session', default=None)
+# scheduler lane for the current task's model calls, overriding the orchestrator's own
+_priority: ContextVar[Optional[str]] = ContextVar('priority', default=None)
+
+
+def _bind_session(method: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+    '''Make a call's ``session`` keyword the feedback session for everything it does'''
+    @functools.wraps(method)
+    async def wrapper(self: 'StoryOrchestrator', *args: Any, **kwargs: Any) -> T:
+        session = kwargs.get('session')
+        if session is None:
+            return await method(self, *args, **kwargs)
+        token = _feedback_session.set(session)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _feedback_session.reset(token)
+    return wrapper
+
+
+@dataclass
+class ChapterPrefetch:
+    '''A speculative chapter generation running in the background'''
+    key: Tuple[Any, ...]
+    task: asyncio.Task
+    session: Any = None
+    usage: Dict[str, int] = field(default_factory=lambda: {'input_tokens': 0, 'output_tokens': 0})
+
 
 class StoryOrchestrator:
-    '''Orchestrates the multi-agent storytelling system'''
+    '''Orchestrates the multi-agent storytelling system
+
+    Every public method has an ``*_async`` variant that awaits ``Runner.run`` so a
+    single event loop can drive many stories concurrently. The synchronous methods
+    are thin wrappers that run the async variant on a background event loop owned
+    by the orchestrator.
+    '''
 
-    def __init__(self, show_spinner: bool = True, feedback_logger: Optional[FeedbackLogger] = None):
+    def __init__(
+            self,
+            show_spinner: bool = True,
+            feedback_logger: Optional[FeedbackLogger] = None,
+            response_cache: Optional[ResponseCache] = None,
+            run_config: Optional[RunConfig] = None,
+            quality_strategy: str = 'sequential',
+            candidate_count: int = 3,
+            candidate_token_budget: Optional[int] = None,
+            revision_policy: Optional[RevisionPolicy] = None,
+            pre_judge: Optional[PreJudge] = None,
+            scheduler: Optional[RequestScheduler] = None,
+            priority: str = 'interactive',
+            planning: str = 'sequential',
+            plan_cache: Optional[PlanCache] = None,
+            request_classifier: Optional[RequestClassifier] = None
+        ):
+        if quality_strategy not in QUALITY_STRATEGIES:
+            raise ValueError(f'quality_strategy must be one of {QUALITY_STRATEGIES}')
+        if planning not in PLANNING_MODES:
+            raise ValueError(f'planning must be one of {PLANNING_MODES}')
+        if priority not in PRIORITIES:
+            raise ValueError(f'priority must be one of {PRIORITIES}')
         self.show_spinner = show_spinner
+        # overrides the model provider, e.g. with the offline FakeModelProvider
+        self.run_config = run_config
+        # rate limits, retries and timeouts for every model call; share one to share the limits
+        self.scheduler = scheduler or RequestScheduler()
+        self.priority = priority
+        # 'pipelined' drafts short stories while the director plans them
+        self.planning = planning
+        self.plan_cache = plan_cache if plan_cache is not None else PlanCache()
+        # plans new requests like past ones locally, leaving the director the unfamiliar ones
+        self.request_classifier = request_classifier
         self.max_revisions = 2
+        self.revision_policy = revision_policy or RevisionPolicy()
+        self.revision_mode = 'targeted'
+        # flagging more of the story than this falls back to a full rewrite
+        self.max_targeted_fraction = 0.5
+        self.revision_mode_stats = {mode: 0 for mode in REVISION_MODES}
+        # policy decisions, and stories or chapters handed back to the reader
+        self.revision_stats = {'accepted': 0, **{decision: 0 for decision in REVISION_DECISIONS}}
+        self.quality_strategy = quality_strategy
+        self.candidate_count = candidate_count
+        # caps the tokens one best-of-N round may spend, by writing fewer candidates
+        self.candidate_token_budget = candidate_token_budget
         self.logger = feedback_logger or FeedbackLogger()
+        self.cache = response_cache if response_cache is not None else ResponseCache()
+        self.judge_stats = {'calls': 0, 'calls_saved': 0}
+        # local checks that fix formatting and fail obviously bad stories before the judge sees them
+        self.pre_judge = pre_judge
+        self.prejudge_stats = {'judge_calls_avoided': 0, 'formatting_fixes': 0}
+        self.max_output_retries = 2
+        self.parse_failures: Dict[str, int] = {}
+        self.max_remembered_evaluations = 256
+        self._evaluations: 'OrderedDict[str, JudgeEvaluation]' = OrderedDict()
+        self.memory_token_budget = 400
+        self.max_remembered_memories = 512
+        self._memories: 'OrderedDict[str, NarrativeMemory]' = OrderedDict()
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.usage = UsageTracker()
+        self.prefetch_stats = {
+            'started': 0,
+            'hits': 0,
+            'discarded': 0,
+            'wasted_input_tokens': 0,
+            'wasted_output_tokens': 0
+        }
+        # one speculative chapter per story, keyed by its user request, so stories sharing
+        # the orchestrator never discard each other's; the oldest go past the cap
+        self.max_prefetches = 8
+        self._prefetches: 'OrderedDict[str, ChapterPrefetch]' = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
 
-    def _parse_json_response(self, response: str, fallback: dict) -> dict:
-        '''Safely parse JSON response with fallback'''
+    def _run_sync(self, coro: Coroutine[Any, Any, T]) -> T:
+        '''Run a coroutine on the orchestrator's background loop and wait for the result'''
         try:
-            # Try to find JSON in response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-        except json.JSONDecodeError:
+            asyncio.get_running_loop()
+        except RuntimeError:
             pass
-        return fallback
+        else:
+            coro.close()
+            raise RuntimeError(
+                'Synchronous StoryOrchestrator methods cannot be called from a running '
+                'event loop; await the *_async variant instead.'
+            )
+
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='story-orchestrator-loop',
+                    daemon=True
+                )
+                self._loop_thread.start()
+            loop = self._loop
+
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self):
+        '''Stop the background event loop used by the synchronous methods'''
+        if self._prefetches and self._loop and not self._loop.is_closed():
+            self._run_sync(self.cancel_prefetch_async())
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread:
+                self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
+
+    def _log(self) -> Any:
+        '''Feedback session for the current task, or the logger (its latest session) if none was passed'''
+        return _feedback_session.get() or self.logger
+
+    async def _run_agent(self, agent: Any, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> Any:
+        '''Run an agent on a prompt and return its final output
+
+        When ``on_delta`` is given the agent is run with the streaming runner and the
+        callback receives each text delta as it arrives. Outputs of agents enabled in
+        the response cache are served from it when the same call was made before.
+        Every call goes through the scheduler, which rate limits it and retries
+        transient failures (a streamed call only until its first delta). Agents with
+        a structured ``output_type`` are also retried when the model's output does
+        not match the schema. Whether the call was served from the cache is left in
+        ``_served_from_cache`` for the caller.
+        '''
+        start = time.perf_counter()
+        _served_from_cache.set(False)
+        cacheable = self.cache.is_enabled_for(agent)
+        if cacheable:
+            cached = self.cache.get(agent, prompt)
+            if cached is not None:
+                _served_from_cache.set(True)
+                self._record_call(agent, start, cache_hit=True)
+                if on_delta:
+                    on_delta(cached)
+                return cached
+
+        attempts = 0
+        streamed = False
+
+        async def attempt() -> Any:
+            nonlocal attempts, streamed
+            attempts += 1
+            if not on_delta:
+                return await Runner.run(agent, prompt, run_config=self.run_config)
+            result = Runner.run_streamed(agent, prompt, run_config=self.run_config)
+            async for delta in self._text_deltas(result):
+                streamed = True
+                on_delta(delta)
+            return result
+
+        estimated_tokens = self._estimated_tokens(agent, prompt)
+        priority = _priority.get() or self.priority
+        parse_retries = 0
+        while True:
+            try:
+                result = await self.scheduler.run(attempt, estimated_tokens, priority, retryable=lambda: not streamed)
+                break
+            except ModelBehaviorError:
+                if agent.output_type is None or parse_retries >= self.max_output_retries:
+                    raise
+                parse_retries += 1
+                self.parse_failures[agent.name] = self.parse_failures.get(agent.name, 0) + 1
+                self._log().increment_session_metric('parse_failures', agent.name)
+
+        usage = result.context_wrapper.usage
+        self.scheduler.settle(estimated_tokens, usage.input_tokens + usage.output_tokens)
+        self._record_call(
+            agent, start, input_tokens=usage.input_tokens, output_tokens=usage.output_tokens, retry_count=attempts - 1
+        )
+        self.total_input_tokens += usage.input_tokens
+        self.total_output_tokens += usage.output_tokens
+        task_usage = _task_usage.get()
+        if task_usage is not None:
+            task_usage['input_tokens'] += usage.input_tokens
+            task_usage['output_tokens'] += usage.output_tokens
+        if cacheable:
+            self.cache.set(agent, prompt, result.final_output)
+        return result.final_output
+
+    def _estimated_tokens(self, agent: Any, prompt: str) -> int:
+        '''Tokens a call should use, for rate limiting before its real usage is known'''
+        totals = self.usage.summary()['by_stage'].get(AGENT_STAGES.get(agent.name, agent.name))
+        made = totals['calls'] - totals['cache_hits'] if totals else 0
+        # average output of this stage so far, or about a 700-word story
+        output_tokens = totals['output_tokens'] // made if made else 1000
+        return estimate_tokens(str(agent.instructions) + prompt) + output_tokens
+
+    def _record_call(
+            self,
+            agent: Any,
+            start: float,
+            input_tokens: int = 0,
+            output_tokens: int = 0,
+            cache_hit: bool = False,
+            retry_count: int = 0
+        ):
+        '''Record metrics for an agent call, globally and for the current task'''
+        if isinstance(agent.model, str):
+            model = agent.model
+        elif agent.model is not None:
+            model = type(agent.model).__name__
+        else:
+            model = get_default_model()
+
+        metrics = CallMetrics(
+            agent=agent.name,
+            model=model,
+            stage=AGENT_STAGES.get(agent.name, agent.name),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_seconds=round(time.perf_counter() - start, 3),
+            cache_hit=cache_hit,
+            retry_count=retry_count
+        )
+        self.usage.record(metrics)
+
+        pending = _pending_calls.get()
+        if pending is None:
+            pending = []
+            _pending_calls.set(pending)
+        pending.append(metrics.to_dict())
 
-    def create_narrative_plan(self, user_request: str, target_length: str) -> NarrativePlan:
+    def _drain_calls(self) -> List[Dict[str, Any]]:
+        '''Take the calls made in this task since the last logged generation'''
+        calls = _pending_calls.get() or []
+        _pending_calls.set([])
+        return calls
+
+    async def _text_deltas(self, streamed_result: Any) -> AsyncIterator[str]:
+        '''Yield output text deltas from a streaming run result'''
+        async for event in streamed_result.stream_events():
+            if event.type == 'raw_response_event' and isinstance(event.data, ResponseTextDeltaEvent):
+                yield event.data.delta
+
+    def create_narrative_plan(
+            self,
+            user_request: str,
+            target_length: str,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> NarrativePlan:
         """Create narrative plan using the Narrative Director agent"""
+        return self._run_sync(self.create_narrative_plan_async(user_request, target_length, session=session))
+
+    @_bind_session
+    async def create_narrative_plan_async(
+            self,
+            user_request: str,
+            target_length: str,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> NarrativePlan:
+        """Create narrative plan using the Narrative Director agent
+
+        Plans are served from the plan cache when the same request (give or take
+        wording like "tell me a story about") was planned before, and otherwise by
+        the request classifier when it is confident.
+        """
+        return self._known_plan(user_request, target_length) or await self._direct_plan(user_request, target_length)
+
+    def _known_plan(self, user_request: str, target_length: str) -> Optional[NarrativePlan]:
+        '''A plan from the plan cache or a confident request classifier (logged), or None'''
+        cached = self.plan_cache.get(user_request, target_length)
+        self._log().increment_session_metric('plan_cache', 'hits' if cached else 'misses')
+        if cached:
+            self._log().log_narrative_plan(cached)
+            return cached
+        if self.request_classifier is not None:
+            local_plan = self.request_classifier.classify(user_request, target_length)
+            self._log().increment_session_metric('request_classifier', 'local' if local_plan else 'deferred')
+            if local_plan:
+                self._log().log_narrative_plan(local_plan)
+                return local_plan
+        return None
+
+    async def _direct_plan(self, user_request: str, target_length: str) -> NarrativePlan:
+        '''Ask the Narrative Director for a plan and remember it'''
         prompt = f"""
         Analyze this story request and create a narrative plan.
 
         User request: {user_request}
         Target length: {target_length}
-
-        Provide your analysis in JSON format.
         """
 
-        result = Runner.run_sync(narrative_director, prompt)
-        response = result.final_output
-
-        parsed = self._parse_json_response(response, {
-            'story_category': 'general',
-            'story_arc': 'simple journey',
-            'themes': ['friendship', 'courage'],
-            'target_length': target_length,
-            'complexity_level': 'age 5-10',
-            'key_elements': ['character growth'],
-            'is_suitable_for_long_form': target_length == 'long',
-            'open_endedness_score': 7.0 if target_length == 'long' else 0.0
-        })
+        output = await self._run_agent(narrative_director, prompt)
 
-        narrative_plan = NarrativePlan(**{k: v for k, v in parsed.items() if k in NarrativePlan.__annotations__})
-        self.logger.log_narrative_plan(narrative_plan)
+        # the requested length is authoritative; downstream prompts branch on it
+        narrative_plan = NarrativePlan(**{**asdict(output), 'target_length': target_length})
+        self.plan_cache.put(user_request, narrative_plan)
+        if self.request_classifier is not None:
+            self.request_classifier.add(user_request, narrative_plan)
+        self._log().log_narrative_plan(narrative_plan, calls=self._drain_calls())
         return narrative_plan
 
     def generate_story(
@@ -64,12 +392,71 @@ class StoryOrchestrator:
             user_request: str,
             narrative_plan: NarrativePlan,
             chapter_context: Optional[ChapterContext] = None,
-            user_feedback: Optional[str] = None
+            user_feedback: Optional[str] = None,
+            on_delta: Optional[Callable[[str], None]] = None
         ) -> str:
         '''Generate story using the Storyteller agent'''
+        return self._run_sync(self.generate_story_async(user_request, narrative_plan, chapter_context, user_feedback, on_delta))
+
+    async def generate_story_async(
+            self,
+            user_request: str,
+            narrative_plan: Optional[NarrativePlan],
+            chapter_context: Optional[ChapterContext] = None,
+            user_feedback: Optional[str] = None,
+            on_delta: Optional[Callable[[str], None]] = None
+        ) -> str:
+        '''Generate story using the Storyteller agent
+
+        Pass ``on_delta`` to receive the story text incrementally as it is written.
+        A short story can be drafted without a plan (``narrative_plan=None``) from
+        the request alone.
+        '''
+        prompt = self._build_story_prompt(user_request, narrative_plan, chapter_context, user_feedback)
+        story = await self._run_agent(storyteller, prompt, on_delta=on_delta)
+
+        return self._tidy(story)
+
+    async def generate_story_stream(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            chapter_context: Optional[ChapterContext] = None,
+            user_feedback: Optional[str] = None
+        ) -> AsyncIterator[str]:
+        '''Stream story text deltas from the Storyteller agent as they arrive'''
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def produce():
+            try:
+                await self.generate_story_async(
+                    user_request, narrative_plan, chapter_context, user_feedback, on_delta=queue.put_nowait
+                )
+            finally:
+                queue.put_nowait(done)
+
+        task = asyncio.create_task(produce())
+        try:
+            while (delta := await queue.get()) is not done:
+                yield delta
+            await task
+        finally:
+            task.cancel()
+
+    def _build_story_prompt(
+            self,
+            user_request: str,
+            narrative_plan: Optional[NarrativePlan],
+            chapter_context: Optional[ChapterContext] = None,
+            user_feedback: Optional[str] = None
+        ) -> str:
+        '''Build the Storyteller prompt for a complete story or a chapter'''
         if chapter_context:
             previous_summary = ""
-            if chapter_context.previous_chapters:
+            if chapter_context.memory and chapter_context.memory.chapters_covered:
+                previous_summary = '\n\n' + chapter_context.memory.to_prompt()
+            elif chapter_context.previous_chapters:
                 previous_summary = '\n\nPrevious chapters summary:\n' + '\n'.join([f'Chapter {i+1}: {ch[:200]}...' for i, ch in enumerate(chapter_context.previous_chapters)])
 
             user_feedback_section = ''
@@ -95,6 +482,21 @@ class StoryOrchestrator:
             - Plain text only - no bold, italics, or special formatting
             - No emojis
             - 400-600 words"""
+        elif narrative_plan is None:
+            prompt = f"""
+            Write a complete bedtime story based on this request.
+
+            User request: {user_request}
+            Choose a fitting story arc and one or two gentle themes yourself.
+
+            Requirements:
+            - Complete story with beginning, middle, and end
+            - Age-appropriate for 5-10 year olds
+            - Bedtime-suitable (calming, positive)
+            - Plain text only - no bold, italics, or special formatting
+            - No emojis
+            - 500-800 words
+            """
         else:
             prompt = f"""
             Write a complete bedtime story based on this request.
@@ -115,19 +517,38 @@ class StoryOrchestrator:
             - 500-800 words
             """
 
-        result = Runner.run_sync(storyteller, prompt)
-        story = result.final_output
-
-        return story
+        return prompt
 
     def evaluate_story(
             self,
             story: str,
             user_request: str,
             narrative_plan: NarrativePlan,
-            is_chapter: bool = False
+            is_chapter: bool = False,
+            *,
+            session: Optional[FeedbackSession] = None
         ) -> JudgeEvaluation:
         '''Evaluate story using the Judge agent'''
+        return self._run_sync(self.evaluate_story_async(story, user_request, narrative_plan, is_chapter, session=session))
+
+    @_bind_session
+    async def evaluate_story_async(
+            self,
+            story: str,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            is_chapter: bool = False,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> JudgeEvaluation:
+        '''Evaluate story using the Judge agent
+
+        With a ``pre_judge`` the story's formatting is fixed first, and a story
+        that fails the local checks gets their evaluation instead of a judge call.
+        '''
+        judgement = self.pre_judge.check(story) if self.pre_judge else None
+        if judgement:
+            story = judgement.story
         story_type = 'chapter' if is_chapter else 'complete story'
         long_form_note = ''
         if narrative_plan.target_length == 'long':
@@ -140,31 +561,72 @@ class StoryOrchestrator:
         Narrative plan themes: {', '.join(narrative_plan.themes)}
         {long_form_note}
 
-        Story to evaluate:
-        {story}
-
-        Provide your evaluation in JSON format.
+        Story to evaluate (paragraphs are numbered [n]):
+        {number_paragraphs(split_paragraphs(story))}
         """
 
-        result = Runner.run_sync(judge, prompt)
-        response = result.final_output
-
-        parsed = self._parse_json_response(response, {
-            'overall_score': 7.5,
-            'age_appropriate': True,
-            'feedback': 'Story meets basic requirements',
-            'strengths': ['age-appropriate'],
-            'improvements_needed': [],
-            'needs_revision': False,
-            'open_endedness_score': 7.0 if narrative_plan.target_length == 'long' else None
-        })
+        # the prompt captures the exact text and context, so identical prompts never need re-judging
+        memo_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        if memo_key in self._evaluations:
+            self._evaluations.move_to_end(memo_key)
+            self._count_judge_call(saved=True)
+            return self._evaluations[memo_key]
+
+        if judgement and judgement.verdict == 'fail':
+            evaluation = judgement.evaluation()
+            self._count_prejudge('judge_calls_avoided')
+        else:
+            output = await self._run_agent(judge, prompt)
+            self._count_judge_call(saved=_served_from_cache.get())
+            evaluation = JudgeEvaluation(**asdict(output))
+
+        self._evaluations[memo_key] = evaluation
+        while len(self._evaluations) > self.max_remembered_evaluations:
+            self._evaluations.popitem(last=False)
+        return evaluation
 
-        return JudgeEvaluation(**{k: v for k, v in parsed.items() if k in JudgeEvaluation.__annotations__})
+    def _count_judge_call(self, saved: bool):
+        '''Count a judge call made or avoided, globally and for the current session'''
+        counter = 'calls_saved' if saved else 'calls'
+        self.judge_stats[counter] += 1
+        self._log().increment_session_metric('judge', counter)
+
+    def _count_prejudge(self, counter: str):
+        '''Count a pre-judge outcome, globally and for the current session'''
+        self.prejudge_stats[counter] += 1
+        self._log().increment_session_metric('prejudge', counter)
+
+    def _tidy(self, story: str) -> str:
+        '''Fix formatting-only problems locally when the pre-judge is on'''
+        if self.pre_judge is None:
+            return story
+        fixed = fix_formatting(story)
+        if fixed != story.strip():
+            self._count_prejudge('formatting_fixes')
+        return fixed
 
     def revise_story(self, original_story: str, evaluation: JudgeEvaluation,
                     user_request: str, narrative_plan: NarrativePlan,
                     user_feedback: Optional[str] = None) -> str:
         '''Revise story using the Revision Agent'''
+        return self._run_sync(self.revise_story_async(original_story, evaluation, user_request, narrative_plan, user_feedback))
+
+    async def revise_story_async(self, original_story: str, evaluation: JudgeEvaluation,
+                                 user_request: str, narrative_plan: NarrativePlan,
+                                 user_feedback: Optional[str] = None) -> str:
+        '''Revise story using the Revision Agent
+
+        When the judge tied its issues to a few paragraphs (and there is no
+        free-form user feedback), only those paragraphs are rewritten and spliced
+        back in; otherwise the whole story is rewritten.
+        '''
+        if self.revision_mode == 'targeted' and not user_feedback:
+            revised = await self._revise_paragraphs(original_story, evaluation, user_request, narrative_plan)
+            if revised is not None:
+                self._count_revision_mode('targeted')
+                return self._tidy(revised)
+        self._count_revision_mode('full')
+
         user_feedback_section = ""
         if user_feedback:
             user_feedback_section = f"\n\nUser's specific feedback:\n{user_feedback}"
@@ -188,46 +650,165 @@ class StoryOrchestrator:
         Revise the story to address the improvements while maintaining its strengths.
         """
 
-        result = Runner.run_sync(revision_agent, prompt)
-        revised_story = result.final_output
+        revised_story = await self._run_agent(revision_agent, prompt)
+
+        return self._tidy(revised_story)
+
+    async def _revise_paragraphs(self, story: str, evaluation: JudgeEvaluation,
+                                 user_request: str, narrative_plan: NarrativePlan) -> Optional[str]:
+        '''Rewrite only the paragraphs the judge flagged, or return None if a full rewrite is needed'''
+        paragraphs = split_paragraphs(story)
+        flagged = flagged_paragraphs(evaluation.paragraph_issues, len(paragraphs))
+        if not flagged or len(flagged) > len(paragraphs) * self.max_targeted_fraction:
+            return None
+
+        issues = '\n'.join(
+            f"Paragraph {number} issue: {'; '.join(problems)}" for number, problems in sorted(flagged.items())
+        )
+        prompt = f"""
+        Revise only the flagged paragraphs of this story.
+
+        Original user request: {user_request}
+        Themes: {', '.join(narrative_plan.themes)}
+
+        Story (paragraphs are numbered [n]):
+        {number_paragraphs(paragraphs)}
+
+        Paragraphs to rewrite:
+        {issues}
+
+        Judge's overall feedback: {evaluation.feedback}
+
+        Return a replacement for each listed paragraph only.
+        """
+
+        output = await self._run_agent(targeted_revision_agent, prompt)
+        replacements = {
+            replacement.paragraph: replacement.text.strip()
+            for replacement in getattr(output, 'replacements', None) or []
+            if replacement.paragraph in flagged and replacement.text.strip()
+        }
+        if not replacements:
+            return None
+        return splice_paragraphs(paragraphs, replacements)
 
-        return revised_story
+    def _count_revision_mode(self, mode: str):
+        '''Count a targeted or full revision, globally and for the current session'''
+        self.revision_mode_stats[mode] += 1
+        self._log().increment_session_metric('revision_mode', mode)
 
-    def create_short_story(self, user_request: str) -> Tuple[str, JudgeEvaluation, int]:
+    def create_short_story(
+            self,
+            user_request: str,
+            on_delta: Optional[Callable[[str], None]] = None,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> Tuple[str, JudgeEvaluation, int]:
         '''Create a short story with quality assurance loop'''
+        return self._run_sync(self.create_short_story_async(user_request, on_delta, session=session))
+
+    @_bind_session
+    async def create_short_story_async(
+            self,
+            user_request: str,
+            on_delta: Optional[Callable[[str], None]] = None,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> Tuple[str, JudgeEvaluation, int]:
+        '''Create a short story with quality assurance loop
+
+        With ``on_delta`` the first draft is streamed as it is written and the
+        quality loop runs afterwards; a revision only replaces the streamed draft
+        if it scores better than the draft did. With ``planning='pipelined'`` a
+        plan the director has to make is made while a plan-free draft is written, and the plan then
+        guides judging and revision. Everything is logged to ``session`` (by
+        default the logger's latest session), including the time to the first
+        story text.
+        '''
+        _pending_calls.set([])
+        start = time.perf_counter()
+        first_story: List[float] = []
         spinner = Halo(text='Generating your story...', spinner='dots') if self.show_spinner else None
 
+        def on_story_delta(delta: str):
+            if not first_story:
+                first_story.append(time.perf_counter() - start)
+            on_delta(delta)
+
         if spinner:
             spinner.start()
 
+        plan_task: Optional[asyncio.Task] = None
+        pipelined = False
         try:
-            narrative_plan = self.create_narrative_plan(user_request, 'short')
-            story = self.generate_story(user_request, narrative_plan)
-            revision_count = 0
-            while revision_count < self.max_revisions:
-                evaluation = self.evaluate_story(story, user_request, narrative_plan)
-                self.logger.log_generation(
-                    generation_type='initial' if revision_count == 0 else 'revision',
-                    content=story,
-                    evaluation=evaluation,
-                    revision_count=revision_count
+            narrative_plan = self._known_plan(user_request, 'short')
+            if narrative_plan is None:
+                pipelined = self.planning == 'pipelined' and self.quality_strategy == 'sequential'
+                if pipelined:
+                    plan_task = asyncio.create_task(self._plan_in_background(user_request))
+                else:
+                    narrative_plan = await self._direct_plan(user_request, 'short')
+            if on_delta and spinner:
+                spinner.stop()
+                spinner = None
+            if self.quality_strategy == 'best_of_n':
+                story, final_evaluation, revision_count = await self._best_of_n_story(
+                    user_request, narrative_plan, on_delta and on_story_delta, spinner
+                )
+                if not first_story:
+                    first_story.append(time.perf_counter() - start)
+            else:
+                story = await self.generate_story_async(
+                    user_request, narrative_plan, on_delta=on_delta and on_story_delta
                 )
-                if not evaluation.needs_revision:
-                    break
-                if spinner:
-                    spinner.text = f"Improving story (revision {revision_count + 1})..."
+                if not first_story:
+                    first_story.append(time.perf_counter() - start)
+                if plan_task:
+                    narrative_plan = await self._await_plan(plan_task, user_request)
+                streamed_story, streamed_evaluation = story, None
+                revision_count = 0
+                previous_evaluation = None
+                while True:
+                    evaluation = await self.evaluate_story_async(story, user_request, narrative_plan)
+                    gain = None
+                    if previous_evaluation is None:
+                        streamed_evaluation = evaluation
+                    else:
+                        gain = self._record_revision_gain(narrative_plan, previous_evaluation, evaluation)
+                    self._log().log_generation(
+                        generation_type='initial' if revision_count == 0 else 'revision',
+                        content=story,
+                        evaluation=evaluation,
+                        revision_count=revision_count,
+                        calls=self._drain_calls()
+                    )
+                    if revision_count >= self.max_revisions or not self._should_revise(evaluation, narrative_plan, gain):
+                        break
+                    if spinner:
+                        spinner.text = f"Improving story (revision {revision_count + 1})..."
 
-                story = self.revise_story(story, evaluation, user_request, narrative_plan)
-                revision_count += 1
+                    story = await self.revise_story_async(story, evaluation, user_request, narrative_plan)
+                    previous_evaluation = evaluation
+                    revision_count += 1
 
-            final_evaluation = self.evaluate_story(story, user_request, narrative_plan)
+                # served from the evaluation memo when the loop already judged this exact text
+                final_evaluation = await self.evaluate_story_async(story, user_request, narrative_plan)
+                # like a streamed chapter, the draft the reader saw is only replaced by a strictly better revision
+                if on_delta and streamed_evaluation and final_evaluation.overall_score <= streamed_evaluation.overall_score:
+                    story, final_evaluation = streamed_story, streamed_evaluation
 
-            self.logger.log_generation(
+            self._log().log_generation(
                 generation_type='final',
                 content=story,
                 evaluation=final_evaluation,
-                revision_count=revision_count
+                revision_count=revision_count,
+                calls=self._drain_calls()
             )
+            self._log().log_session_metrics('time_to_first_story', {
+                'seconds': round(first_story[0], 3),
+                'planning': 'pipelined' if pipelined else 'sequential'
+            })
+            self.revision_stats['accepted'] += 1
 
             if spinner:
                 spinner.succeed('Story ready!')
@@ -238,58 +819,236 @@ class StoryOrchestrator:
             if spinner:
                 spinner.fail('Story generation failed')
             raise
+        finally:
+            if plan_task and not plan_task.done():
+                plan_task.cancel()
 
-    def init_long_story(self, user_request: str) -> NarrativePlan:
+    async def _plan_in_background(self, user_request: str) -> NarrativePlan:
+        '''Plan a short story as its own task, keeping its calls apart from the draft's'''
+        _pending_calls.set([])
+        return await self._direct_plan(user_request, 'short')
+
+    async def _await_plan(self, plan_task: asyncio.Task, user_request: str) -> NarrativePlan:
+        '''The background plan, or a logged fallback plan if the director failed
+
+        The draft is already written (and maybe shown) by then, so it is judged
+        against a plain plan rather than lost with the failed director call.
+        '''
+        try:
+            return await plan_task
+        except Exception:
+            narrative_plan = fallback_plan(user_request, 'short')
+            self._log().increment_session_metric('planning', 'fallback')
+            self._log().log_narrative_plan(narrative_plan)
+            return narrative_plan
+
+    def _should_revise(
+            self,
+            evaluation: JudgeEvaluation,
+            narrative_plan: NarrativePlan,
+            last_gain: Optional[float] = None,
+            is_chapter: bool = False
+        ) -> bool:
+        '''Ask the revision policy, counting its decision globally and for the current session'''
+        decision = self.revision_policy.decide(evaluation, narrative_plan.story_category, last_gain, is_chapter)
+        self.revision_stats[decision] += 1
+        self._log().increment_session_metric('revision_policy', decision)
+        return decision == 'revise'
+
+    def _record_revision_gain(
+            self,
+            narrative_plan: NarrativePlan,
+            before: JudgeEvaluation,
+            after: JudgeEvaluation
+        ) -> Optional[float]:
+        '''Teach the revision policy how much a revision changed the score'''
+        if before.prejudged or after.prejudged:
+            # a local evaluation's score is a placeholder, not a judge's measure
+            return None
+        gain = after.overall_score - before.overall_score
+        self.revision_policy.record_gain(narrative_plan.story_category, gain)
+        return gain
+
+    def calls_per_accepted_story(self) -> float:
+        '''Model calls made (cache hits excluded) per short story or chapter handed back to the reader'''
+        total = self.usage.summary()['total']
+        accepted = self.revision_stats['accepted']
+        return round((total['calls'] - total['cache_hits']) / accepted, 2) if accepted else 0.0
+
+    def _accepts(self, evaluation: JudgeEvaluation) -> bool:
+        '''Whether an evaluation meets the judge's approval bar'''
+        return (
+            evaluation.overall_score >= ACCEPTANCE_SCORE
+            and evaluation.age_appropriate
+            and not evaluation.needs_revision
+        )
+
+    def _candidates_within_budget(self, prompt: str) -> int:
+        '''How many candidates one round can afford under the token budget'''
+        count = max(1, self.candidate_count)
+        if self.candidate_token_budget is None:
+            return count
+
+        # average tokens per uncached call so far, or a guess from the prompt for a 500-800 word story
+        by_stage = self.usage.summary()['by_stage']
+        guesses = {'generate': estimate_tokens(prompt) + 1000, 'judge': 1400}
+        per_candidate = 0
+        for stage, guess in guesses.items():
+            totals = by_stage.get(stage)
+            made = totals['calls'] - totals['cache_hits'] if totals else 0
+            per_candidate += (totals['input_tokens'] + totals['output_tokens']) // made if made else guess
+        return max(1, min(count, self.candidate_token_budget // max(1, per_candidate)))
+
+    async def _write_candidate(
+            self,
+            prompt: str,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            on_delta: Optional[Callable[[str], None]] = None
+        ) -> Tuple[str, JudgeEvaluation, List[Dict[str, Any]]]:
+        '''Write and judge one candidate story, returning the calls it made'''
+        # runs as its own task, so this list collects only this candidate's calls
+        _pending_calls.set([])
+        story = self._tidy(await self._run_agent(storyteller, prompt, on_delta=on_delta))
+        evaluation = await self.evaluate_story_async(story, user_request, narrative_plan)
+        return story, evaluation, self._drain_calls()
+
+    async def _best_of_n_story(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            on_delta: Optional[Callable[[str], None]] = None,
+            spinner: Optional[Halo] = None
+        ) -> Tuple[str, JudgeEvaluation, int]:
+        '''Write and judge several candidates concurrently and keep the best
+
+        Only the first candidate is streamed; another replaces it only by scoring
+        higher. The winner is revised only if no candidate meets the approval bar.
+        '''
+        prompt = self._build_story_prompt(user_request, narrative_plan)
+        count = self._candidates_within_budget(prompt)
+        # the first candidate is the usual draft; the others are nudged apart so they differ
+        prompts = [prompt] + [
+            f"{prompt}\n            Variation {index}: choose a different opening, setting detail and turn of events than the most obvious telling.\n"
+            for index in range(1, count)
+        ]
+        candidates = await asyncio.gather(*[
+            self._write_candidate(candidate_prompt, user_request, narrative_plan, on_delta if index == 0 else None)
+            for index, candidate_prompt in enumerate(prompts)
+        ])
+
+        for story, evaluation, calls in candidates:
+            self._log().log_generation(generation_type='candidate', content=story, evaluation=evaluation, calls=calls)
+        accepted = [candidate for candidate in candidates if self._accepts(candidate[1])]
+        self._log().log_session_metrics('best_of_n', {'candidates': count, 'accepted': len(accepted)})
+
+        # max keeps the earliest of equal candidates, so the streamed draft wins ties
+        best = max(
+            accepted or candidates, key=lambda candidate: (candidate[1].age_appropriate, candidate[1].overall_score)
+        )
+        story, evaluation, _ = best
+        revision_count = 0
+        gain = None
+        while (
+                not self._accepts(evaluation)
+                and revision_count < self.max_revisions
+                and self._should_revise(evaluation, narrative_plan, gain)
+            ):
+            if spinner:
+                spinner.text = f"Improving story (revision {revision_count + 1})..."
+            revised = await self.revise_story_async(story, evaluation, user_request, narrative_plan)
+            revised_evaluation = await self.evaluate_story_async(revised, user_request, narrative_plan)
+            gain = self._record_revision_gain(narrative_plan, evaluation, revised_evaluation)
+            revision_count += 1
+            self._log().log_generation(
+                generation_type='revision',
+                content=revised,
+                evaluation=revised_evaluation,
+                revision_count=revision_count,
+                calls=self._drain_calls()
+            )
+            story, evaluation = revised, revised_evaluation
+
+        # the reader keeps the streamed draft if it won and revising did not make it better;
+        # a draft that lost to another candidate never comes back
+        streamed_story, streamed_evaluation, _ = candidates[0]
+        if on_delta and best is candidates[0] and evaluation.overall_score <= streamed_evaluation.overall_score:
+            story, evaluation = streamed_story, streamed_evaluation
+        return story, evaluation, revision_count
+
+    def init_long_story(self, user_request: str, *, session: Optional[FeedbackSession] = None) -> NarrativePlan:
+        '''Initialize a long story and return the narrative plan'''
+        return self._run_sync(self.init_long_story_async(user_request, session=session))
+
+    @_bind_session
+    async def init_long_story_async(self, user_request: str, *, session: Optional[FeedbackSession] = None) -> NarrativePlan:
         '''Initialize a long story and return the narrative plan'''
-        narrative_plan = self.create_narrative_plan(user_request, 'long')
+        narrative_plan = await self.create_narrative_plan_async(user_request, 'long')
         return narrative_plan
 
+    def resume_long_story(self, state: StoryState) -> NarrativePlan:
+        '''Pick up a checkpointed long story without re-planning or rebuilding its memory'''
+        if state.memory:
+            self.remember_memory(state.user_request, state.chapters[:state.memory.chapters_covered], state.memory)
+        return state.narrative_plan
+
     def generate_next_chapter(
             self,
             user_request: str,
             narrative_plan: NarrativePlan,
             chapters: List[str],
             chapter_num: int,
-            user_feedback: Optional[str] = None
+            user_feedback: Optional[str] = None,
+            on_delta: Optional[Callable[[str], None]] = None,
+            *,
+            session: Optional[FeedbackSession] = None
         ) -> Tuple[str, JudgeEvaluation]:
         '''Generate the next chapter in a long story'''
-        spinner = Halo(text=f'Writing Chapter {chapter_num}...', spinner='dots') if self.show_spinner else None
+        return self._run_sync(self.generate_next_chapter_async(
+            user_request, narrative_plan, chapters, chapter_num, user_feedback, on_delta, session=session
+        ))
+
+    @_bind_session
+    async def generate_next_chapter_async(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            chapters: List[str],
+            chapter_num: int,
+            user_feedback: Optional[str] = None,
+            on_delta: Optional[Callable[[str], None]] = None,
+            *,
+            session: Optional[FeedbackSession] = None
+        ) -> Tuple[str, JudgeEvaluation]:
+        '''Generate the next chapter in a long story
+
+        With ``on_delta`` the chapter is streamed as it is written; a refinement
+        only replaces it if the refined chapter scores better.
+        '''
+        _pending_calls.set([])
+        key = self._chapter_key(user_request, chapters, chapter_num, user_feedback)
+        prefetched = await self._take_prefetch(user_request, key)
+        if prefetched:
+            chapter, evaluation, generations = prefetched
+            for generation in generations:
+                self._log().log_generation(**generation)
+            self.revision_stats['accepted'] += 1
+            if on_delta:
+                on_delta(chapter)
+            return chapter, evaluation
+
+        spinner = Halo(text=f'Writing Chapter {chapter_num}...', spinner='dots') if self.show_spinner and not on_delta else None
 
         if spinner:
             spinner.start()
 
         try:
-            chapter_context = ChapterContext(
-                chapter_number=chapter_num,
-                previous_chapters=chapters,
-                narrative_plan=narrative_plan,
-                user_request=user_request
-            )
-            chapter = self.generate_story(user_request, narrative_plan, chapter_context, user_feedback)
-            evaluation = self.evaluate_story(chapter, user_request, narrative_plan, is_chapter=True)
-
-            self.logger.log_generation(
-                generation_type="chapter",
-                content=chapter,
-                evaluation=evaluation,
-                chapter_num=chapter_num,
-                user_feedback_input=user_feedback
+            chapter, evaluation, generations = await self._write_chapter(
+                user_request, narrative_plan, chapters, chapter_num, user_feedback, on_delta, spinner
             )
-
-            if evaluation.needs_revision and evaluation.overall_score < 7.0:
-                if spinner:
-                    spinner.text = f'Refining Chapter {chapter_num}...'
-
-                chapter = self.revise_story(chapter, evaluation, user_request, narrative_plan)
-                evaluation = self.evaluate_story(chapter, user_request, narrative_plan, is_chapter=True)
-
-                self.logger.log_generation(
-                    generation_type='revision',
-                    content=chapter,
-                    evaluation=evaluation,
-                    chapter_num=chapter_num,
-                    revision_count=1
-                )
+            for generation in generations:
+                self._log().log_generation(**generation)
+            self.revision_stats['accepted'] += 1
 
             if spinner:
                 spinner.succeed(f"Chapter {chapter_num} ready!")
@@ -301,26 +1060,286 @@ class StoryOrchestrator:
                 spinner.fail(f"Chapter {chapter_num} generation failed")
             raise
 
+    async def _write_chapter(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            chapters: List[str],
+            chapter_num: int,
+            user_feedback: Optional[str] = None,
+            on_delta: Optional[Callable[[str], None]] = None,
+            spinner: Optional[Halo] = None
+        ) -> Tuple[str, JudgeEvaluation, List[Dict[str, Any]]]:
+        '''Write, judge and if needed refine a chapter, returning the generations to log'''
+        chapter_context = ChapterContext(
+            chapter_number=chapter_num,
+            previous_chapters=chapters,
+            narrative_plan=narrative_plan,
+            user_request=user_request,
+            memory=await self.get_memory_async(user_request, chapters)
+        )
+        chapter = await self.generate_story_async(user_request, narrative_plan, chapter_context, user_feedback, on_delta)
+        evaluation = await self.evaluate_story_async(chapter, user_request, narrative_plan, is_chapter=True)
+
+        generations = [dict(
+            generation_type="chapter",
+            content=chapter,
+            evaluation=evaluation,
+            chapter_num=chapter_num,
+            user_feedback_input=user_feedback,
+            calls=self._drain_calls()
+        )]
+
+        if self._should_revise(evaluation, narrative_plan, is_chapter=True):
+            if spinner:
+                spinner.text = f'Refining Chapter {chapter_num}...'
+
+            revised = await self.revise_story_async(chapter, evaluation, user_request, narrative_plan)
+            revised_evaluation = await self.evaluate_story_async(revised, user_request, narrative_plan, is_chapter=True)
+            self._record_revision_gain(narrative_plan, evaluation, revised_evaluation)
+
+            generations.append(dict(
+                generation_type='revision',
+                content=revised,
+                evaluation=revised_evaluation,
+                chapter_num=chapter_num,
+                revision_count=1,
+                calls=self._drain_calls()
+            ))
+
+            if not on_delta or revised_evaluation.overall_score > evaluation.overall_score:
+                chapter, evaluation = revised, revised_evaluation
+
+        return chapter, evaluation, generations
+
+    def _memory_keys(self, user_request: str, chapters: List[str]) -> List[str]:
+        '''Chained hashes identifying the request and every prefix of its chapters'''
+        keys = [hashlib.sha256(user_request.encode('utf-8')).hexdigest()]
+        for chapter in chapters:
+            keys.append(hashlib.sha256((keys[-1] + chapter).encode('utf-8')).hexdigest())
+        return keys
+
+    def remember_memory(self, user_request: str, chapters: List[str], memory: NarrativeMemory):
+        '''Seed the memory for a story whose chapters were written elsewhere (e.g. a resumed story)'''
+        self._store_memory(self._memory_keys(user_request, chapters)[-1], memory)
+
+    def latest_memory(self, user_request: str, chapters: List[str]) -> Optional[NarrativeMemory]:
+        '''The remembered memory covering the most of these chapters, without any model calls'''
+        keys = self._memory_keys(user_request, chapters)
+        for key in reversed(keys[1:]):
+            if key in self._memories:
+                return self._memories[key]
+        return None
+
+    def _store_memory(self, key: str, memory: NarrativeMemory):
+        self._memories[key] = memory
+        self._memories.move_to_end(key)
+        while len(self._memories) > self.max_remembered_memories:
+            self._memories.popitem(last=False)
+
+    async def get_memory_async(self, user_request: str, chapters: List[str]) -> NarrativeMemory:
+        '''Return the narrative memory covering exactly these chapters
+
+        Memories are stored per chapter prefix, so only chapters not yet folded in
+        cost a Memory Keeper call, and a revised chapter simply starts a new branch.
+        '''
+        keys = self._memory_keys(user_request, chapters)
+        covered = len(chapters)
+        while covered > 0 and keys[covered] not in self._memories:
+            covered -= 1
+        memory = self._memories.get(keys[covered]) or NarrativeMemory(token_budget=self.memory_token_budget)
+
+        for index in range(covered, len(chapters)):
+            memory = await self._update_memory(memory, chapters[index])
+            self._store_memory(keys[index + 1], memory)
+        return memory
+
+    async def _update_memory(self, memory: NarrativeMemory, chapter: str) -> NarrativeMemory:
+        '''Fold one chapter into the memory using the Memory Keeper agent'''
+        prompt = f"""
+        Update the story memory with the newest chapter.
+
+        Current memory:
+        {memory.to_prompt() or '(empty - this is the first chapter)'}
+
+        Newest chapter (Chapter {memory.chapters_covered + 1}):
+        {chapter}
+
+        Provide the updated memory.
+        """
+
+        try:
+            output = await self._run_agent(memory_keeper, prompt)
+        except ModelBehaviorError:
+            # still off-schema after the retries; a rougher memory beats failing the chapter
+            return fallback_memory_update(memory, chapter)
+
+        return NarrativeMemory(
+            story_so_far=output.story_so_far,
+            characters={character.name: character.description for character in output.characters},
+            open_threads=list(output.open_threads),
+            previous_ending=chapter,
+            chapters_covered=memory.chapters_covered + 1,
+            token_budget=memory.token_budget
+        ).fit_to_budget()
+
+    def _chapter_key(
+            self,
+            user_request: str,
+            chapters: List[str],
+            chapter_num: int,
+            user_feedback: Optional[str]
+        ) -> Tuple[Any, ...]:
+        '''Identify a chapter request so a prefetched result is only reused for the same inputs'''
+        return (user_request, chapter_num, tuple(chapters), user_feedback or None)
+
+    def prefetch_next_chapter(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            chapters: List[str],
+            chapter_num: int,
+            user_feedback: Optional[str] = None,
+            *,
+            session: Optional[FeedbackSession] = None
+        ):
+        '''Start generating a chapter in the background while the reader is busy'''
+        self._run_sync(self.prefetch_next_chapter_async(
+            user_request, narrative_plan, chapters, chapter_num, user_feedback, session=session
+        ))
+
+    @_bind_session
+    async def prefetch_next_chapter_async(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            chapters: List[str],
+            chapter_num: int,
+            user_feedback: Optional[str] = None,
+            *,
+            session: Optional[FeedbackSession] = None
+        ):
+        '''Start generating a chapter in the background while the reader is busy
+
+        A later ``generate_next_chapter`` call for the story with the same inputs
+        picks up the result; any other call for the story discards it.
+        '''
+        key = self._chapter_key(user_request, chapters, chapter_num, user_feedback)
+        current = self._prefetches.get(user_request)
+        if current and current.key == key:
+            return
+        await self.cancel_prefetch_async(user_request)
+
+        usage = {'input_tokens': 0, 'output_tokens': 0}
+        chapters = list(chapters)
+
+        async def speculate():
+            _task_usage.set(usage)
+            _priority.set('prefetch')
+            _pending_calls.set([])
+            return await self._write_chapter(user_request, narrative_plan, chapters, chapter_num, user_feedback)
+
+        self._prefetches[user_request] = ChapterPrefetch(
+            key=key, task=asyncio.create_task(speculate()), session=self._log(), usage=usage
+        )
+        self.prefetch_stats['started'] += 1
+        while len(self._prefetches) > self.max_prefetches:
+            await self._discard_prefetch(self._prefetches.popitem(last=False)[1])
+
+    def cancel_prefetch(self, user_request: Optional[str] = None):
+        '''Cancel and discard the story's speculative chapter, or every story's'''
+        self._run_sync(self.cancel_prefetch_async(user_request))
+
+    async def cancel_prefetch_async(self, user_request: Optional[str] = None):
+        '''Cancel and discard the story's speculative chapter, or every story's'''
+        if user_request is None:
+            prefetches = list(self._prefetches.values())
+            self._prefetches.clear()
+        else:
+            prefetch = self._prefetches.pop(user_request, None)
+            prefetches = [prefetch] if prefetch else []
+        for prefetch in prefetches:
+            await self._discard_prefetch(prefetch)
+
+    async def _discard_prefetch(self, prefetch: ChapterPrefetch):
+        prefetch.task.cancel()
+        try:
+            await prefetch.task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._record_prefetch(prefetch, hit=False)
+
+    async def _take_prefetch(
+            self,
+            user_request: str,
+            key: Tuple[Any, ...]
+        ) -> Optional[Tuple[str, JudgeEvaluation, List[Dict[str, Any]]]]:
+        '''Return the story's prefetched chapter for key, waiting for it if it is still running'''
+        prefetch = self._prefetches.pop(user_request, None)
+        if not prefetch:
+            return None
+        if prefetch.key != key:
+            await self._discard_prefetch(prefetch)
+            return None
+
+        try:
+            result = await prefetch.task
+        except Exception:
+            self._record_prefetch(prefetch, hit=False)
+            return None
+        self._record_prefetch(prefetch, hit=True)
+        return result
+
+    def _record_prefetch(self, prefetch: ChapterPrefetch, hit: bool):
+        '''Update prefetch hit/waste counters and log them to the session'''
+        if hit:
+            self.prefetch_stats['hits'] += 1
+        else:
+            # tokens from calls that were cut off mid-flight are never reported, so this is a lower bound
+            self.prefetch_stats['discarded'] += 1
+            self.prefetch_stats['wasted_input_tokens'] += prefetch.usage['input_tokens']
+            self.prefetch_stats['wasted_output_tokens'] += prefetch.usage['output_tokens']
+
+        resolved = self.prefetch_stats['hits'] + self.prefetch_stats['discarded']
+        (prefetch.session or self._log()).log_session_metrics('prefetch', {
+            **self.prefetch_stats,
+            'hit_rate': round(self.prefetch_stats['hits'] / resolved, 3) if resolved else 0.0
+        })
+
     def revise_chapter_with_feedback(self, chapter: str, user_request: str,
                                     narrative_plan: NarrativePlan, user_feedback: str,
-                                    chapter_num: Optional[int] = None) -> str:
+                                    chapter_num: Optional[int] = None, *,
+                                    session: Optional[FeedbackSession] = None) -> str:
         '''Revise a chapter based on user feedback'''
+        return self._run_sync(self.revise_chapter_with_feedback_async(
+            chapter, user_request, narrative_plan, user_feedback, chapter_num, session=session
+        ))
+
+    @_bind_session
+    async def revise_chapter_with_feedback_async(self, chapter: str, user_request: str,
+                                                 narrative_plan: NarrativePlan, user_feedback: str,
+                                                 chapter_num: Optional[int] = None, *,
+                                                 session: Optional[FeedbackSession] = None) -> str:
+        '''Revise a chapter based on user feedback'''
+        _pending_calls.set([])
         spinner = Halo(text='Revising based on your feedback...', spinner='dots') if self.show_spinner else None
 
         if spinner:
             spinner.start()
 
         try:
-            evaluation = self.evaluate_story(chapter, user_request, narrative_plan, is_chapter=True)
-            revised_chapter = self.revise_story(chapter, evaluation, user_request, narrative_plan, user_feedback)
-            final_evaluation = self.evaluate_story(revised_chapter, user_request, narrative_plan, is_chapter=True)
+            # usually remembered from when the chapter was written, so no judge call is made
+            evaluation = await self.evaluate_story_async(chapter, user_request, narrative_plan, is_chapter=True)
+            revised_chapter = await self.revise_story_async(chapter, evaluation, user_request, narrative_plan, user_feedback)
+            final_evaluation = await self.evaluate_story_async(revised_chapter, user_request, narrative_plan, is_chapter=True)
 
-            self.logger.log_generation(
+            self._log().log_generation(
                 generation_type='user_revision',
                 content=revised_chapter,
                 evaluation=final_evaluation,
                 user_feedback_input=user_feedback,
-                chapter_num=chapter_num
+                chapter_num=chapter_num,
+                calls=self._drain_calls()
             )
 
             if spinner:
@@ -0,0 +1,36 @@
+'''Paragraphs - Numbered paragraphs for targeted revisions.
+
+The judge sees stories with their paragraphs numbered ``[n]`` so it can tie
+problems to particular paragraphs; a targeted revision then rewrites only those
+and the replacements are spliced back into the original text.
+'''
+
+import re
+from typing import Any, Dict, Iterable, List
+
+
+def split_paragraphs(text: str) -> List[str]:
+    '''Split text on blank lines into non-empty paragraphs'''
+    return [paragraph.strip() for paragraph in re.split(r'\n\s*\n', text.strip()) if paragraph.strip()]
+
+
+def number_paragraphs(paragraphs: List[str]) -> str:
+    '''Render paragraphs with ``[n]`` markers, numbered from 1'''
+    return '\n\n'.join(f'[{number}] {paragraph}' for number, paragraph in enumerate(paragraphs, 1))
+
+
+def flagged_paragraphs(issues: Iterable[Dict[str, Any]], paragraph_count: int) -> Dict[int, List[str]]:
+    '''Issues per paragraph number, ignoring numbers outside the story'''
+    flagged: Dict[int, List[str]] = {}
+    for issue in issues:
+        number = issue.get('paragraph')
+        if isinstance(number, int) and 1 <= number <= paragraph_count and issue.get('issue'):
+            flagged.setdefault(number, []).append(issue['issue'])
+    return flagged
+
+
+def splice_paragraphs(paragraphs: List[str], replacements: Dict[int, str]) -> str:
+    '''Join paragraphs back into text, swapping in replacements by paragraph number'''
+    return '\n\n'.join(
+        replacements.get(number, paragraph) for number, paragraph in enumerate(paragraphs, 1)
+    )
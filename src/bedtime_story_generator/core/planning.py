@@ -0,0 +1,262 @@
+'''Planning - Keeps the Narrative Director call off the critical path.
+
+A narrative plan depends only on the user's request and the target length, so
+plans are cached by a normalised form of the request: "Tell me a story about a
+brave turtle!" and "a brave turtle" share a plan. The cache can be warmed from
+the plans in the feedback logs, so repeat topics skip the director entirely,
+even after a restart.
+
+New topics that resemble past ones are planned by ``RequestClassifier``, a
+TF-IDF nearest-neighbour model over the logged requests and their plans. It
+answers in well under a millisecond and only defers to the director when the
+closest past requests are too dissimilar or disagree on the story category.
+'''
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bedtime_story_generator.core.models import NarrativePlan
+from bedtime_story_generator.utils.session_log import load_sessions
+
+# how a short story's plan and first draft are ordered: plan first, or draft while the plan is made
+PLANNING_MODES = ('sequential', 'pipelined')
+
+# openers that say nothing about the story itself
+REQUEST_PREAMBLE = re.compile(
+    r'^(?:(?:please|can you|could you|would you|i want|i\'d like|i would like)\s+)*'
+    r'(?:(?:tell|write|make|create|give)(?: me| us)?\s+)?'
+    r'(?:(?:a|an|the)\s+)?(?:(?:bedtime|short|long|little|nice)\s+)*(?:story|tale)\s+(?:about|of|where|with)\s+',
+)
+
+# words that say nothing about which plan fits
+STOP_WORDS = frozenset('''
+a an and the of to in on at for with who whom which that this these those is are was were be been
+his her their its my our your he she they it them him we i me you about from into over under by
+as or but so very some any all one little big what when where how'''.split())
+
+
+def normalize_request(user_request: str) -> str:
+    '''Lowercase the request and drop punctuation, extra spaces and story-request preamble'''
+    text = re.sub(r'[^\w\s\']', ' ', user_request.lower())
+    text = ' '.join(text.split())
+    return REQUEST_PREAMBLE.sub('', text)
+
+
+def fallback_plan(user_request: str, target_length: str) -> NarrativePlan:
+    '''A plain plan for when the director fails after a draft was already written'''
+    return NarrativePlan(
+        story_category='bedtime',
+        story_arc='gentle adventure',
+        themes=['kindness'],
+        target_length=target_length,
+        complexity_level='age 5-10',
+        key_elements=[normalize_request(user_request)]
+    )
+
+
+class PlanCache:
+    '''LRU cache of narrative plans keyed by normalised request and target length'''
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0}
+        self._plans: 'OrderedDict[Tuple[str, str], NarrativePlan]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_request: str, target_length: str) -> Optional[NarrativePlan]:
+        '''A copy of the cached plan for this request, or None'''
+        key = (normalize_request(user_request), target_length)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.stats['misses'] += 1
+                return None
+            self._plans.move_to_end(key)
+            self.stats['hits'] += 1
+        return replace(plan, themes=list(plan.themes), key_elements=list(plan.key_elements))
+
+    def put(self, user_request: str, plan: NarrativePlan):
+        '''Cache a plan for this request and the plan's target length'''
+        key = (normalize_request(user_request), plan.target_length)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._plans)
+
+    def learn(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        '''Cache the plans from logged sessions, oldest first so the newest win; returns how many'''
+        plans = []
+        for session in sessions:
+            plan = session.get('narrative_plan')
+            if session.get('user_request') and plan:
+                try:
+                    plans.append((session['user_request'], NarrativePlan(**plan)))
+                except TypeError:
+                    # plans logged by an older version of NarrativePlan
+                    continue
+        for user_request, plan in reversed(plans):
+            self.put(user_request, plan)
+        return len(plans)
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], **kwargs: Any) -> 'PlanCache':
+        '''A cache warmed with the plans of already loaded sessions, newest first'''
+        cache = cls(**kwargs)
+        cache.learn(sessions)
+        return cache
+
+    @classmethod
+    def from_log_dir(cls, log_dir: str, max_sessions: int = 1000, **kwargs: Any) -> 'PlanCache':
+        '''A cache warmed with the plans of the most recent sessions in a feedback log directory'''
+        return cls.from_sessions(islice(load_sessions(log_dir), max_sessions), **kwargs)
+
+
+def request_terms(user_request: str) -> List[str]:
+    '''Content words of a request, singularised, for matching similar requests'''
+    terms = []
+    for word in normalize_request(user_request).replace("'", ' ').split():
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class RequestClassifier:
+    '''TF-IDF nearest-neighbour planner trained on logged requests and their plans'''
+
+    def __init__(
+            self,
+            min_examples: int = 20,
+            min_similarity: float = 0.35,
+            min_agreement: float = 0.7,
+            neighbours: int = 5
+        ):
+        # below min_examples everything goes to the director
+        self.min_examples = min_examples
+        # the closest past request must be at least this similar (cosine)...
+        self.min_similarity = min_similarity
+        # ...and this share of the neighbours' similarity must back one category
+        self.min_agreement = min_agreement
+        self.neighbours = neighbours
+        self.stats = {'local': 0, 'deferred': 0}
+        self._examples: List[Tuple[Counter, NarrativePlan]] = []
+        self._idf: Dict[str, float] = {}
+        self._index: Dict[str, List[Tuple[int, float]]] = {}
+        self._indexed = 0
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    def add(self, user_request: str, plan: NarrativePlan):
+        '''Learn from one planned request'''
+        terms = Counter(request_terms(user_request))
+        if terms:
+            with self._lock:
+                self._examples.append((terms, plan))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._examples)
+
+    def learn(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        '''Learn from the plans in logged sessions and return how many were used'''
+        learned = 0
+        for session in sessions:
+            plan = session.get('narrative_plan')
+            if not session.get('user_request') or not plan:
+                continue
+            try:
+                self.add(session['user_request'], NarrativePlan(**plan))
+            except TypeError:
+                # plans logged by an older version of NarrativePlan
+                continue
+            learned += 1
+        return learned
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], **kwargs: Any) -> 'RequestClassifier':
+        '''A classifier trained on already loaded sessions'''
+        classifier = cls(**kwargs)
+        classifier.learn(sessions)
+        return classifier
+
+    @classmethod
+    def from_log_dir(cls, log_dir: str, max_sessions: int = 1000, **kwargs: Any) -> 'RequestClassifier':
+        '''A classifier trained on the most recent sessions in a feedback log directory'''
+        return cls.from_sessions(islice(load_sessions(log_dir), max_sessions), **kwargs)
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        '''Unit-length TF-IDF vector over terms the index knows'''
+        weights = {term: (1 + math.log(count)) * self._idf[term] for term, count in terms.items() if term in self._idf}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+    def _refresh_index(self):
+        '''Index new examples, recomputing IDF once the examples have grown by a quarter'''
+        if len(self._examples) > self._built_at * 1.25:
+            document_frequency: Counter = Counter()
+            for terms, _ in self._examples:
+                document_frequency.update(terms.keys())
+            total = len(self._examples)
+            self._idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+            self._index, self._indexed, self._built_at = {}, 0, total
+        for position in range(self._indexed, len(self._examples)):
+            for term, weight in self._vector(self._examples[position][0]).items():
+                self._index.setdefault(term, []).append((position, weight))
+        self._indexed = len(self._examples)
+
+    def classify(self, user_request: str, target_length: str) -> Optional[NarrativePlan]:
+        '''A plan borrowed from the most similar past requests, or None when not confident'''
+        with self._lock:
+            plan = self._classify(user_request, target_length)
+            self.stats['local' if plan else 'deferred'] += 1
+            return plan
+
+    def _classify(self, user_request: str, target_length: str) -> Optional[NarrativePlan]:
+        terms = request_terms(user_request)
+        if len(self._examples) < self.min_examples or not terms:
+            return None
+        self._refresh_index()
+        scores: Dict[int, float] = {}
+        for term, weight in self._vector(Counter(terms)).items():
+            for position, example_weight in self._index.get(term, ()):
+                # long-form plans differ in more than length (suitability, open-endedness),
+                # so only plans made for the same length are borrowed
+                if self._examples[position][1].target_length == target_length:
+                    scores[position] = scores.get(position, 0.0) + weight * example_weight
+        nearest = sorted(scores.items(), key=lambda item: -item[1])[:self.neighbours]
+        if not nearest or nearest[0][1] < self.min_similarity:
+            return None
+
+        votes: Dict[str, float] = {}
+        for position, similarity in nearest:
+            category = self._examples[position][1].story_category
+            votes[category] = votes.get(category, 0.0) + similarity
+        category = max(votes, key=votes.get)
+        if votes[category] / sum(votes.values()) < self.min_agreement:
+            return None
+
+        # arc and themes from the closest request of that category; key elements from this request
+        template = next(self._examples[position][1] for position, _ in nearest
+                        if self._examples[position][1].story_category == category)
+        return replace(
+            template,
+            themes=list(template.themes),
+            key_elements=[normalize_request(user_request)]
+        )
+
+    def local_share(self) -> float:
+        '''Share of classified requests planned locally instead of by the director'''
+        total = self.stats['local'] + self.stats['deferred']
+        return round(self.stats['local'] / total, 3) if total else 0.0
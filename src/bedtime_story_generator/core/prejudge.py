@@ -0,0 +1,167 @@
+'''Pre-Judge - Cheap local checks run before a story reaches the Judge agent.
+
+Some problems need no model to spot: a story far outside the 400-800 word
+range, markdown or emojis left in despite the storyteller's formatting rules,
+frightening vocabulary, text that is far too hard to read, or an ending cut off
+mid-sentence. ``PreJudge`` checks for these in pure Python. Formatting problems
+are fixed in place; any other problem fails the story with a local evaluation,
+so the judge is only called when the heuristics are inconclusive.
+
+There is deliberately no local pass. The checks can prove a story unfit, but a
+story that clears them may still be dull, incoherent, off-request or unsettling
+in ways no word list catches, and the judge's score and feedback are what the
+revision loop and the approval threshold run on. Every story that is not failed
+locally is therefore still judged.
+'''
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from bedtime_story_generator.core.models import JudgeEvaluation
+from bedtime_story_generator.core.paragraphs import split_paragraphs
+
+# violence and gore that never belongs in a bedtime story; gentle "scary" words
+# like monster or dark are left to the judge
+SCARY_WORDS = re.compile(
+    r'\b(blood\w*|gore|gory|gruesome|kill\w*|murder\w*|corpses?|stab\w*|tortur\w*|massacre\w*|'
+    r'slaughter\w*|decapitat\w*|dismember\w*|horrif\w*|butcher\w*|strangl\w*)\b',
+    re.IGNORECASE
+)
+EMOJI = re.compile(
+    '[\U0001F000-\U0001FAFF\U00002600-\U000027BF\U00002B00-\U00002BFF\uFE0F\u200D]'
+)
+HEADING_LINE = re.compile(r'^[ \t]*#{1,6}[ \t].*$\n?', re.MULTILINE)
+RULE_LINE = re.compile(r'^[ \t]*([-*_])([ \t]*\1){2,}[ \t]*$\n?', re.MULTILINE)
+LIST_MARKER = re.compile(r'^([ \t]*)(?:[-*+•]|\d+[.)])[ \t]+', re.MULTILINE)
+EMPHASIS = re.compile(r'(\*\*|__)(.+?)\1|(?<![\w*])\*(?!\s)([^*\n]+?)\*(?![\w*])|(?<![\w_])_(?!\s)([^_\n]+?)_(?![\w_])')
+STRAY_EMPHASIS = re.compile(r'\*\*|__')
+CODE = re.compile(r'```[^\n]*\n?|`')
+# characters a finished story can end on, before any closing quotes or brackets
+ENDINGS = '.!?…'
+CLOSERS = '"\')]”’'
+
+
+def fix_formatting(text: str) -> str:
+    '''Strip markdown and emojis, leaving plain paragraphs'''
+    text = HEADING_LINE.sub('', text)
+    text = RULE_LINE.sub('', text)
+    text = CODE.sub('', text)
+    text = LIST_MARKER.sub(r'\1', text)
+    text = EMPHASIS.sub(lambda match: next(group for group in match.groups()[1:] if group is not None), text)
+    text = STRAY_EMPHASIS.sub('', text)
+    text = EMOJI.sub('', text)
+    text = re.sub(r'[ \t]{2,}', ' ', text)
+    return '\n\n'.join(split_paragraphs(text))
+
+
+def count_syllables(word: str) -> int:
+    '''Rough English syllable count from vowel groups'''
+    word = word.lower()
+    syllables = len(re.findall(r'[aeiouy]+', word))
+    if word.endswith('e') and not word.endswith(('le', 'ee')) and syllables > 1:
+        syllables -= 1
+    return max(1, syllables)
+
+
+def reading_grade(text: str) -> float:
+    '''Flesch-Kincaid grade level of the text'''
+    words = re.findall(r"[A-Za-z]+(?:'[A-Za-z]+)?", text)
+    if not words:
+        return 0.0
+    sentences = max(1, len(re.findall(r'[.!?]+(?=\s|["\'”’]|$)', text)))
+    syllables = sum(count_syllables(word) for word in words)
+    return round(0.39 * len(words) / sentences + 11.8 * syllables / len(words) - 15.59, 1)
+
+
+def is_truncated(text: str) -> bool:
+    '''Whether the text stops without finishing its last sentence'''
+    ending = text.rstrip().rstrip(CLOSERS)
+    return not ending or ending[-1] not in ENDINGS
+
+
+@dataclass
+class PreJudgement:
+    '''Outcome of the local checks on one story'''
+    story: str
+    # 'fail' when the heuristics alone reject the story, otherwise 'inconclusive' (never 'pass')
+    verdict: str
+    formatting_fixed: bool
+    problems: List[str] = field(default_factory=list)
+    paragraph_issues: List[Dict[str, Any]] = field(default_factory=list)
+    age_appropriate: bool = True
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def evaluation(self) -> Optional[JudgeEvaluation]:
+        '''A local evaluation standing in for the judge's, if the story failed'''
+        if self.verdict != 'fail':
+            return None
+        return JudgeEvaluation(
+            overall_score=PreJudge.FAIL_SCORE,
+            age_appropriate=self.age_appropriate,
+            feedback='Failed local checks before judging: ' + '; '.join(self.problems),
+            strengths=[],
+            improvements_needed=list(self.problems),
+            needs_revision=True,
+            paragraph_issues=list(self.paragraph_issues),
+            prejudged=True
+        )
+
+
+class PreJudge:
+    '''Length, formatting, lexicon, readability and ending checks'''
+
+    # score given to locally failed stories, below the chapter approval floor
+    FAIL_SCORE = 5.0
+
+    def __init__(self, min_words: int = 400, max_words: int = 800, max_grade: float = 8.0):
+        self.min_words = min_words
+        self.max_words = max_words
+        # Flesch-Kincaid grade above which a story is too hard for ages 5-10
+        self.max_grade = max_grade
+
+    def check(self, story: str) -> PreJudgement:
+        '''Fix formatting and check the story, deciding 'fail' or 'inconclusive' '''
+        fixed = fix_formatting(story)
+        paragraphs = split_paragraphs(fixed)
+        word_count = len(fixed.split())
+        grade = reading_grade(fixed)
+        judgement = PreJudgement(
+            story=fixed,
+            verdict='inconclusive',
+            formatting_fixed=fixed != story.strip(),
+            metrics={'words': word_count, 'reading_grade': grade}
+        )
+
+        # length and reading level need a full rewrite rather than paragraph fixes
+        whole_story = False
+        if word_count < self.min_words or word_count > self.max_words:
+            whole_story = True
+            judgement.problems.append(
+                f'The story is {word_count} words long; rewrite it to {self.min_words}-{self.max_words} words'
+            )
+        found = set()
+        for number, paragraph in enumerate(paragraphs, 1):
+            words = sorted({match.lower() for match in SCARY_WORDS.findall(paragraph)})
+            if words:
+                found.update(words)
+                judgement.paragraph_issues.append(
+                    {'paragraph': number, 'issue': f"remove frightening words ({', '.join(words)})"}
+                )
+        if found:
+            judgement.age_appropriate = False
+            judgement.problems.append(f"Replace frightening words unsuitable for bedtime: {', '.join(sorted(found))}")
+        if grade > self.max_grade:
+            whole_story = True
+            judgement.problems.append(
+                f'The language reads at grade {grade}; use shorter sentences and simpler words for ages 5-10'
+            )
+        if paragraphs and is_truncated(fixed):
+            judgement.problems.append('The story stops mid-sentence; finish the ending')
+            judgement.paragraph_issues.append({'paragraph': len(paragraphs), 'issue': 'finish the cut-off ending'})
+
+        if judgement.problems:
+            judgement.verdict = 'fail'
+        if whole_story:
+            judgement.paragraph_issues = []
+        return judgement
@@ -0,0 +1,142 @@
+'''Revision Policy - Decides when another revision is worth its calls.
+
+Each revision costs a Revision Agent call and a Judge call, but often barely
+moves the score. The policy stops revising once a revision gains less than
+``min_gain``, skips revisions whose only requested improvements are cosmetic,
+and skips them for story categories where revisions have historically not
+paid off. Expected gains per ``story_category`` are learned from the judge
+scores in the feedback logs and keep updating as new revisions are judged.
+'''
+
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from bedtime_story_generator.core.models import JudgeEvaluation
+from bedtime_story_generator.utils.session_log import load_recent_sessions
+
+# decisions returned by RevisionPolicy.decide; only 'revise' leads to a revision
+REVISION_DECISIONS = ('revise', 'approved', 'cosmetic', 'low_gain', 'low_expected_gain')
+
+# improvements that polish wording rather than change the story
+COSMETIC_PATTERN = re.compile(
+    r'\b(typos?|spelling|punctuation|grammar|grammatical|capitali[sz]\w*|formatting|'
+    r'word choice|wording|phrasing|comma\w*|hyphen\w*|repetitive words?)\b',
+    re.IGNORECASE
+)
+
+
+def is_cosmetic(evaluation: JudgeEvaluation) -> bool:
+    '''Whether every improvement the judge asked for is cosmetic'''
+    improvements = [item for item in evaluation.improvements_needed if item.strip()]
+    return bool(improvements) and all(COSMETIC_PATTERN.search(item) for item in improvements)
+
+
+def revision_gains(session: Dict[str, Any]) -> Iterable[float]:
+    '''Score change of each judge-driven revision in a logged session'''
+    previous: Dict[Optional[int], float] = {}
+    for generation in session.get('generations', []):
+        evaluation = generation.get('evaluation')
+        if not evaluation or evaluation.get('overall_score') is None:
+            continue
+        chapter = generation.get('chapter_number')
+        if evaluation.get('prejudged'):
+            # locally failed drafts carry a placeholder score, so no gain is measured from them
+            previous.pop(chapter, None)
+            continue
+        score = evaluation['overall_score']
+        kind = generation.get('type')
+        if kind in ('initial', 'chapter'):
+            previous[chapter] = score
+        elif kind == 'candidate':
+            # best-of-N revises the best candidate
+            previous[chapter] = max(score, previous.get(chapter, score))
+        elif kind == 'revision' and chapter in previous:
+            yield score - previous[chapter]
+            previous[chapter] = score
+
+
+class RevisionPolicy:
+    '''Adaptive early-exit rules for the judge/revise loop'''
+
+    def __init__(
+            self,
+            min_gain: float = 0.3,
+            prior_gain: float = 1.0,
+            prior_weight: float = 3.0,
+            chapter_score_floor: float = 7.0
+        ):
+        self.min_gain = min_gain
+        # expected gains start at prior_gain, as if seen prior_weight times, until history outweighs it
+        self.prior_gain = prior_gain
+        self.prior_weight = prior_weight
+        # chapters scoring at least this are good enough to keep the story moving
+        self.chapter_score_floor = chapter_score_floor
+        self._gains: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def record_gain(self, category: str, gain: float):
+        '''Fold one judged revision into the category's expected gain'''
+        with self._lock:
+            total, count = self._gains.get(category, (0.0, 0))
+            self._gains[category] = (total + gain, count + 1)
+
+    def expected_gain(self, category: str) -> float:
+        '''Expected score gain from one revision in a category'''
+        with self._lock:
+            total, count = self._gains.get(category, (0.0, 0))
+        return (total + self.prior_gain * self.prior_weight) / (count + self.prior_weight)
+
+    def expected_gains(self) -> Dict[str, Dict[str, float]]:
+        '''Expected gain and number of observed revisions per category'''
+        with self._lock:
+            counts = {category: count for category, (_, count) in self._gains.items()}
+        return {
+            category: {'expected_gain': round(self.expected_gain(category), 3), 'revisions': count}
+            for category, count in counts.items()
+        }
+
+    def learn(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        '''Learn expected gains from logged sessions and return how many revisions were seen'''
+        seen = 0
+        for session in sessions:
+            category = (session.get('narrative_plan') or {}).get('story_category') or 'unknown'
+            for gain in revision_gains(session):
+                self.record_gain(category, gain)
+                seen += 1
+        return seen
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict[str, Any]], **kwargs: Any) -> 'RevisionPolicy':
+        '''A policy that has learned from already loaded sessions'''
+        policy = cls(**kwargs)
+        policy.learn(sessions)
+        return policy
+
+    @classmethod
+    def from_log_dir(cls, log_dir: str, max_sessions: int = 1000, **kwargs: Any) -> 'RevisionPolicy':
+        '''A policy that has learned from the most recent sessions in a feedback log directory'''
+        return cls.from_sessions(load_recent_sessions(log_dir, max_sessions), **kwargs)
+
+    def decide(
+            self,
+            evaluation: JudgeEvaluation,
+            category: str,
+            last_gain: Optional[float] = None,
+            is_chapter: bool = False
+        ) -> str:
+        '''Whether to revise ('revise') or why not (one of REVISION_DECISIONS)'''
+        if not evaluation.needs_revision:
+            return 'approved'
+        if not evaluation.age_appropriate:
+            # never let an inappropriate story through on cost grounds
+            return 'revise'
+        if is_chapter and evaluation.overall_score >= self.chapter_score_floor:
+            return 'approved'
+        if is_cosmetic(evaluation):
+            return 'cosmetic'
+        if last_gain is not None and last_gain < self.min_gain:
+            return 'low_gain'
+        if self.expected_gain(category) < self.min_gain:
+            return 'low_expected_gain'
+        return 'revise'
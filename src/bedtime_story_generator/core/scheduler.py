@@ -0,0 +1,220 @@
+'''Request Scheduler - Rate limits, retries and priorities for every model call.
+
+All agent calls made by ``StoryOrchestrator`` go through a ``RequestScheduler``.
+It holds each call until token buckets for requests per minute and tokens per
+minute have room, so a busy process runs at the provider's limits instead of
+tripping them. Rate limits (429), server errors and timeouts are retried with
+jittered exponential backoff; a rate limit also pauses every waiting call for
+the backoff so they do not all retry at once. When capacity is short, callers
+are served by priority lane: interactive work first, then speculative prefetches,
+then batch jobs.
+
+Orchestrators can share a scheduler, and with it the provider's limits, from
+any number of event loops (the synchronous methods' background loop and a
+server's, say). Asyncio primitives belong to one loop, so each loop waits in its
+own priority queue while the token buckets are shared under a thread lock.
+'''
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import openai
+
+T = TypeVar('T')
+
+# most urgent first
+PRIORITIES = ('interactive', 'prefetch', 'batch')
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+RETRYABLE_STATUS = {408, 409, 429}
+# a loop's condition and its waiting calls as (priority, arrival) entries
+Lane = Tuple[asyncio.Condition, List[Tuple[int, int]]]
+
+
+def is_retryable(error: BaseException) -> bool:
+    '''Whether an error is transient: a rate limit, timeout, connection or server error'''
+    if isinstance(error, (RETRYABLE_ERRORS, asyncio.TimeoutError)):
+        return True
+    status = getattr(error, 'status_code', None)
+    return isinstance(status, int) and (status in RETRYABLE_STATUS or status >= 500)
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    '''Whether an error is the provider's rate limit (HTTP 429)'''
+    return isinstance(error, openai.RateLimitError) or getattr(error, 'status_code', None) == 429
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    '''Seconds the provider asked us to wait, from a Retry-After header'''
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    '''Refills at ``per_minute`` units a minute, holding at most a minute's worth'''
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        '''Seconds until ``amount`` can be taken (larger amounts wait for a full bucket)'''
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        '''Take ``amount``, possibly going into debt that later calls wait out'''
+        self._refill()
+        self.level -= amount
+
+
+class RequestScheduler:
+    '''Token-bucket rate limiting, priority lanes, timeouts and retries with backoff'''
+
+    def __init__(
+            self,
+            requests_per_minute: Optional[float] = None,
+            tokens_per_minute: Optional[float] = None,
+            max_retries: int = 4,
+            base_delay: float = 1.0,
+            max_delay: float = 30.0,
+            timeout: Optional[float] = 120.0
+        ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # per attempt; None waits as long as the call takes
+        self.timeout = timeout
+        self.stats: Dict[str, Any] = {
+            'calls': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'timeouts': 0,
+            'failed': 0,
+            'wait_seconds': {priority: 0.0 for priority in PRIORITIES}
+        }
+        self._order = itertools.count()
+        self._pause_until = 0.0
+        # each event loop's condition and waiting calls, dropped with the loop
+        self._lanes: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Lane]' = weakref.WeakKeyDictionary()
+        # the buckets and pause are shared by every loop's threads
+        self._lock = threading.Lock()
+
+    async def run(
+            self,
+            call: Callable[[], Awaitable[T]],
+            estimated_tokens: int = 0,
+            priority: str = 'interactive',
+            retryable: Callable[[], bool] = lambda: True
+        ) -> T:
+        '''Run ``call`` once capacity allows, retrying transient failures
+
+        ``call`` is invoked afresh for every attempt. ``retryable`` is asked before
+        each retry, so a caller that has already streamed output can refuse one.
+        '''
+        if priority not in PRIORITIES:
+            raise ValueError(f'priority must be one of {PRIORITIES}')
+        attempt = 0
+        while True:
+            await self._acquire(estimated_tokens, priority)
+            self.stats['calls'] += 1
+            try:
+                if self.timeout is None:
+                    return await call()
+                return await asyncio.wait_for(call(), self.timeout)
+            except Exception as error:
+                if isinstance(error, asyncio.TimeoutError):
+                    self.stats['timeouts'] += 1
+                if not is_retryable(error) or attempt >= self.max_retries or not retryable():
+                    self.stats['failed'] += 1
+                    raise
+                delay = self.backoff(attempt, error)
+                if is_rate_limit(error):
+                    self.stats['rate_limited'] += 1
+                    # hold everyone back, not just this caller
+                    with self._lock:
+                        self._pause_until = max(self._pause_until, time.monotonic() + delay)
+                attempt += 1
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        '''Correct the token bucket once a call's real usage is known'''
+        if self.tokens:
+            with self._lock:
+                self.tokens.take(actual_tokens - estimated_tokens)
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        '''Full-jitter exponential backoff, or at least what Retry-After asks for'''
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        requested = retry_after(error) if error is not None else None
+        return max(delay, min(requested, self.max_delay)) if requested is not None else delay
+
+    def _delay(self, estimated_tokens: int) -> float:
+        '''Seconds until a call of this size may start'''
+        delays = [self._pause_until - time.monotonic()]
+        if self.requests:
+            delays.append(self.requests.delay(1))
+        if self.tokens:
+            delays.append(self.tokens.delay(estimated_tokens))
+        return max(0.0, *delays)
+
+    async def _acquire(self, estimated_tokens: int, priority: str):
+        '''Wait for the call's turn and capacity, then take it from the buckets'''
+        condition, waiting = self._lane()
+        entry = (PRIORITIES.index(priority), next(self._order))
+        start = time.monotonic()
+        async with condition:
+            heapq.heappush(waiting, entry)
+            try:
+                while True:
+                    # only the most urgent waiter may start; the rest wait to be woken
+                    timeout = None
+                    if waiting[0] == entry:
+                        with self._lock:
+                            timeout = self._delay(estimated_tokens)
+                            if timeout <= 0:
+                                self._take(estimated_tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                waiting.remove(entry)
+                heapq.heapify(waiting)
+                condition.notify_all()
+        self.stats['wait_seconds'][priority] += time.monotonic() - start
+
+    def _lane(self) -> Lane:
+        '''The running loop's condition and waiting calls, created on its first call'''
+        loop = asyncio.get_running_loop()
+        lane = self._lanes.get(loop)
+        if lane is None:
+            lane = self._lanes[loop] = (asyncio.Condition(), [])
+        return lane
+
+    def _take(self, estimated_tokens: int):
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(estimated_tokens)
@@ -0,0 +1,525 @@
+'''Story Server - Serves story generation over HTTP from a single asyncio process.
+
+A small HTTP/1.1 server on ``asyncio.start_server`` (no web framework needed)
+backed by a pool of ``StoryOrchestrator`` workers that share one scheduler, so
+``workers`` bounds the stories being written at once and every worker stays
+within the provider's rate limits together.
+
+Endpoints (JSON bodies; one request per connection):
+
+    GET  /health                                 worker, session and scheduler stats
+    POST /stories                                {"user_request": ...} -> a short story
+    POST /long-stories                           {"user_request": ..., "max_chapters": 5} -> story_id and plan
+    GET  /long-stories/{story_id}                chapters so far and the chapter awaiting acceptance
+    POST /long-stories/{story_id}/chapters       {"feedback": optional} -> the next chapter
+    POST /long-stories/{story_id}/chapters/revise  {"feedback": ...} -> the latest chapter, revised
+    POST /long-stories/{story_id}/end            finish the story
+
+Story and chapter requests stream the text as server-sent events when the body
+has ``"stream": true`` or the client accepts ``text/event-stream``: a ``delta``
+event per piece of text, then ``done`` with the same JSON as the plain response
+(whose story is the improved version if a revision replaced the streamed draft).
+
+Long stories follow the CLI: the newest chapter waits for the reader, who can
+revise it, and is checkpointed to the ``StoryStore`` once they ask for the next
+chapter or end the story. Only the story's checkpoint state and that chapter are
+kept per session, chapters are capped by ``max_chapters`` and request text by
+``max_text_chars``. Sessions live in a ``SessionStore``, which spills idle ones
+to disk past ``max_session_bytes`` and reloads them on their next request.
+Each long story has one feedback session, reopened for every request, so its
+chapters and revisions are logged together with its narrative plan.
+
+Usage:
+    python -m bedtime_story_generator.core.server --port 8000 --workers 8
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import re
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.planning import PlanCache, RequestClassifier
+from bedtime_story_generator.core.prejudge import PreJudge
+from bedtime_story_generator.core.revision_policy import RevisionPolicy
+from bedtime_story_generator.core.scheduler import RequestScheduler
+from bedtime_story_generator.core.session_store import LongStorySession, SessionStore
+from bedtime_story_generator.core.story_state import DEFAULT_MAX_CHAPTERS, StoryStore
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger, FeedbackSession
+from bedtime_story_generator.utils.session_log import load_recent_sessions
+
+MAX_HEADERS = 100
+STORY_ID = r'(?P<story_id>[\w-]+)'
+ROUTES = [
+    ('GET', re.compile(r'^/health$'), '_health'),
+    ('POST', re.compile(r'^/stories$'), '_short_story'),
+    ('POST', re.compile(r'^/long-stories$'), '_create_long_story'),
+    ('GET', re.compile(rf'^/long-stories/{STORY_ID}$'), '_get_long_story'),
+    ('POST', re.compile(rf'^/long-stories/{STORY_ID}/chapters$'), '_next_chapter'),
+    ('POST', re.compile(rf'^/long-stories/{STORY_ID}/chapters/revise$'), '_revise_chapter'),
+    ('POST', re.compile(rf'^/long-stories/{STORY_ID}/end$'), '_end_long_story'),
+]
+# handlers that can stream story text as server-sent events
+STREAMING = {'_short_story', '_next_chapter'}
+
+
+class HTTPError(Exception):
+    '''An error response with a status code and a message for the client'''
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def encode_sse(event: str, data: Any) -> bytes:
+    '''One server-sent event with a JSON payload'''
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'.encode('utf-8')
+
+
+def _text(body: Dict[str, Any], name: str, limit: int, required: bool = True) -> Optional[str]:
+    '''A trimmed string field from a request body, checked for presence and length'''
+    value = body.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise HTTPError(400, f'"{name}" must be a non-empty string')
+    if len(value) > limit:
+        raise HTTPError(400, f'"{name}" must be at most {limit} characters')
+    return value.strip() or None
+
+
+class StoryServer:
+    '''HTTP API over a pool of story orchestrators'''
+
+    def __init__(
+            self,
+            workers: int = 4,
+            log_dir: str = 'feedback_logs',
+            state_dir: str = 'story_states',
+            max_session_bytes: int = 64 * 1024 * 1024,
+            max_chapters: int = DEFAULT_MAX_CHAPTERS,
+            max_text_chars: int = 2000,
+            max_body_bytes: int = 64 * 1024,
+            read_timeout: float = 30.0,
+            orchestrator_factory: Optional[Callable[[FeedbackLogger], StoryOrchestrator]] = None,
+            scheduler: Optional[RequestScheduler] = None
+        ):
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.workers = workers
+        self.log_dir = log_dir
+        self.store = StoryStore(state_dir)
+        # long stories kept in memory; the least recently used idle ones are spilled to disk past the cap
+        self.sessions = SessionStore(os.path.join(state_dir, 'sessions.db'), max_bytes=max_session_bytes)
+        self.max_chapters = max_chapters
+        self.max_text_chars = max_text_chars
+        self.max_body_bytes = max_body_bytes
+        # seconds a client may take to send its request
+        self.read_timeout = read_timeout
+        # shared by every worker, so together they stay within the provider's rate limits
+        self.scheduler = scheduler or RequestScheduler()
+        self.orchestrator_factory = orchestrator_factory
+        self.logger: Optional[FeedbackLogger] = None
+        self.orchestrators: List[StoryOrchestrator] = []
+        self.stats = {'requests': 0, 'errors': 0, 'streams': 0}
+        self._idle: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _default_factory(self, logger: FeedbackLogger) -> Callable[[FeedbackLogger], StoryOrchestrator]:
+        '''Orchestrators configured like the CLI's, sharing what they learn'''
+        sessions = load_recent_sessions(logger.log_dir)
+        revision_policy = RevisionPolicy.from_sessions(sessions)
+        plan_cache = PlanCache.from_sessions(sessions)
+        request_classifier = RequestClassifier.from_sessions(sessions)
+        return lambda logger: StoryOrchestrator(
+            show_spinner=False,
+            feedback_logger=logger,
+            scheduler=self.scheduler,
+            revision_policy=revision_policy,
+            pre_judge=PreJudge(),
+            planning='pipelined',
+            plan_cache=plan_cache,
+            request_classifier=request_classifier
+        )
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000) -> asyncio.AbstractServer:
+        '''Create the workers and start listening'''
+        # workers share one logger; each story logs to its own session handle
+        self.logger = FeedbackLogger(log_dir=self.log_dir, background=True)
+        factory = self.orchestrator_factory or self._default_factory(self.logger)
+        self.orchestrators = [factory(self.logger) for _ in range(self.workers)]
+        self._idle = asyncio.Queue()
+        for orchestrator in self.orchestrators:
+            self._idle.put_nowait(orchestrator)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000):
+        '''Serve until cancelled, then checkpoint open stories'''
+        server = await self.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        '''Stop listening, spill every open story to disk and close the logs'''
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.sessions.close()
+        if self.logger:
+            self.logger.close()
+
+    @property
+    def port(self) -> Optional[int]:
+        '''The port being listened on, e.g. after starting on port 0'''
+        return self._server.sockets[0].getsockname()[1] if self._server else None
+
+    @asynccontextmanager
+    async def _worker(self) -> AsyncIterator[StoryOrchestrator]:
+        '''Wait for an idle orchestrator and hand it back afterwards'''
+        orchestrator = await self._idle.get()
+        try:
+            yield orchestrator
+        finally:
+            self._idle.put_nowait(orchestrator)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        '''Serve one request on a connection, then close it'''
+        self.stats['requests'] += 1
+        try:
+            try:
+                method, path, headers, body = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+                handler, params = self._route(method, path)
+                stream = handler in STREAMING and (
+                    body.get('stream') is True or 'text/event-stream' in headers.get('accept', '')
+                )
+                if stream:
+                    await self._respond_stream(writer, getattr(self, handler), body, params)
+                else:
+                    status, payload = await getattr(self, handler)(body, **params)
+                    await self._respond(writer, status, payload)
+            except asyncio.TimeoutError:
+                await self._respond_error(writer, HTTPError(408, 'request not received in time'))
+            except HTTPError as error:
+                await self._respond_error(writer, error)
+            except ConnectionError:
+                raise
+            except Exception as error:
+                await self._respond_error(writer, HTTPError(500, f'{type(error).__name__}: {error}'))
+        except ConnectionError:
+            # the client went away; nothing left to tell it
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], Dict[str, Any]]:
+        '''Parse the request line, headers and JSON body'''
+        try:
+            request_line = (await reader.readline()).decode('latin-1')
+            method, target, _ = request_line.split(' ', 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                if len(headers) >= MAX_HEADERS:
+                    raise HTTPError(431, 'too many headers')
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            # includes lines longer than the reader's limit
+            raise HTTPError(400, 'malformed request')
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f'request body must be at most {self.max_body_bytes} bytes')
+        body: Dict[str, Any] = {}
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except (asyncio.IncompleteReadError, ValueError):
+                raise HTTPError(400, 'request body must be JSON')
+            if not isinstance(body, dict):
+                raise HTTPError(400, 'request body must be a JSON object')
+        return method.upper(), urlsplit(target).path, headers, body
+
+    def _route(self, method: str, path: str) -> Tuple[str, Dict[str, str]]:
+        '''The handler name and path parameters for a request'''
+        allowed = False
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict()
+                allowed = True
+        if allowed:
+            raise HTTPError(405, f'{method} is not allowed on {path}')
+        raise HTTPError(404, f'no such endpoint: {path}')
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n'
+            .encode('latin-1') + data
+        )
+        await writer.drain()
+
+    async def _respond_error(self, writer: asyncio.StreamWriter, error: HTTPError):
+        self.stats['errors'] += 1
+        await self._respond(writer, error.status, {'error': error.message})
+
+    async def _respond_stream(
+            self,
+            writer: asyncio.StreamWriter,
+            handler: Callable[..., Any],
+            body: Dict[str, Any],
+            params: Dict[str, str]
+        ):
+        '''Run a handler, streaming its text as server-sent events
+
+        The event-stream headers are only sent with the first text, so a request
+        rejected before any text gets an ordinary error response. If the client
+        disconnects, the generation is cancelled.
+        '''
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(handler(body, on_delta=queue.put_nowait, **params))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        started = False
+        try:
+            while True:
+                delta = await queue.get()
+                if delta is None:
+                    break
+                if not started:
+                    started = True
+                    self.stats['streams'] += 1
+                    writer.write(
+                        b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                        b'Cache-Control: no-cache\r\nConnection: close\r\n\r\n'
+                    )
+                writer.write(encode_sse('delta', {'text': delta}))
+                await writer.drain()
+            if not started:
+                status, payload = await task
+                await self._respond(writer, status, payload)
+                return
+            try:
+                _, payload = await task
+            except Exception as error:
+                self.stats['errors'] += 1
+                message = error.message if isinstance(error, HTTPError) else f'{type(error).__name__}: {error}'
+                writer.write(encode_sse('error', {'error': message}))
+            else:
+                writer.write(encode_sse('done', payload))
+            await writer.drain()
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    async def _health(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        return 200, {
+            'status': 'ok',
+            'workers': self.workers,
+            'idle_workers': self._idle.qsize(),
+            'sessions': self.sessions.metrics(),
+            'server': self.stats,
+            'scheduler': self.scheduler.stats
+        }
+
+    async def _short_story(
+            self,
+            body: Dict[str, Any],
+            on_delta: Optional[Callable[[str], None]] = None
+        ) -> Tuple[int, Dict[str, Any]]:
+        user_request = _text(body, 'user_request', self.max_text_chars)
+        async with self._worker() as orchestrator:
+            session = orchestrator.logger.start_session(user_request, 'short')
+            try:
+                story, evaluation, revision_count = await orchestrator.create_short_story_async(
+                    user_request, on_delta=on_delta, session=session
+                )
+            finally:
+                session.end()
+        return 200, {'story': story, 'evaluation': asdict(evaluation), 'revision_count': revision_count}
+
+    async def _create_long_story(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        user_request = _text(body, 'user_request', self.max_text_chars)
+        max_chapters = body.get('max_chapters', self.max_chapters)
+        if not isinstance(max_chapters, int) or not 1 <= max_chapters <= self.max_chapters:
+            raise HTTPError(400, f'"max_chapters" must be a whole number from 1 to {self.max_chapters}')
+        async with self._worker() as orchestrator:
+            feedback = orchestrator.logger.start_session(user_request, 'long')
+            try:
+                narrative_plan = await orchestrator.init_long_story_async(user_request, session=feedback)
+            finally:
+                feedback.end()
+        session = LongStorySession(
+            self.store.create(user_request, narrative_plan, max_chapters), feedback_session_id=feedback.session_id
+        )
+        self.sessions.add(session)
+        return 201, session.describe()
+
+    async def _get_long_story(self, body: Dict[str, Any], story_id: str) -> Tuple[int, Dict[str, Any]]:
+        return 200, self._session(story_id).describe()
+
+    async def _next_chapter(
+            self,
+            body: Dict[str, Any],
+            story_id: str,
+            on_delta: Optional[Callable[[str], None]] = None
+        ) -> Tuple[int, Dict[str, Any]]:
+        user_feedback = _text(body, 'feedback', self.max_text_chars, required=False)
+        async with self._long_story(story_id) as session:
+            self._accept(session)
+            state = session.state
+            if not state.can_resume:
+                raise HTTPError(409, 'the story is complete')
+            if user_feedback:
+                self.store.set_next_chapter_feedback(state, user_feedback)
+            chapter_num = state.next_chapter_number
+            async with self._worker() as orchestrator:
+                # the checkpointed memory saves rebuilding it on a worker that has not seen this story
+                orchestrator.resume_long_story(state)
+                async with self._story_feedback(orchestrator, session) as feedback:
+                    chapter, evaluation = await orchestrator.generate_next_chapter_async(
+                        state.user_request, state.narrative_plan, list(state.chapters), chapter_num,
+                        state.next_chapter_feedback, on_delta, session=feedback
+                    )
+                memory = orchestrator.latest_memory(state.user_request, state.chapters + [chapter])
+            session.pending_chapter, session.pending_evaluation, session.pending_memory = chapter, evaluation, memory
+        return 200, {
+            'story_id': story_id,
+            'chapter_number': chapter_num,
+            'chapter': chapter,
+            'evaluation': asdict(evaluation),
+            'final': chapter_num >= state.max_chapters
+        }
+
+    async def _revise_chapter(self, body: Dict[str, Any], story_id: str) -> Tuple[int, Dict[str, Any]]:
+        user_feedback = _text(body, 'feedback', self.max_text_chars)
+        async with self._long_story(story_id) as session:
+            if session.pending_chapter is None:
+                raise HTTPError(409, 'there is no new chapter to revise')
+            state = session.state
+            chapter_num = state.next_chapter_number
+            async with self._worker() as orchestrator, self._story_feedback(orchestrator, session) as feedback:
+                chapter = await orchestrator.revise_chapter_with_feedback_async(
+                    session.pending_chapter, state.user_request, state.narrative_plan, user_feedback,
+                    chapter_num, session=feedback
+                )
+            session.pending_chapter, session.pending_evaluation = chapter, None
+        return 200, {'story_id': story_id, 'chapter_number': chapter_num, 'chapter': chapter}
+
+    async def _end_long_story(self, body: Dict[str, Any], story_id: str) -> Tuple[int, Dict[str, Any]]:
+        async with self._long_story(story_id) as session:
+            self._accept(session)
+            if not session.state.complete:
+                self.store.mark_complete(session.state)
+            self.sessions.remove(story_id)
+        return 200, session.describe()
+
+    def _session(self, story_id: str) -> LongStorySession:
+        '''A story's session, from memory, its spill or its checkpoint'''
+        # the CLI may have carried on the story since it was spilled, leaving the spill behind
+        session = self.sessions.get(story_id, valid_after=self.store.modified_at(story_id))
+        if session is None:
+            state = self.store.load(story_id)
+            if state is None:
+                raise HTTPError(404, f'no such story: {story_id}')
+            session = LongStorySession(state)
+            self.sessions.add(session)
+        return session
+
+    @asynccontextmanager
+    async def _long_story(self, story_id: str) -> AsyncIterator[LongStorySession]:
+        '''A story's session, kept in memory and locked against its other requests until done'''
+        session = self._session(story_id)
+        session.active += 1
+        try:
+            async with session.lock:
+                yield session
+        finally:
+            session.active -= 1
+            self.sessions.update(session)
+
+    @asynccontextmanager
+    async def _story_feedback(
+            self,
+            orchestrator: StoryOrchestrator,
+            session: LongStorySession
+        ) -> AsyncIterator[FeedbackSession]:
+        '''The story's feedback session, reopened for one request and compacted after it'''
+        logger = orchestrator.logger
+        feedback = None
+        if session.feedback_session_id:
+            # replaying the log waits for the writer thread, so keep it off the event loop
+            feedback = await asyncio.to_thread(logger.resume_session, session.feedback_session_id)
+        if feedback is None:
+            # a story from a checkpoint, or whose log was archived: start one with its plan,
+            # which is what revisions and chapters are filed under
+            feedback = logger.start_session(session.state.user_request, 'long')
+            feedback.log_narrative_plan(session.state.narrative_plan)
+            session.feedback_session_id = feedback.session_id
+        try:
+            yield feedback
+        finally:
+            feedback.end()
+
+    def _accept(self, session: LongStorySession):
+        '''Checkpoint the chapter waiting for the reader, as moving on accepts it'''
+        if session.pending_chapter is None:
+            return
+        self.store.checkpoint_chapter(
+            session.state, session.pending_chapter, session.pending_evaluation, session.pending_memory
+        )
+        session.pending_chapter = session.pending_evaluation = session.pending_memory = None
+
+def main():
+    '''Command-line entry point for the HTTP service'''
+    parser = argparse.ArgumentParser(description='Serve bedtime stories over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1', help='interface to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument('--workers', type=int, default=4, help='maximum stories being written at once')
+    parser.add_argument('--max-session-mb', type=float, default=64, help='memory for long stories before idle ones go to disk')
+    parser.add_argument('--log-dir', default='feedback_logs', help='feedback log directory')
+    parser.add_argument('--state-dir', default='story_states', help='long-story checkpoint directory')
+    parser.add_argument('--requests-per-minute', type=float, help="the model provider's request rate limit")
+    parser.add_argument('--tokens-per-minute', type=float, help="the model provider's token rate limit")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    scheduler = RequestScheduler(
+        requests_per_minute=args.requests_per_minute, tokens_per_minute=args.tokens_per_minute
+    )
+    server = StoryServer(
+        workers=args.workers,
+        log_dir=args.log_dir,
+        state_dir=args.state_dir,
+        max_session_bytes=int(args.max_session_mb * 1024 * 1024),
+        scheduler=scheduler
+    )
+    print(f'Serving stories on http://{args.host}:{args.port}')
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
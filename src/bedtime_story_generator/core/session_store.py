@@ -0,0 +1,229 @@
+'''Session Store - Keeps hot long-story sessions in memory and spills idle ones to disk.
+
+A reader can leave a long story idle for hours between chapters. ``SessionStore``
+keeps the most recently used sessions in memory while their estimated size stays
+under ``max_bytes``; past that, the least recently used idle session is written
+to SQLite as zlib-compressed JSON and dropped from memory. The next request for
+it reloads it in one read (the chapter awaiting the reader included) instead of
+replaying its checkpoint file, and the reload time is tracked.
+
+Sessions in use by a request are never spilled, so the cap can be exceeded while
+many stories are being written at once; ``trim`` restores it as they finish.
+'''
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+from bedtime_story_generator.core.memory import NarrativeMemory
+from bedtime_story_generator.core.models import JudgeEvaluation
+from bedtime_story_generator.core.story_state import StoryState
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS spilled_sessions (
+    story_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    spilled_at REAL NOT NULL
+);
+'''
+
+
+@dataclass
+class LongStorySession:
+    '''A long story being read: its checkpoint state and the chapter awaiting acceptance'''
+    state: StoryState
+    pending_chapter: Optional[str] = None
+    pending_evaluation: Optional[JudgeEvaluation] = None
+    # memory of the chapters before the pending one, checkpointed with it
+    pending_memory: Optional[NarrativeMemory] = None
+    # feedback log session every request for the story appends to
+    feedback_session_id: Optional[str] = None
+    # requests holding the session; only sessions nobody holds are spilled
+    active: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def story_id(self) -> str:
+        return self.state.story_id
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'story_id': self.state.story_id,
+            'user_request': self.state.user_request,
+            'narrative_plan': asdict(self.state.narrative_plan),
+            'max_chapters': self.state.max_chapters,
+            'chapters': self.state.chapters,
+            'pending_chapter': self.pending_chapter,
+            'complete': self.state.complete
+        }
+
+
+def encode_long_story(session: LongStorySession) -> str:
+    '''Compact JSON for everything in a session except its lock and users'''
+    state = asdict(session.state)
+    record = {
+        'state': state,
+        'pending_chapter': session.pending_chapter,
+        'pending_evaluation': asdict(session.pending_evaluation) if session.pending_evaluation else None,
+        'pending_memory': asdict(session.pending_memory) if session.pending_memory else None,
+        'feedback_session_id': session.feedback_session_id
+    }
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_long_story(text: str) -> LongStorySession:
+    '''Rebuild a session from ``encode_long_story`` output'''
+    record = json.loads(text)
+    return LongStorySession(
+        state=StoryState.from_dict(record['state']),
+        pending_chapter=record['pending_chapter'],
+        pending_evaluation=JudgeEvaluation(**record['pending_evaluation']) if record['pending_evaluation'] else None,
+        pending_memory=NarrativeMemory(**record['pending_memory']) if record['pending_memory'] else None,
+        feedback_session_id=record.get('feedback_session_id')
+    )
+
+
+class SessionStore:
+    '''LRU of long-story sessions under a memory cap, spilling to SQLite'''
+
+    def __init__(
+            self,
+            db_path: str = 'story_states/sessions.db',
+            max_bytes: int = 64 * 1024 * 1024,
+            max_sessions: Optional[int] = None
+        ):
+        # estimated from each session's encoded size, measured whenever a request releases it
+        self.max_bytes = max_bytes
+        self.max_sessions = max_sessions
+        self.stats = {'spills': 0, 'reloads': 0, 'stale': 0, 'reload_seconds_total': 0.0, 'reload_seconds_max': 0.0}
+        self._sessions: 'OrderedDict[str, LongStorySession]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self._sessions
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, story_id: str, valid_after: Optional[float] = None) -> Optional[LongStorySession]:
+        '''The session for a story, reloading it if it was spilled; None if the store never had it
+
+        A spilled copy written before ``valid_after`` (say, when the story's checkpoint
+        was last extended by another process) is stale, so it is dropped and None returned.
+        '''
+        session = self._sessions.get(story_id)
+        if session is not None:
+            self._sessions.move_to_end(story_id)
+            return session
+        start = time.perf_counter()
+        row = self._db.execute(
+            'SELECT data, spilled_at FROM spilled_sessions WHERE story_id = ?', (story_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if valid_after is not None and row[1] < valid_after:
+            self._db.execute('DELETE FROM spilled_sessions WHERE story_id = ?', (story_id,))
+            self._db.commit()
+            self.stats['stale'] += 1
+            return None
+        text = zlib.decompress(row[0]).decode('utf-8')
+        session = decode_long_story(text)
+        self._db.execute('DELETE FROM spilled_sessions WHERE story_id = ?', (story_id,))
+        self._db.commit()
+        self._admit(session, len(text))
+        elapsed = time.perf_counter() - start
+        self.stats['reloads'] += 1
+        self.stats['reload_seconds_total'] += elapsed
+        self.stats['reload_seconds_max'] = max(self.stats['reload_seconds_max'], elapsed)
+        return session
+
+    def add(self, session: LongStorySession):
+        '''Keep a new or reloaded-from-checkpoint session in memory'''
+        self._admit(session, len(encode_long_story(session)))
+
+    def update(self, session: LongStorySession):
+        '''Re-measure a session after a request changed it, then trim to the caps'''
+        if self._sessions.get(session.story_id) is session:
+            self._resize(session.story_id, len(encode_long_story(session)))
+        self.trim()
+
+    def remove(self, story_id: str):
+        '''Forget a session, in memory and on disk'''
+        if self._sessions.pop(story_id, None) is not None:
+            self._bytes -= self._sizes.pop(story_id)
+        self._db.execute('DELETE FROM spilled_sessions WHERE story_id = ?', (story_id,))
+        self._db.commit()
+
+    def trim(self, keep: Optional[LongStorySession] = None):
+        '''Spill least recently used idle sessions until the store is within its caps'''
+        while self._over_caps():
+            idle = next((session for session in self._sessions.values()
+                         if session is not keep and not session.active), None)
+            if idle is None:
+                break
+            self.spill(idle)
+
+    def spill(self, session: LongStorySession):
+        '''Write a session to disk and drop it from memory'''
+        data = zlib.compress(encode_long_story(session).encode('utf-8'))
+        self._db.execute(
+            'INSERT OR REPLACE INTO spilled_sessions (story_id, data, spilled_at) VALUES (?, ?, ?)',
+            (session.story_id, data, time.time())
+        )
+        self._db.commit()
+        self._sessions.pop(session.story_id)
+        self._bytes -= self._sizes.pop(session.story_id)
+        self.stats['spills'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        '''Resident sessions and bytes, spilled sessions, and reload latency'''
+        spilled = self._db.execute('SELECT COUNT(*) FROM spilled_sessions').fetchone()[0]
+        reloads = self.stats['reloads']
+        return {
+            'resident_sessions': len(self._sessions),
+            'resident_bytes': self._bytes,
+            'spilled_sessions': spilled,
+            'spills': self.stats['spills'],
+            'reloads': reloads,
+            'stale_spills': self.stats['stale'],
+            'reload_ms_mean': round(self.stats['reload_seconds_total'] * 1000 / reloads, 3) if reloads else 0.0,
+            'reload_ms_max': round(self.stats['reload_seconds_max'] * 1000, 3)
+        }
+
+    def close(self):
+        '''Spill every resident session, so they survive a restart, and close the database'''
+        for session in list(self._sessions.values()):
+            self.spill(session)
+        self._db.close()
+
+    def _admit(self, session: LongStorySession, size: int):
+        self._sessions[session.story_id] = session
+        self._sessions.move_to_end(session.story_id)
+        self._resize(session.story_id, size)
+        self.trim(keep=session)
+
+    def _resize(self, story_id: str, size: int):
+        self._bytes += size - self._sizes.get(story_id, 0)
+        self._sizes[story_id] = size
+
+    def _over_caps(self) -> bool:
+        return self._bytes > self.max_bytes or (
+            self.max_sessions is not None and len(self._sessions) > self.max_sessions
+        )
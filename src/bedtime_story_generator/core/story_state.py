@@ -0,0 +1,211 @@
+'''Story State - Resumable long-story checkpoints.
+
+A long story's progress (narrative plan, accepted chapters and their
+evaluations, feedback waiting for the next chapter, and the latest narrative
+memory) is checkpointed to ``{story_id}.jsonl`` as append-only events, so saving
+after a chapter costs one small write however long the story has grown. Resuming
+replays the file and hands back everything the orchestrator needs to carry on
+without re-planning or rebuilding the memory, i.e. without any model calls.
+
+A story marked complete is also compacted to a ``{story_id}.json`` snapshot, so
+listing the stories to resume skips finished ones without reading their logs,
+and loading one is a single JSON parse rather than a replay.
+'''
+
+import json
+
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bedtime_story_generator.core.memory import NarrativeMemory
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.utils.session_log import (
+    EVENT_LOG_SUFFIX,
+    append_lines,
+    encode_event,
+    iter_events,
+    replace_file,
+)
+
+DEFAULT_MAX_CHAPTERS = 20
+SNAPSHOT_SUFFIX = '.json'
+
+
+@dataclass
+class StoryState:
+    '''Everything needed to continue a long story'''
+    story_id: str
+    user_request: str
+    narrative_plan: NarrativePlan
+    max_chapters: int = DEFAULT_MAX_CHAPTERS
+    chapters: List[str] = field(default_factory=list)
+    evaluations: List[Optional[JudgeEvaluation]] = field(default_factory=list)
+    next_chapter_feedback: Optional[str] = None
+    memory: Optional[NarrativeMemory] = None
+    complete: bool = False
+    created_at: str = ''
+    updated_at: str = ''
+
+    @property
+    def next_chapter_number(self) -> int:
+        return len(self.chapters) + 1
+
+    @property
+    def can_resume(self) -> bool:
+        return not self.complete and len(self.chapters) < self.max_chapters
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StoryState':
+        '''Rebuild a state from ``asdict`` output'''
+        data = dict(data)
+        data['narrative_plan'] = NarrativePlan(**data['narrative_plan'])
+        data['evaluations'] = [JudgeEvaluation(**evaluation) if evaluation else None for evaluation in data['evaluations']]
+        data['memory'] = NarrativeMemory(**data['memory']) if data['memory'] else None
+        return cls(**data)
+
+    def describe(self) -> str:
+        '''One-line summary for choosing a story to resume'''
+        return f'{self.user_request} (chapter {len(self.chapters)} of {self.max_chapters}, {self.updated_at[:16]})'
+
+    def apply_event(self, event: Dict[str, Any]):
+        '''Apply one checkpoint event'''
+        kind = event['event']
+        if kind == 'chapter':
+            self.chapters.append(event['content'])
+            evaluation = event.get('evaluation')
+            self.evaluations.append(JudgeEvaluation(**evaluation) if evaluation else None)
+            # feedback is used up by the chapter it was given for
+            self.next_chapter_feedback = None
+        elif kind == 'memory':
+            self.memory = NarrativeMemory(**event['memory'])
+        elif kind == 'next_chapter_feedback':
+            self.next_chapter_feedback = event['feedback']
+        elif kind == 'complete':
+            self.complete = True
+        self.updated_at = event.get('timestamp', self.updated_at)
+
+
+class StoryStore:
+    '''Directory of story checkpoints, one append-only file per story'''
+
+    def __init__(self, state_dir: str = 'story_states', fsync: bool = True):
+        self.state_dir = state_dir
+        # chapters are paid-for generations, so by default each checkpoint is synced to disk
+        self.fsync = fsync
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _path(self, story_id: str) -> str:
+        return os.path.join(self.state_dir, f'{story_id}{EVENT_LOG_SUFFIX}')
+
+    def _snapshot_path(self, story_id: str) -> str:
+        return os.path.join(self.state_dir, f'{story_id}{SNAPSHOT_SUFFIX}')
+
+    def _append(self, state: StoryState, event: Dict[str, Any]):
+        event['timestamp'] = datetime.now().isoformat()
+        append_lines(self._path(state.story_id), encode_event(event), self.fsync)
+        state.apply_event(event)
+
+    def create(
+            self,
+            user_request: str,
+            narrative_plan: NarrativePlan,
+            max_chapters: int = DEFAULT_MAX_CHAPTERS
+        ) -> StoryState:
+        '''Start checkpointing a new story'''
+        now = datetime.now()
+        state = StoryState(
+            story_id=f"story_{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
+            user_request=user_request,
+            narrative_plan=narrative_plan,
+            max_chapters=max_chapters,
+            created_at=now.isoformat(),
+            updated_at=now.isoformat()
+        )
+        event = {
+            'event': 'start',
+            'story_id': state.story_id,
+            'user_request': user_request,
+            'narrative_plan': asdict(narrative_plan),
+            'max_chapters': max_chapters,
+            'timestamp': state.created_at
+        }
+        append_lines(self._path(state.story_id), encode_event(event), self.fsync)
+        return state
+
+    def checkpoint_chapter(
+            self,
+            state: StoryState,
+            chapter: str,
+            evaluation: Optional[JudgeEvaluation] = None,
+            memory: Optional[NarrativeMemory] = None
+        ):
+        '''Record an accepted chapter, and the memory if it covers more than the last one saved'''
+        self._append(state, {
+            'event': 'chapter',
+            'chapter_number': state.next_chapter_number,
+            'content': chapter,
+            'evaluation': asdict(evaluation) if evaluation else None
+        })
+        covered = state.memory.chapters_covered if state.memory else 0
+        if memory and covered < memory.chapters_covered <= len(state.chapters):
+            self._append(state, {'event': 'memory', 'memory': asdict(memory)})
+
+    def set_next_chapter_feedback(self, state: StoryState, feedback: str):
+        '''Record what the reader wants from the next chapter'''
+        self._append(state, {'event': 'next_chapter_feedback', 'feedback': feedback})
+
+    def mark_complete(self, state: StoryState):
+        '''Record that the story has ended and should no longer be offered for resuming'''
+        self._append(state, {'event': 'complete'})
+        # nothing more is appended, so the finished story is compacted once
+        replace_file(self._snapshot_path(state.story_id), json.dumps(asdict(state), ensure_ascii=False))
+
+    def load(self, story_id: str) -> Optional[StoryState]:
+        '''Rebuild a story from its snapshot, if finished, or its checkpoint file'''
+        snapshot_path = self._snapshot_path(story_id)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'r') as f:
+                return StoryState.from_dict(json.load(f))
+        path = self._path(story_id)
+        if not os.path.exists(path):
+            return None
+        state = None
+        for event in iter_events(path):
+            if event['event'] == 'start':
+                state = StoryState(
+                    story_id=event['story_id'],
+                    user_request=event['user_request'],
+                    narrative_plan=NarrativePlan(**event['narrative_plan']),
+                    max_chapters=event.get('max_chapters', DEFAULT_MAX_CHAPTERS),
+                    created_at=event['timestamp'],
+                    updated_at=event['timestamp']
+                )
+            elif state is not None:
+                state.apply_event(event)
+        return state
+
+    def modified_at(self, story_id: str) -> Optional[float]:
+        '''When a story's checkpoint was last written (a Unix time), or None if it has none'''
+        try:
+            return os.path.getmtime(self._path(story_id))
+        except FileNotFoundError:
+            return None
+
+    def list_stories(self, resumable_only: bool = True) -> List[StoryState]:
+        '''Stored stories, most recently updated first'''
+        stories = []
+        names = set(os.listdir(self.state_dir))
+        for name in names:
+            if not name.endswith(EVENT_LOG_SUFFIX):
+                continue
+            story_id = name[:-len(EVENT_LOG_SUFFIX)]
+            if resumable_only and f'{story_id}{SNAPSHOT_SUFFIX}' in names:
+                # finished, so not worth reading
+                continue
+            state = self.load(story_id)
+            if state and (state.can_resume or not resumable_only):
+                stories.append(state)
+        return sorted(stories, key=lambda state: state.updated_at, reverse=True)
@@ -1,5 +1,7 @@
 '''Utility modules for the bedtime story generator.'''
 
+from bedtime_story_generator.utils.feedback_index import FeedbackIndex
 from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.instrumentation import CallMetrics, UsageTracker
 
-__all__ = ['FeedbackLogger']
\ No newline at end of file
+__all__ = ['FeedbackLogger', 'FeedbackIndex', 'CallMetrics', 'UsageTracker']
\ No newline at end of file
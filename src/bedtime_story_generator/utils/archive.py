@@ -0,0 +1,303 @@
+'''Archive - Compressed monthly archives and retention for feedback logs.
+
+Sessions whose files have not changed for a while are moved out of the log
+directory into ``archive/YYYY-MM.jsonl.gz``. Story text is stored once per
+archive under its content hash, so a story repeated across the initial, final
+and exit-feedback entries costs its bytes only once, and the whole archive is
+gzip-compressed. Each run appends a new gzip member, so earlier months are never
+rewritten; a member left half-written by an interrupted run is cut off first,
+and readers skip any member that cannot be decompressed. Archived sessions stay readable through ``iter_archived_sessions``,
+which ``FeedbackLogger.get_historical_feedback`` falls back to.
+
+Usage:
+    python -m bedtime_story_generator.utils.archive feedback_logs --older-than-days 7 --retain-days 365
+'''
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bedtime_story_generator.utils.session_log import EVENT_LOG_SUFFIX, read_session_log
+
+ARCHIVE_DIR_NAME = 'archive'
+ARCHIVE_SUFFIX = '.jsonl.gz'
+# text shorter than this is cheaper to keep inline than to reference by hash
+MIN_BLOB_CHARS = 64
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+@dataclass
+class ArchiveReport:
+    '''What an archival run did'''
+    sessions_archived: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    blobs_deduplicated: int = 0
+    archives_deleted: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def summary(self) -> str:
+        ratio = self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+        return (
+            f'Archived {self.sessions_archived} sessions: {self.bytes_before} -> {self.bytes_after} bytes '
+            f'({self.bytes_saved} saved, {ratio:.1f}x), {self.blobs_deduplicated} repeated texts stored once, '
+            f'{self.archives_deleted} expired archives deleted'
+        )
+
+
+def _blob_key(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _session_paths(log_dir: str) -> Dict[str, List[str]]:
+    '''Group the .json and .jsonl files in a log directory by session'''
+    sessions: Dict[str, List[str]] = {}
+    for name in os.listdir(log_dir):
+        for suffix in (EVENT_LOG_SUFFIX, '.json'):
+            if name.endswith(suffix):
+                sessions.setdefault(name[:-len(suffix)], []).append(os.path.join(log_dir, name))
+                break
+    return sessions
+
+
+def _load_session(paths: List[str]) -> Optional[Dict[str, Any]]:
+    '''Read a session from its event log if it has one, otherwise its JSON document'''
+    log_paths = [path for path in paths if path.endswith(EVENT_LOG_SUFFIX)]
+    try:
+        if log_paths:
+            return read_session_log(log_paths[0])
+        with open(paths[0], 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _month(session: Dict[str, Any]) -> str:
+    try:
+        return datetime.fromisoformat(session['timestamp']).strftime('%Y-%m')
+    except (KeyError, TypeError, ValueError):
+        return 'undated'
+
+
+def _archived_blob_keys(archive_path: str) -> set:
+    '''Content hashes already stored in an archive'''
+    keys = set()
+    if os.path.exists(archive_path):
+        for record in _read_records(archive_path):
+            if 'blob' in record:
+                keys.add(record['blob'])
+    return keys
+
+
+def _members(data: bytes) -> Iterator[Tuple[bytes, int]]:
+    '''Yield the content and end offset of each readable gzip member
+
+    A damaged member (truncated, or failing its checksum) is skipped by looking
+    for the next member header after it, so it cannot hide the members behind it.
+    '''
+    view = memoryview(data)
+    start = 0
+    while start < len(data):
+        member = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            content = member.decompress(view[start:])
+        except zlib.error:
+            content = None
+        if content is not None and member.eof:
+            end = len(data) - len(member.unused_data)
+            yield content, end
+            start = end
+            continue
+        start = data.find(GZIP_MAGIC, start + 1)
+        if start == -1:
+            return
+
+
+def _read_records(archive_path: str) -> Iterator[Dict[str, Any]]:
+    with open(archive_path, 'rb') as f:
+        data = f.read()
+    for content, _ in _members(data):
+        for line in content.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _drop_damaged_tail(archive_path: str):
+    '''Cut the archive after its last readable member
+
+    A run interrupted mid-write leaves a truncated member at the end; appending
+    behind it would leave the new member stuck behind damaged bytes.
+    '''
+    with open(archive_path, 'rb') as f:
+        data = f.read()
+    end = 0
+    for _, end in _members(data):
+        pass
+    if end < len(data):
+        os.truncate(archive_path, end)
+
+
+def _deduplicate(session: Dict[str, Any], known: set, new_blobs: Dict[str, str]) -> Tuple[Dict[str, Any], int]:
+    '''Replace story text with content-hash references, collecting texts not yet archived'''
+    repeats = 0
+
+    def ref(text: Optional[str]) -> Any:
+        nonlocal repeats
+        if not isinstance(text, str) or len(text) < MIN_BLOB_CHARS:
+            return text
+        key = _blob_key(text)
+        if key in known or key in new_blobs:
+            repeats += 1
+        else:
+            new_blobs[key] = text
+        return {'$blob': key}
+
+    stored = dict(session)
+    stored['generations'] = [
+        {**generation, 'content': ref(generation.get('content'))}
+        for generation in session.get('generations', [])
+    ]
+    if session.get('user_feedback'):
+        stored['user_feedback'] = {
+            **session['user_feedback'],
+            'final_story': ref(session['user_feedback'].get('final_story'))
+        }
+    return stored, repeats
+
+
+def _restore(session: Dict[str, Any], blobs: Dict[str, str]) -> Dict[str, Any]:
+    '''Resolve content-hash references back into story text'''
+    def text(value: Any) -> Any:
+        if isinstance(value, dict) and '$blob' in value:
+            return blobs.get(value['$blob'])
+        return value
+
+    restored = dict(session)
+    restored['generations'] = [
+        {**generation, 'content': text(generation.get('content'))}
+        for generation in session.get('generations', [])
+    ]
+    if session.get('user_feedback'):
+        restored['user_feedback'] = {
+            **session['user_feedback'],
+            'final_story': text(session['user_feedback'].get('final_story'))
+        }
+    return restored
+
+
+def archive_sessions(
+        log_dir: str,
+        older_than_days: float = 7,
+        retain_days: Optional[float] = None,
+        now: Optional[float] = None
+    ) -> ArchiveReport:
+    '''Move sessions untouched for ``older_than_days`` into monthly archives
+
+    With ``retain_days``, monthly archives not added to for that long are
+    deleted. Sources are only removed after their archive member has been
+    written and synced, so an interrupted run at worst archives a session twice
+    (readers keep the last copy).
+    '''
+    now = time.time() if now is None else now
+    archive_dir = os.path.join(log_dir, ARCHIVE_DIR_NAME)
+    os.makedirs(archive_dir, exist_ok=True)
+    report = ArchiveReport()
+
+    by_month: Dict[str, List[Tuple[Dict[str, Any], List[str]]]] = {}
+    for paths in _session_paths(log_dir).values():
+        if now - max(os.path.getmtime(path) for path in paths) < older_than_days * 86400:
+            continue
+        session = _load_session(paths)
+        if session and session.get('session_id'):
+            by_month.setdefault(_month(session), []).append((session, paths))
+
+    for month, sessions in sorted(by_month.items()):
+        archive_path = os.path.join(archive_dir, f'{month}{ARCHIVE_SUFFIX}')
+        if os.path.exists(archive_path):
+            _drop_damaged_tail(archive_path)
+        size_before = os.path.getsize(archive_path) if os.path.exists(archive_path) else 0
+        known = _archived_blob_keys(archive_path)
+        new_blobs: Dict[str, str] = {}
+        records = []
+        for session, paths in sessions:
+            stored, repeats = _deduplicate(session, known, new_blobs)
+            records.append({'session': stored})
+            report.blobs_deduplicated += repeats
+
+        with open(archive_path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                for key, text in new_blobs.items():
+                    f.write((json.dumps({'blob': key, 'text': text}) + '\n').encode('utf-8'))
+                for record in records:
+                    f.write((json.dumps(record) + '\n').encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        for _, paths in sessions:
+            for path in paths:
+                report.bytes_before += os.path.getsize(path)
+                os.remove(path)
+        report.bytes_after += os.path.getsize(archive_path) - size_before
+        report.sessions_archived += len(sessions)
+
+    if retain_days is not None:
+        report.archives_deleted = _expire_archives(archive_dir, retain_days, now)
+    return report
+
+
+def _expire_archives(archive_dir: str, retain_days: float, now: float) -> int:
+    '''Delete monthly archives that have not been added to within the retention period'''
+    deleted = 0
+    for name in os.listdir(archive_dir):
+        path = os.path.join(archive_dir, name)
+        if name.endswith(ARCHIVE_SUFFIX) and now - os.path.getmtime(path) > retain_days * 86400:
+            os.remove(path)
+            deleted += 1
+    return deleted
+
+
+def iter_archived_sessions(log_dir: str) -> Iterator[Dict[str, Any]]:
+    '''Yield archived sessions, newest month first and newest session first within a month'''
+    archive_dir = os.path.join(log_dir, ARCHIVE_DIR_NAME)
+    if not os.path.isdir(archive_dir):
+        return
+    names = sorted((name for name in os.listdir(archive_dir) if name.endswith(ARCHIVE_SUFFIX)), reverse=True)
+    for name in names:
+        blobs: Dict[str, str] = {}
+        sessions: Dict[str, Dict[str, Any]] = {}
+        for record in _read_records(os.path.join(archive_dir, name)):
+            if 'blob' in record:
+                blobs[record['blob']] = record['text']
+            elif 'session' in record:
+                sessions[record['session']['session_id']] = record['session']
+        for session in sorted(sessions.values(), key=lambda s: s.get('timestamp') or '', reverse=True):
+            yield _restore(session, blobs)
+
+
+def main():
+    '''Command-line entry point for archiving feedback logs'''
+    parser = argparse.ArgumentParser(description='Archive old feedback sessions into compressed monthly files.')
+    parser.add_argument('log_dir', nargs='?', default='feedback_logs', help='feedback log directory')
+    parser.add_argument('--older-than-days', type=float, default=7, help='archive sessions untouched for this long')
+    parser.add_argument('--retain-days', type=float, help='delete monthly archives untouched for this long')
+    args = parser.parse_args()
+
+    print(archive_sessions(args.log_dir, args.older_than_days, args.retain_days).summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+'''Feedback Index - SQLite index over feedback sessions for fast queries.
+
+The JSON/JSONL session files stay the source of truth. The index mirrors the
+fields worth querying (sessions, generations, evaluations, user feedback) and
+is kept current by ``FeedbackLogger`` as it records each event, so looking up
+recent feedback or score distributions no longer means parsing every session
+file. ``import_log_dir`` builds or refreshes the index from existing logs.
+
+Usage:
+    python -m bedtime_story_generator.utils.feedback_index feedback_logs feedback_index.db
+'''
+
+import argparse
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from bedtime_story_generator.utils.session_log import load_sessions
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    timestamp TEXT,
+    user_request TEXT,
+    story_type TEXT,
+    story_category TEXT,
+    story_arc TEXT
+);
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(session_id),
+    timestamp TEXT,
+    type TEXT,
+    chapter_number INTEGER,
+    revision_count INTEGER,
+    content_chars INTEGER,
+    user_feedback_input TEXT
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    generation_id INTEGER PRIMARY KEY REFERENCES generations(id),
+    overall_score REAL,
+    age_appropriate INTEGER,
+    needs_revision INTEGER,
+    open_endedness_score REAL
+);
+CREATE TABLE IF NOT EXISTS user_feedback (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(session_id),
+    timestamp TEXT,
+    feedback TEXT
+);
+CREATE INDEX IF NOT EXISTS generations_session ON generations(session_id);
+CREATE INDEX IF NOT EXISTS user_feedback_timestamp ON user_feedback(timestamp);
+'''
+
+
+class FeedbackIndex:
+    '''SQLite tables for sessions, generations, evaluations and user feedback'''
+
+    def __init__(self, db_path: str = 'feedback_index.db'):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def apply_event(self, session_id: str, event: Dict[str, Any]):
+        '''Index one session log event'''
+        with self._lock:
+            self._apply(session_id, event)
+            self._db.commit()
+
+    def index_session(self, session: Dict[str, Any]):
+        '''Index a whole session, replacing anything indexed for it before'''
+        session_id = session['session_id']
+        with self._lock:
+            self._delete(session_id)
+            self._apply(session_id, {'event': 'start', 'session': session})
+            if session.get('narrative_plan'):
+                self._apply(session_id, {'event': 'narrative_plan', 'narrative_plan': session['narrative_plan']})
+            for generation in session.get('generations', []):
+                self._apply(session_id, {'event': 'generation', 'generation': generation})
+            if session.get('user_feedback'):
+                self._apply(session_id, {'event': 'user_feedback', 'user_feedback': session['user_feedback']})
+            self._db.commit()
+
+    def _apply(self, session_id: str, event: Dict[str, Any]):
+        kind = event['event']
+        if kind == 'start':
+            session = event['session']
+            self._db.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, timestamp, user_request, story_type) VALUES (?, ?, ?, ?)',
+                (session_id, session.get('timestamp'), session.get('user_request'), session.get('story_type'))
+            )
+        elif kind == 'narrative_plan':
+            plan = event['narrative_plan']
+            self._db.execute(
+                'UPDATE sessions SET story_category = ?, story_arc = ? WHERE session_id = ?',
+                (plan.get('story_category'), plan.get('story_arc'), session_id)
+            )
+        elif kind == 'generation':
+            generation = event['generation']
+            cursor = self._db.execute(
+                'INSERT INTO generations (session_id, timestamp, type, chapter_number, revision_count, '
+                'content_chars, user_feedback_input) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (
+                    session_id,
+                    generation.get('timestamp'),
+                    generation.get('type'),
+                    generation.get('chapter_number'),
+                    generation.get('revision_count'),
+                    len(generation.get('content') or ''),
+                    generation.get('user_feedback_input')
+                )
+            )
+            evaluation = generation.get('evaluation')
+            if evaluation:
+                self._db.execute(
+                    'INSERT INTO evaluations (generation_id, overall_score, age_appropriate, needs_revision, '
+                    'open_endedness_score) VALUES (?, ?, ?, ?, ?)',
+                    (
+                        cursor.lastrowid,
+                        evaluation.get('overall_score'),
+                        evaluation.get('age_appropriate'),
+                        evaluation.get('needs_revision'),
+                        evaluation.get('open_endedness_score')
+                    )
+                )
+        elif kind == 'user_feedback':
+            feedback = event['user_feedback']
+            self._db.execute(
+                'INSERT OR REPLACE INTO user_feedback (session_id, timestamp, feedback) VALUES (?, ?, ?)',
+                (session_id, feedback.get('timestamp'), feedback.get('feedback'))
+            )
+
+    def _delete(self, session_id: str):
+        self._db.execute(
+            'DELETE FROM evaluations WHERE generation_id IN (SELECT id FROM generations WHERE session_id = ?)',
+            (session_id,)
+        )
+        self._db.execute('DELETE FROM generations WHERE session_id = ?', (session_id,))
+        self._db.execute('DELETE FROM user_feedback WHERE session_id = ?', (session_id,))
+        self._db.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def session_count(self) -> int:
+        '''Number of sessions indexed'''
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def recent_feedback(self, limit: int = 10) -> List[Dict[str, Any]]:
+        '''Most recent user feedback, newest first'''
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT f.session_id, s.user_request, f.feedback, f.timestamp FROM user_feedback f '
+                'JOIN sessions s ON s.session_id = f.session_id ORDER BY f.timestamp DESC LIMIT ?',
+                (limit,)
+            ).fetchall()
+        return [
+            {'session_id': session_id, 'user_request': user_request, 'feedback': feedback, 'timestamp': timestamp}
+            for session_id, user_request, feedback, timestamp in rows
+        ]
+
+    def score_distribution(self) -> Dict[str, Dict[str, Any]]:
+        '''Judge scores per story category: count, mean, min, max and a histogram of whole scores'''
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT COALESCE(s.story_category, \'unknown\'), CAST(e.overall_score AS INTEGER), '
+                'COUNT(*), SUM(e.overall_score), MIN(e.overall_score), MAX(e.overall_score) '
+                'FROM evaluations e JOIN generations g ON g.id = e.generation_id '
+                'JOIN sessions s ON s.session_id = g.session_id GROUP BY 1, 2'
+            ).fetchall()
+
+        distribution: Dict[str, Dict[str, Any]] = {}
+        for category, bucket, count, total, low, high in rows:
+            entry = distribution.setdefault(
+                category, {'count': 0, 'mean': 0.0, 'min': low, 'max': high, 'histogram': {}, '_total': 0.0}
+            )
+            entry['count'] += count
+            entry['_total'] += total
+            entry['min'] = min(entry['min'], low)
+            entry['max'] = max(entry['max'], high)
+            entry['histogram'][bucket] = count
+        for entry in distribution.values():
+            entry['mean'] = round(entry.pop('_total') / entry['count'], 2)
+        return distribution
+
+    def revisions_per_session(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        '''Judge-driven and user-requested revisions for each session, newest first'''
+        query = (
+            'SELECT s.session_id, s.story_type, COUNT(g.id), '
+            'SUM(CASE WHEN g.type = \'revision\' THEN 1 ELSE 0 END), '
+            'SUM(CASE WHEN g.type = \'user_revision\' THEN 1 ELSE 0 END) '
+            'FROM sessions s LEFT JOIN generations g ON g.session_id = s.session_id '
+            'GROUP BY s.session_id ORDER BY s.timestamp DESC'
+        )
+        params: tuple = ()
+        if limit is not None:
+            query += ' LIMIT ?'
+            params = (limit,)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [
+            {
+                'session_id': session_id,
+                'story_type': story_type,
+                'generations': generations,
+                'revisions': revisions or 0,
+                'user_revisions': user_revisions or 0
+            }
+            for session_id, story_type, generations, revisions, user_revisions in rows
+        ]
+
+    def close(self):
+        '''Close the database'''
+        with self._lock:
+            self._db.close()
+
+
+def import_log_dir(log_dir: str, index: FeedbackIndex) -> int:
+    '''Index every session in a feedback log directory and return how many were indexed
+
+    Safe to re-run: each session replaces its previous rows.
+    '''
+    count = 0
+    for session in load_sessions(log_dir):
+        if session.get('session_id'):
+            index.index_session(session)
+            count += 1
+    return count
+
+
+def main():
+    '''Command-line entry point for importing existing feedback logs'''
+    parser = argparse.ArgumentParser(description='Build a SQLite index of existing feedback logs.')
+    parser.add_argument('log_dir', nargs='?', default='feedback_logs', help='feedback log directory')
+    parser.add_argument('db_path', nargs='?', default='feedback_index.db', help='SQLite index file')
+    args = parser.parse_args()
+
+    index = FeedbackIndex(args.db_path)
+    try:
+        print(f'Indexed {import_log_dir(args.log_dir, index)} sessions into {args.db_path}')
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
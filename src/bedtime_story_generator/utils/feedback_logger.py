@@ -1,43 +1,75 @@
-'''Feedback Logger - Stores all generation cycles and user feedback in JSON.'''
+'''Feedback Logger - Stores all generation cycles and user feedback in JSON.
+
+Sessions are recorded as append-only event logs (see ``session_log``); the
+session JSON document is written by compaction when a session ends or on demand.
+With ``background=True`` the file writes happen on a ``BackgroundWriter`` thread
+and logging calls only serialize and enqueue.
+'''
 
-import json
 import os
+import threading
+import uuid
 from datetime import datetime
+from itertools import chain, islice
 from typing import Optional, List, Dict, Any
 from dataclasses import asdict
 
-class FeedbackLogger:
-    '''Logs all story generation cycles and user feedback to JSON'''
-
-    def __init__(self, log_dir: str = 'feedback_logs'):
-        self.log_dir = log_dir
-        self.current_session = None
-        self.session_file = None
+from bedtime_story_generator.utils.archive import iter_archived_sessions
+from bedtime_story_generator.utils.feedback_index import FeedbackIndex, import_log_dir
+from bedtime_story_generator.utils.log_writer import BackgroundWriter
+from bedtime_story_generator.utils.session_log import (
+    EVENT_LOG_SUFFIX,
+    FSYNC_POLICIES,
+    append_lines,
+    apply_event,
+    encode_event,
+    encode_session,
+    load_sessions,
+    read_session_log,
+    replace_file,
+)
 
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+class FeedbackSession:
+    '''Handle for one story session; safe to use alongside other sessions on the same logger'''
 
-    def start_session(self, user_request: str, story_type: str):
-        '''Start a new story generation session'''
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        session_id = f'{story_type}_{timestamp}'
+    def __init__(self, logger: 'FeedbackLogger', user_request: str, story_type: str):
+        timestamp = datetime.now()
+        # the random suffix keeps sessions started in the same second apart
+        self._attach(logger, f"{story_type}_{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}")
+        self._record({
+            'event': 'start',
+            'session': {
+                'session_id': self.session_id,
+                'timestamp': timestamp.isoformat(),
+                'user_request': user_request,
+                'story_type': story_type,
+                'generations': [],
+                'user_feedback': None
+            }
+        })
 
-        self.current_session = {
-            'session_id': session_id,
-            'timestamp': datetime.now().isoformat(),
-            'user_request': user_request,
-            'story_type': story_type,
-            'generations': [],
-            'user_feedback': None
-        }
+    @classmethod
+    def resume(cls, logger: 'FeedbackLogger', data: Dict[str, Any]) -> 'FeedbackSession':
+        '''Handle for a session logged earlier, appending to its existing event log'''
+        session = cls.__new__(cls)
+        session._attach(logger, data['session_id'])
+        session.data = data
+        return session
 
-        self.session_file = os.path.join(self.log_dir, f"{session_id}.json")
-        return session_id
+    def _attach(self, logger: 'FeedbackLogger', session_id: str):
+        self.session_id = session_id
+        self.session_file = os.path.join(logger.log_dir, f"{session_id}.json")
+        self.event_log_file = os.path.join(logger.log_dir, f"{session_id}{EVENT_LOG_SUFFIX}")
+        self.data: Optional[Dict[str, Any]] = None
+        self._logger = logger
+        self._lock = threading.Lock()
 
-    def log_narrative_plan(self, narrative_plan: Any):
+    def log_narrative_plan(self, narrative_plan: Any, calls: Optional[List[Dict[str, Any]]] = None):
         '''Log the narrative plan'''
-        if self.current_session:
-            self.current_session['narrative_plan'] = asdict(narrative_plan)
+        event = {'event': 'narrative_plan', 'narrative_plan': asdict(narrative_plan)}
+        if calls:
+            event['calls'] = calls
+        self._record(event)
 
     def log_generation(
             self,
@@ -46,12 +78,14 @@ class FeedbackLogger:
             evaluation: Optional[Any] = None,
             revision_count: int = 0,
             chapter_num: Optional[int] = None,
-            user_feedback_input: Optional[str] = None
+            user_feedback_input: Optional[str] = None,
+            calls: Optional[List[Dict[str, Any]]] = None
         ):
-        '''Log a generation cycle (story, chapter, or revision)'''
-        if not self.current_session:
-            return
+        '''Log a generation cycle (story, chapter, or revision)
 
+        ``calls`` holds per-call metrics (agent, model, tokens, latency, cache hit,
+        retries) for the agent calls that produced this generation.
+        '''
         generation_entry = {
             'timestamp': datetime.now().isoformat(),
             'type': generation_type,  # initial, revision, chapter, user_revision
@@ -64,54 +98,231 @@ class FeedbackLogger:
         if evaluation:
             generation_entry['evaluation'] = asdict(evaluation)
 
-        self.current_session['generations'].append(generation_entry)
-        self._save_session()
+        if calls:
+            generation_entry['calls'] = calls
+
+        self._record({'event': 'generation', 'generation': generation_entry})
+
+    def log_session_metrics(self, name: str, metrics: Dict[str, Any]):
+        '''Log a named group of session-level metrics, replacing any previous values'''
+        self._record({'event': 'metrics', 'name': name, 'metrics': metrics})
+
+    def increment_session_metric(self, name: str, key: str, amount: int = 1):
+        '''Add to a counter in a named group of session-level metrics'''
+        self._record({'event': 'increment', 'name': name, 'key': key, 'amount': amount})
 
     def log_user_exit_feedback(self, feedback: str, story_content: str):
-        '''Log user feedback when exiting'''
-        if not self.current_session:
-            return
+        '''Log user feedback when exiting, which ends the session'''
+        self._record({
+            'event': 'user_feedback',
+            'user_feedback': {
+                'timestamp': datetime.now().isoformat(),
+                'feedback': feedback,
+                'final_story': story_content
+            }
+        })
+        self.end()
 
-        self.current_session['user_feedback'] = {
-            'timestamp': datetime.now().isoformat(),
-            'feedback': feedback,
-            'final_story': story_content
-        }
+    def _record(self, event: Dict[str, Any]):
+        '''Apply an event to the in-memory session and append it to the event log'''
+        with self._lock:
+            self.data = apply_event(self.data, event)
+            self._logger._write_event(self, event)
+
+    def compact(self) -> str:
+        '''Write the session's JSON document and return its path
+
+        In background mode the document is written by the writer thread; call
+        ``flush`` on the logger before reading it.
+        '''
+        with self._lock:
+            self._logger._write_document(self.session_file, encode_session(self.data))
+        return self.session_file
+
+    def end(self) -> str:
+        '''Compact the session and stop tracking it as open'''
+        self._logger._forget(self)
+        return self.compact()
+
+
+class FeedbackLogger:
+    '''Logs all story generation cycles and user feedback to JSON
+
+    ``start_session`` returns a ``FeedbackSession`` handle, and any number of
+    sessions can be logged concurrently through one logger. The logging methods on
+    the logger itself write to the most recently started session, which is all a
+    single-story caller such as the CLI needs.
+    '''
 
-        self._save_session()
+    def __init__(
+            self,
+            log_dir: str = 'feedback_logs',
+            fsync: str = 'never',
+            background: bool = False,
+            max_queue_size: int = 1024,
+            backpressure: str = 'block',
+            index: Optional[FeedbackIndex] = None
+        ):
+        '''Create a logger writing to ``log_dir``
 
-    def _save_session(self):
-        '''Save current session to file'''
-        if self.current_session and self.session_file:
-            with open(self.session_file, 'w') as f:
-                json.dump(self.current_session, f, indent=2)
+        ``fsync`` is ``'always'`` to fsync every event, or ``'never'`` to leave it to
+        the OS. ``background`` moves file writes to a writer thread with a queue of
+        ``max_queue_size`` writes; when it is full, ``backpressure='block'`` waits for
+        room and ``'drop'`` discards the write (counted in ``writer.stats``).
+        ``index`` is kept up to date with every event and serves historical queries;
+        an empty index is first filled from the sessions already in ``log_dir``.
+        '''
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'fsync must be one of {FSYNC_POLICIES}')
+        self.log_dir = log_dir
+        self.fsync = fsync
+        self.writer = BackgroundWriter(max_queue_size, backpressure) if background else None
+        self.index = index
+        self._latest: Optional[FeedbackSession] = None
+        self._open_sessions: Dict[str, FeedbackSession] = {}
+        self._lock = threading.Lock()
+
+        if not os.path.exists(self.log_dir):
+            os.makedirs(self.log_dir)
+        if index and index.session_count() == 0:
+            # sessions logged before the index existed would otherwise vanish from history
+            import_log_dir(self.log_dir, index)
+
+    def start_session(self, user_request: str, story_type: str) -> FeedbackSession:
+        '''Start a new story generation session and return its handle
+
+        Sessions already open stay open, since several can be logged at once; each
+        is compacted when it ends, or by ``close``.
+        '''
+        session = FeedbackSession(self, user_request, story_type)
+        with self._lock:
+            self._open_sessions[session.session_id] = session
+            self._latest = session
+        return session
+
+    def resume_session(self, session_id: str) -> Optional[FeedbackSession]:
+        '''Reopen an ended session to log more of the same story, e.g. a long story's next chapter
+
+        Returns None if its event log is gone (archived, say), so the caller can start afresh.
+        '''
+        # the log must hold everything the session wrote before it is replayed
+        self.flush()
+        path = os.path.join(self.log_dir, f'{session_id}{EVENT_LOG_SUFFIX}')
+        data = read_session_log(path) if os.path.exists(path) else None
+        if data is None:
+            return None
+        session = FeedbackSession.resume(self, data)
+        with self._lock:
+            self._open_sessions[session.session_id] = session
+            self._latest = session
+        return session
+
+    @property
+    def current_session(self) -> Optional[Dict[str, Any]]:
+        '''Data of the most recently started session'''
+        return self._latest.data if self._latest else None
+
+    @property
+    def session_file(self) -> Optional[str]:
+        return self._latest.session_file if self._latest else None
+
+    @property
+    def event_log_file(self) -> Optional[str]:
+        return self._latest.event_log_file if self._latest else None
+
+    @property
+    def open_sessions(self) -> List[FeedbackSession]:
+        '''Sessions started but not yet ended'''
+        with self._lock:
+            return list(self._open_sessions.values())
+
+    def log_narrative_plan(self, narrative_plan: Any, calls: Optional[List[Dict[str, Any]]] = None):
+        '''Log the narrative plan to the latest session'''
+        if self._latest:
+            self._latest.log_narrative_plan(narrative_plan, calls)
+
+    def log_generation(self, *args: Any, **kwargs: Any):
+        '''Log a generation cycle to the latest session (see ``FeedbackSession.log_generation``)'''
+        if self._latest:
+            self._latest.log_generation(*args, **kwargs)
+
+    def log_session_metrics(self, name: str, metrics: Dict[str, Any]):
+        '''Log a named group of metrics to the latest session'''
+        if self._latest:
+            self._latest.log_session_metrics(name, metrics)
+
+    def increment_session_metric(self, name: str, key: str, amount: int = 1):
+        '''Add to a counter in the latest session'''
+        if self._latest:
+            self._latest.increment_session_metric(name, key, amount)
+
+    def log_user_exit_feedback(self, feedback: str, story_content: str):
+        '''Log user feedback for the latest session when exiting'''
+        if self._latest:
+            self._latest.log_user_exit_feedback(feedback, story_content)
+
+    def compact_session(self) -> Optional[str]:
+        '''Write the latest session's JSON document and return its path'''
+        if not self._latest:
+            return None
+        return self._latest.compact()
+
+    def _write_event(self, session: FeedbackSession, event: Dict[str, Any]):
+        '''Append an event to a session's log and index, on the writer thread if there is one'''
+        line = encode_event(event)
+        writer = self.writer
+        if writer:
+            writer.append(session.event_log_file, line, fsync=self.fsync == 'always')
+            if self.index:
+                writer.call(self.index.apply_event, session.session_id, event)
+        else:
+            append_lines(session.event_log_file, line, fsync=self.fsync == 'always')
+            if self.index:
+                self.index.apply_event(session.session_id, event)
+
+    def _write_document(self, path: str, text: str):
+        writer = self.writer
+        if writer:
+            writer.replace(path, text)
+        else:
+            replace_file(path, text)
+
+    def _forget(self, session: FeedbackSession):
+        with self._lock:
+            self._open_sessions.pop(session.session_id, None)
+
+    def flush(self):
+        '''Wait until every logged event has been written (no-op unless in background mode)'''
+        if self.writer:
+            self.writer.flush()
+
+    def close(self):
+        '''End every open session and stop the background writer, if any'''
+        for session in self.open_sessions:
+            session.end()
+        if self.writer:
+            self.writer.close()
+            # later writes, if any, happen synchronously
+            self.writer = None
 
     def get_historical_feedback(self, limit: int = 10) -> List[Dict[str, Any]]:
         '''Get recent user feedback from previous sessions'''
+        self.flush()
+        if self.index:
+            return self.index.recent_feedback(limit)
         feedback_entries = []
 
-        if not os.path.exists(self.log_dir):
-            return feedback_entries
-
-        files = [
-            os.path.join(self.log_dir, f)
-            for f in os.listdir(self.log_dir)
-            if f.endswith('.json')
-        ]
-        # sorted by modification time (newest first)
-        files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-
-        for file_path in files[:limit]:
-            try:
-                with open(file_path, 'r') as f:
-                    session = json.load(f)
-                    if session.get('user_feedback'):
-                        feedback_entries.append({
-                            'session_id': session.get('session_id'),
-                            'user_request': session.get('user_request'),
-                            'feedback': session['user_feedback']['feedback'],
-                            'timestamp': session['user_feedback']['timestamp']
-                        })
-            except (json.JSONDecodeError, KeyError):
+        # newest sessions first, read from their event logs where they have one,
+        # then from the compressed archives once the live logs run out
+        sessions = chain(load_sessions(self.log_dir), iter_archived_sessions(self.log_dir))
+        for session in islice(sessions, limit):
+            user_feedback = session.get('user_feedback')
+            if not user_feedback:
                 continue
-        return feedback_entries
\ No newline at end of file
+            feedback_entries.append({
+                'session_id': session.get('session_id'),
+                'user_request': session.get('user_request'),
+                'feedback': user_feedback.get('feedback'),
+                'timestamp': user_feedback.get('timestamp')
+            })
+        return feedback_entries
@@ -0,0 +1,99 @@
+'''Instrumentation - Token and latency metrics for agent calls.'''
+
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+# pipeline stage for each agent, used to group metrics
+AGENT_STAGES = {
+    'NarrativeDirector': 'plan',
+    'Storyteller': 'generate',
+    'Judge': 'judge',
+    'RevisionAgent': 'revise',
+    'TargetedRevisionAgent': 'revise',
+    'MemoryKeeper': 'memory',
+}
+
+
+@dataclass
+class CallMetrics:
+    '''Metrics for a single agent call'''
+    agent: str
+    model: str
+    stage: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_seconds: float = 0.0
+    cache_hit: bool = False
+    retry_count: int = 0
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        'calls': 0,
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'latency_seconds': 0.0,
+        'cache_hits': 0,
+        'retries': 0
+    }
+
+
+def add_call_to_summary(summary: Dict[str, Any], call: Dict[str, Any]):
+    '''Fold one call (as a dict) into a summary with overall and per-stage totals'''
+    for totals in (
+            summary.setdefault('total', _empty_totals()),
+            summary.setdefault('by_stage', {}).setdefault(call['stage'], _empty_totals())
+        ):
+        totals['calls'] += 1
+        totals['input_tokens'] += call['input_tokens']
+        totals['output_tokens'] += call['output_tokens']
+        totals['latency_seconds'] = round(totals['latency_seconds'] + call['latency_seconds'], 3)
+        totals['cache_hits'] += int(call['cache_hit'])
+        totals['retries'] += call['retry_count']
+
+
+def summarize_calls(calls: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    '''Aggregate calls into overall and per-stage totals'''
+    summary: Dict[str, Any] = {'total': _empty_totals(), 'by_stage': {}}
+    for call in calls:
+        add_call_to_summary(summary, call)
+    return summary
+
+
+class UsageTracker:
+    '''Thread-safe record of every agent call made by an orchestrator'''
+
+    def __init__(self, max_calls: int = 10_000):
+        self.max_calls = max_calls
+        self.calls: List[CallMetrics] = []
+        self._summary = summarize_calls([])
+        self._lock = threading.Lock()
+
+    def record(self, metrics: CallMetrics):
+        '''Record a call; the summary keeps counting after old calls are dropped'''
+        with self._lock:
+            self.calls.append(metrics)
+            if len(self.calls) > self.max_calls:
+                del self.calls[:len(self.calls) - self.max_calls]
+            add_call_to_summary(self._summary, metrics.to_dict())
+
+    def summary(self) -> Dict[str, Any]:
+        '''Overall and per-stage totals for every call recorded'''
+        with self._lock:
+            return {
+                'total': dict(self._summary['total']),
+                'by_stage': {stage: dict(totals) for stage, totals in self._summary['by_stage'].items()}
+            }
+
+    def slowest_stage(self) -> str:
+        '''Stage with the most cumulative wall-clock time'''
+        by_stage = self.summary()['by_stage']
+        if not by_stage:
+            return ''
+        return max(by_stage, key=lambda stage: by_stage[stage]['latency_seconds'])
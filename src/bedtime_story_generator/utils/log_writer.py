@@ -0,0 +1,129 @@
+'''Log Writer - Background thread for feedback log file I/O.
+
+Callers serialize their events and hand the text to a bounded queue; a daemon
+thread drains it, coalescing queued appends to the same file into one write, so
+disk latency never lands on the request path. Pending writes are flushed when
+the writer is closed and at interpreter exit.
+'''
+
+import atexit
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+from bedtime_story_generator.utils.session_log import append_lines, replace_file
+
+# what to do when the queue is full: wait for room, or drop the write and count it
+BACKPRESSURE_POLICIES = ('block', 'drop')
+
+# (operation, target, payload, fsync): 'append' and 'replace' take a path and text,
+# 'call' takes a callable and its arguments
+WriteItem = Tuple[str, Any, Any, bool]
+
+
+class BackgroundWriter:
+    '''Writes log files on a daemon thread, batching queued appends'''
+
+    def __init__(self, max_queue_size: int = 1024, backpressure: str = 'block', max_batch: int = 256):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f'backpressure must be one of {BACKPRESSURE_POLICIES}')
+        self.backpressure = backpressure
+        self.max_batch = max_batch
+        self.stats = {'writes': 0, 'batches': 0, 'dropped': 0, 'errors': 0}
+        self.last_error: Optional[BaseException] = None
+
+        self._queue: 'queue.Queue[Optional[WriteItem]]' = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='feedback-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, path: str, text: str, fsync: bool = False):
+        '''Queue text to append to a file'''
+        self._put(('append', path, text, fsync))
+
+    def replace(self, path: str, text: str):
+        '''Queue an atomic replacement of a file's contents'''
+        self._put(('replace', path, text, True))
+
+    def call(self, fn: Callable[..., Any], *args: Any):
+        '''Queue any other write (such as an index update) to run on the writer thread'''
+        self._put(('call', fn, args, False))
+
+    def flush(self):
+        '''Block until every queued write has reached the file'''
+        self._queue.join()
+
+    def close(self):
+        '''Flush pending writes and stop the writer thread'''
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _put(self, item: WriteItem):
+        if self._closed:
+            raise RuntimeError('BackgroundWriter is closed')
+        if self.backpressure == 'block':
+            self._queue.put(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write([item for item in batch if item is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, items: List[WriteItem]):
+        '''Perform a batch of writes in order, merging consecutive appends per file'''
+        pending: 'dict[str, Tuple[List[str], bool]]' = {}
+
+        def flush_appends():
+            for path, (texts, fsync) in pending.items():
+                self._attempt(append_lines, path, ''.join(texts), fsync)
+            pending.clear()
+
+        for operation, target, payload, fsync in items:
+            if operation == 'append':
+                texts, needs_fsync = pending.get(target, ([], False))
+                texts.append(payload)
+                pending[target] = (texts, needs_fsync or fsync)
+            elif operation == 'replace':
+                flush_appends()
+                self._attempt(replace_file, target, payload)
+            else:
+                flush_appends()
+                self._attempt(target, *payload)
+        flush_appends()
+
+        with self._lock:
+            self.stats['writes'] += len(items)
+            self.stats['batches'] += 1
+
+    def _attempt(self, write, *args):
+        '''Run a write, recording failures instead of killing the thread'''
+        try:
+            write(*args)
+        except (OSError, sqlite3.Error) as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                self.last_error = e
@@ -0,0 +1,179 @@
+'''Session Log - Append-only JSONL event log for feedback sessions.
+
+Each session is written as ``{session_id}.jsonl``: one JSON event per line
+(session start, narrative plan, generation, metrics, user feedback), appended as
+it happens. Logging a chapter costs one small write instead of re-serializing
+the whole session, and a crash can at worst lose the line being written. The
+familiar ``{session_id}.json`` document is produced on demand by compaction,
+which replays the events.
+'''
+
+import json
+import os
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from bedtime_story_generator.utils.instrumentation import add_call_to_summary
+
+EVENT_LOG_SUFFIX = '.jsonl'
+FSYNC_POLICIES = ('always', 'never')
+
+
+def apply_event(session: Optional[Dict[str, Any]], event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    '''Apply one event to a session dict and return the (possibly new) session'''
+    kind = event['event']
+    if kind == 'start':
+        return dict(event['session'])
+    if session is None:
+        # events before a start line belong to no session
+        return None
+
+    if kind == 'narrative_plan':
+        session['narrative_plan'] = event['narrative_plan']
+        _add_usage(session, event.get('calls'))
+    elif kind == 'generation':
+        session['generations'].append(event['generation'])
+        _add_usage(session, event['generation'].get('calls'))
+    elif kind == 'metrics':
+        session.setdefault('metrics', {})[event['name']] = event['metrics']
+    elif kind == 'increment':
+        group = session.setdefault('metrics', {}).setdefault(event['name'], {})
+        group[event['key']] = group.get(event['key'], 0) + event['amount']
+    elif kind == 'user_feedback':
+        session['user_feedback'] = event['user_feedback']
+    return session
+
+
+def _add_usage(session: Dict[str, Any], calls: Optional[List[Dict[str, Any]]]):
+    '''Fold call metrics into the session's per-stage usage summary'''
+    if not calls:
+        return
+    usage = session.setdefault('metrics', {}).setdefault('usage', {})
+    for call in calls:
+        add_call_to_summary(usage, call)
+
+
+def iter_events(log_path: str) -> Iterator[Dict[str, Any]]:
+    '''Yield the events in a session log, skipping a torn final line'''
+    with open(log_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # only the last line can be partially written
+                continue
+
+
+def read_session_log(log_path: str) -> Optional[Dict[str, Any]]:
+    '''Reconstruct a session dict by replaying its event log'''
+    session = None
+    for event in iter_events(log_path):
+        session = apply_event(session, event)
+    return session
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    '''Serialize an event as a log line'''
+    return json.dumps(event) + '\n'
+
+
+def append_lines(log_path: str, text: str, fsync: bool = False):
+    '''Append already-encoded lines to a log'''
+    with open(log_path, 'a') as f:
+        f.write(text)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+
+
+def encode_session(session: Dict[str, Any]) -> str:
+    '''Serialize a session document'''
+    return json.dumps(session, indent=2)
+
+
+def replace_file(path: str, text: str):
+    '''Atomically replace a file's contents'''
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_session_json(session: Dict[str, Any], json_path: str):
+    '''Atomically write a session document, replacing any previous version'''
+    replace_file(json_path, encode_session(session))
+
+
+def compact_session_log(log_path: str, json_path: Optional[str] = None) -> Optional[str]:
+    '''Write the session JSON for an event log and return its path'''
+    session = read_session_log(log_path)
+    if session is None:
+        return None
+    json_path = json_path or log_path[:-len(EVENT_LOG_SUFFIX)] + '.json'
+    write_session_json(session, json_path)
+    return json_path
+
+
+def compact_log_dir(log_dir: str) -> List[str]:
+    '''Compact every event log whose session JSON is missing or older than the log'''
+    written = []
+    for name in os.listdir(log_dir):
+        if not name.endswith(EVENT_LOG_SUFFIX):
+            continue
+        log_path = os.path.join(log_dir, name)
+        json_path = log_path[:-len(EVENT_LOG_SUFFIX)] + '.json'
+        if os.path.exists(json_path) and os.path.getmtime(json_path) >= os.path.getmtime(log_path):
+            continue
+        if compact_session_log(log_path, json_path):
+            written.append(json_path)
+    return written
+
+
+def load_sessions(log_dir: str) -> Iterator[Dict[str, Any]]:
+    '''Yield every session in a log directory, newest first
+
+    Sessions are read from their event logs where one exists, so they are current
+    even if never compacted; sessions with only a JSON document (older logs) are
+    read from that.
+    '''
+    if not os.path.exists(log_dir):
+        return
+    paths = [
+        os.path.join(log_dir, name)
+        for name in os.listdir(log_dir)
+        if name.endswith('.json') or name.endswith(EVENT_LOG_SUFFIX)
+    ]
+    paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+
+    logged = {path[:-len(EVENT_LOG_SUFFIX)] for path in paths if path.endswith(EVENT_LOG_SUFFIX)}
+    for path in paths:
+        if path.endswith('.json') and path[:-len('.json')] in logged:
+            continue
+        try:
+            if path.endswith(EVENT_LOG_SUFFIX):
+                session = read_session_log(path)
+            else:
+                with open(path, 'r') as f:
+                    session = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if session:
+            yield session
+
+
+def load_recent_sessions(log_dir: str, max_sessions: int = 1000) -> List[Dict[str, Any]]:
+    '''The most recent sessions in a log directory, newest first, read in one pass
+
+    Load these once and hand them to every component that learns from the logs,
+    rather than having each scan the directory itself.
+    '''
+    try:
+        return list(islice(load_sessions(log_dir), max_sessions))
+    except FileNotFoundError:
+        # a log removed (e.g. archived) while the directory was being listed
+        return []
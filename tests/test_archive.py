@@ -0,0 +1,162 @@
+"""Test compressed archival and retention of feedback logs without making API calls"""
+
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation
+from bedtime_story_generator.utils.archive import ARCHIVE_DIR_NAME, archive_sessions, iter_archived_sessions
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import read_session_log
+
+TEST_DIR = "test_archive_logs"
+DAY = 86400
+
+
+def evaluation(score):
+    return JudgeEvaluation(
+        overall_score=score,
+        age_appropriate=True,
+        feedback="ok",
+        strengths=[],
+        improvements_needed=[],
+        needs_revision=False
+    )
+
+
+def log_story(logger, i):
+    """One short story whose text repeats across initial, final and exit feedback"""
+    story = f"Story {i}: " + "Once upon a time a sleepy bunny counted the stars. " * 40
+    session = logger.start_session(f"bunny story {i}", "short")
+    session.log_generation("initial", story, evaluation(8.5))
+    session.log_generation("final", story, evaluation(8.5))
+    session.log_user_exit_feedback(f"Loved story {i}", story)
+    return session
+
+
+def age(session, days):
+    """Backdate a session's files"""
+    then = time.time() - days * DAY
+    for path in (session.session_file, session.event_log_file):
+        if os.path.exists(path):
+            os.utime(path, (then, then))
+
+
+def test_archive_round_trip():
+    """Old sessions should be compressed, deduplicated and still readable"""
+    print("[Testing archive round trip]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        sessions = [log_story(logger, i) for i in range(6)]
+        expected = {session.session_id: read_session_log(session.event_log_file) for session in sessions}
+        for session in sessions[:4]:
+            age(session, 30)
+
+        report = archive_sessions(TEST_DIR, older_than_days=7)
+        assert report.sessions_archived == 4
+        assert report.blobs_deduplicated == 8
+        assert report.bytes_saved > 0 and report.bytes_after * 4 < report.bytes_before
+
+        remaining = {name.split(".")[0] for name in os.listdir(TEST_DIR) if name != ARCHIVE_DIR_NAME}
+        assert remaining == {sessions[4].session_id, sessions[5].session_id}
+
+        archived = list(iter_archived_sessions(TEST_DIR))
+        assert {session["session_id"] for session in archived} == {session.session_id for session in sessions[:4]}
+        for session in archived:
+            assert session == expected[session["session_id"]]
+        print(f"  [OK] {report.summary()}")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_history_reads_archives():
+    """Historical feedback should carry on into archived sessions"""
+    print("[Testing historical feedback across archives]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        sessions = [log_story(logger, i) for i in range(4)]
+        for session in sessions[:2]:
+            age(session, 30)
+        archive_sessions(TEST_DIR)
+        feedback = [entry["feedback"] for entry in logger.get_historical_feedback(limit=10)]
+        assert feedback[:2] == ["Loved story 3", "Loved story 2"]
+        assert sorted(feedback[2:]) == ["Loved story 0", "Loved story 1"]
+        print("  [OK] 2 live + 2 archived sessions")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_appends_and_retention():
+    """Re-runs should append to the month's archive, and retention should expire it"""
+    print("[Testing archive appends and retention]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        first = log_story(logger, 0)
+        age(first, 30)
+        archive_sessions(TEST_DIR)
+        second = log_story(logger, 1)
+        age(second, 30)
+        report = archive_sessions(TEST_DIR)
+        assert report.sessions_archived == 1
+        archives = os.listdir(os.path.join(TEST_DIR, ARCHIVE_DIR_NAME))
+        assert len(archives) == 1
+        assert len(list(iter_archived_sessions(TEST_DIR))) == 2
+
+        report = archive_sessions(TEST_DIR, retain_days=365, now=time.time() + 400 * DAY)
+        assert report.archives_deleted == 1
+        assert list(iter_archived_sessions(TEST_DIR)) == []
+        print("  [OK] Appended to one archive, then expired it")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_damaged_member():
+    """A member cut off by an interrupted run should not hide sessions archived before or after it"""
+    print("[Testing damaged archive members]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        first = log_story(logger, 0)
+        age(first, 30)
+        archive_sessions(TEST_DIR)
+        archive_path = os.path.join(TEST_DIR, ARCHIVE_DIR_NAME, os.listdir(os.path.join(TEST_DIR, ARCHIVE_DIR_NAME))[0])
+
+        # an interrupted run writes half a member and keeps its sources
+        member = gzip.compress(json.dumps({"session": {"session_id": "half", "generations": []}}).encode() * 50)
+        with open(archive_path, "ab") as f:
+            f.write(member[:len(member) // 2])
+        second = log_story(logger, 1)
+        age(second, 30)
+        assert archive_sessions(TEST_DIR).sessions_archived == 1
+        archived = {session["session_id"] for session in iter_archived_sessions(TEST_DIR)}
+        assert archived == {first.session_id, second.session_id}
+        print("  [OK] Damaged tail cut off before appending")
+
+        # an archive already appended behind a damaged member is still read past it
+        with open(archive_path, "ab") as f:
+            f.write(member[:len(member) // 2])
+            f.write(gzip.compress(json.dumps({"session": {"session_id": "later", "generations": []}}).encode()))
+        archived = {session["session_id"] for session in iter_archived_sessions(TEST_DIR)}
+        assert archived == {first.session_id, second.session_id, "later"}
+        print("  [OK] Members behind a damaged one still read")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_archive_round_trip()
+    test_history_reads_archives()
+    test_appends_and_retention()
+    test_damaged_member()
+    print("ALL ARCHIVE TESTS PASSED")
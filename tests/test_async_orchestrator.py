@@ -0,0 +1,125 @@
+"""Test the async orchestrator API without making API calls"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_async_feedback_logs"
+
+
+class StubOrchestrator(StoryOrchestrator):
+    """Orchestrator whose agent calls return canned output after a short delay"""
+
+    delay = 0.05
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(self.delay)
+        if agent.name == 'NarrativeDirector':
+            return NarrativePlan(**{
+                'story_category': 'adventure',
+                'story_arc': 'discovery',
+                'themes': ['friendship'],
+                'target_length': 'short',
+                'complexity_level': 'age 5-10',
+                'key_elements': ['treasure map']
+            })
+        if agent.name == 'Judge':
+            return JudgeEvaluation(**{
+                'overall_score': 8.5,
+                'age_appropriate': True,
+                'feedback': 'Lovely',
+                'strengths': ['warm'],
+                'improvements_needed': [],
+                'needs_revision': False
+            })
+        return "Once upon a time, two rabbits found a treasure map."
+
+
+def test_sync_wrapper():
+    """Sync methods should run on the background loop and return results"""
+    print("[Testing sync wrapper]")
+    orchestrator = StubOrchestrator(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("two rabbits finding treasure")
+        assert story.startswith("Once upon a time")
+        assert evaluation.overall_score == 8.5
+        assert revision_count == 0
+        print("  [OK] create_short_story works synchronously")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_unchanged_text_judged_once():
+    """The final evaluation should reuse the loop's evaluation of the same text"""
+    print("[Testing judge call reuse]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    logger.start_session("a sleepy owl", "short")
+    orchestrator = StubOrchestrator(show_spinner=False, feedback_logger=logger)
+    try:
+        orchestrator.create_short_story("a sleepy owl")
+        assert orchestrator.judge_stats == {'calls': 1, 'calls_saved': 1}
+        assert logger.current_session['metrics']['judge'] == {'calls': 1, 'calls_saved': 1}
+        print("  [OK] One judge call saved")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_concurrent_sessions():
+    """Many async stories should overlap on a single event loop"""
+    print("[Testing concurrent async stories]")
+    orchestrator = StubOrchestrator(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+
+    async def run_many(count):
+        return await asyncio.gather(*[
+            orchestrator.create_short_story_async(f"story {i}") for i in range(count)
+        ])
+
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(run_many(50))
+        elapsed = time.perf_counter() - start
+        assert len(results) == 50
+        # each story makes 3 sequential calls; running serially would take 50 * 3 * delay
+        assert elapsed < 50 * 3 * StubOrchestrator.delay / 5
+        print(f"  [OK] 50 stories in {elapsed:.2f}s")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_sync_inside_loop_rejected():
+    """Calling a sync method from a running loop should fail fast"""
+    print("[Testing sync call inside event loop]")
+    orchestrator = StubOrchestrator(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+
+    async def call_sync():
+        orchestrator.create_short_story("a sleepy owl")
+
+    try:
+        asyncio.run(call_sync())
+    except RuntimeError as e:
+        assert "_async" in str(e)
+        print("  [OK] RuntimeError raised")
+    else:
+        raise AssertionError("expected RuntimeError")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_sync_wrapper()
+    test_unchanged_text_judged_once()
+    test_concurrent_sessions()
+    test_sync_inside_loop_rejected()
+    print("ALL ASYNC ORCHESTRATOR TESTS PASSED")
@@ -0,0 +1,85 @@
+"""Test batch story generation without making API calls"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.batch import BatchRunner
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+
+TEST_DIR = "test_batch_output"
+
+
+class StubOrchestrator(StoryOrchestrator):
+    """Orchestrator with canned agent output; fails on requests containing 'fail'"""
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0.01)
+        self.total_input_tokens += 100
+        self.total_output_tokens += 50
+        if 'fail' in prompt:
+            raise RuntimeError('model unavailable')
+        if agent.name == 'Judge':
+            return JudgeEvaluation(**{'overall_score': 9.0, 'age_appropriate': True, 'feedback': 'ok',
+                               'strengths': [], 'improvements_needed': [], 'needs_revision': False})
+        if agent.name == 'NarrativeDirector':
+            return NarrativePlan(**{'story_category': 'animals', 'story_arc': 'discovery', 'themes': ['rest'],
+                               'target_length': 'short', 'complexity_level': 'age 5-10', 'key_elements': []})
+        return "The end."
+
+
+def make_runner():
+    return BatchRunner(
+        concurrency=3,
+        log_dir=os.path.join(TEST_DIR, "logs"),
+        orchestrator_factory=lambda logger: StubOrchestrator(show_spinner=False, feedback_logger=logger)
+    )
+
+
+def test_batch_run_and_resume():
+    """Batch run should stream results and skip completed IDs on re-run"""
+    print("[Testing batch run]")
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    os.makedirs(TEST_DIR)
+    input_path = os.path.join(TEST_DIR, "input.jsonl")
+    output_path = os.path.join(TEST_DIR, "output.jsonl")
+
+    try:
+        with open(input_path, "w") as f:
+            for i in range(10):
+                f.write(json.dumps({"user_request": f"a sleepy owl #{i}"}) + "\n")
+            f.write(json.dumps({"id": "bad", "user_request": "please fail"}) + "\n")
+
+        report = asyncio.run(make_runner().run(input_path, output_path))
+        assert report.completed == 10
+        assert report.failed == 1
+        assert report.input_tokens > 0
+        assert report.stories_per_minute > 0
+        with open(output_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 11
+        assert all(line["input_tokens"] == 300 for line in lines if not line.get("error"))
+        print(f"  [OK] {report.summary()}")
+
+        # simulate an interrupted write, then resume
+        with open(output_path, "a") as f:
+            f.write('{"id": "trunc')
+        report = asyncio.run(make_runner().run(input_path, output_path))
+        assert report.skipped == 10
+        assert report.failed == 1
+        print("  [OK] Resume skipped completed requests and retried failures")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_batch_run_and_resume()
+    print("ALL BATCH TESTS PASSED")
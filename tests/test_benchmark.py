@@ -0,0 +1,102 @@
+"""Test the offline fake model provider and the benchmark harness"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.core.benchmark import Benchmark, long_story_job, percentile, short_story_job
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_benchmark_feedback_logs"
+
+
+def test_fake_provider_is_deterministic():
+    """The same request should produce the same story and evaluation"""
+    print("[Testing fake provider determinism]")
+    results = []
+    for _ in range(2):
+        orchestrator = StoryOrchestrator(
+            show_spinner=False,
+            feedback_logger=FeedbackLogger(log_dir=TEST_DIR),
+            run_config=fake_run_config(FakeModelConfig(story_words=120))
+        )
+        try:
+            results.append(orchestrator.create_short_story("A bunny who learns to share"))
+            assert orchestrator.total_input_tokens > 0 and orchestrator.total_output_tokens > 0
+        finally:
+            orchestrator.close()
+            shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    assert results[0] == results[1]
+    story, evaluation, revision_count = results[0]
+    assert len(story.split()) >= 120
+    assert evaluation.overall_score == 8.5 and revision_count == 0
+    print("  [OK] Identical output across runs")
+
+
+def test_fake_provider_revisions_and_streaming():
+    """A revision rate of 1 should always revise, and streaming should deliver the story"""
+    print("[Testing fake provider revisions]")
+    orchestrator = StoryOrchestrator(
+        show_spinner=False,
+        feedback_logger=FeedbackLogger(log_dir=TEST_DIR),
+        run_config=fake_run_config(FakeModelConfig(revision_rate=1.0, story_words=80))
+    )
+    deltas = []
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("a sleepy owl", on_delta=deltas.append)
+        # the fake judge scores every revision the same, so the policy stops after one
+        assert revision_count == 1
+        assert orchestrator.revision_stats['low_gain'] == 1
+        assert evaluation.needs_revision
+        assert len(deltas) > 1
+        print(f"  [OK] {revision_count} revisions, {len(deltas)} streamed chunks")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_percentile():
+    """Percentiles should interpolate between ranks"""
+    print("[Testing percentile]")
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0], 90) == 1.9
+    print("  [OK] Percentiles correct")
+
+
+def test_benchmark_overhead():
+    """Pipeline overhead with a zero-latency model should stay small"""
+    print("[Testing benchmark overhead]")
+    benchmark = Benchmark(FakeModelConfig(story_words=150))
+
+    async def run():
+        short = await benchmark.run_scenario('short', short_story_job, runs=6, concurrency=3)
+        long = await benchmark.run_scenario('long', long_story_job, runs=1, chapters=20)
+        return short, long
+
+    short, long = asyncio.run(run())
+    assert short.runs == 6 and long.runs == 1
+    # plan + story + judge per short story
+    assert short.agent_calls == 6 * 3
+    # plan, chapter + judge per chapter, and a memory update for every chapter but the last
+    assert long.agent_calls == 1 + 20 * 2 + 19
+    assert short.to_dict()['p99_seconds'] < 1.0
+    assert long.latencies[0] < 20.0
+    print(f"  [OK] {short.summary()}")
+    print(f"  [OK] {long.summary()}")
+
+
+if __name__ == "__main__":
+    test_fake_provider_is_deterministic()
+    test_fake_provider_revisions_and_streaming()
+    test_percentile()
+    test_benchmark_overhead()
+    print("ALL BENCHMARK TESTS PASSED")
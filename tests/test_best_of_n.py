@@ -0,0 +1,162 @@
+"""Test best-of-N candidate generation without making API calls"""
+
+import asyncio
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_best_of_n_logs"
+
+
+class CandidateOrchestrator(StoryOrchestrator):
+    """Orchestrator whose judge scores each candidate by its variation number"""
+
+    delay = 0.05
+    revised_score = 9.0
+
+    def __init__(self, scores, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scores = scores
+        self.agent_calls = []
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        self.agent_calls.append(agent.name)
+        await asyncio.sleep(self.delay)
+        if agent.name == 'NarrativeDirector':
+            return NarrativePlan(
+                story_category='adventure',
+                story_arc='discovery',
+                themes=['friendship'],
+                target_length='short',
+                complexity_level='age 5-10',
+                key_elements=[]
+            )
+        if agent.name == 'Storyteller':
+            variation = re.search(r'Variation (\d+)', prompt)
+            story = f"Candidate {variation.group(1) if variation else 0}."
+            if on_delta:
+                on_delta(story)
+            return story
+        if agent.name == 'RevisionAgent':
+            return "Revised candidate."
+        candidate = re.search(r'Candidate (\d+)', prompt)
+        score = self.scores[int(candidate.group(1))] if candidate else self.revised_score
+        return JudgeEvaluation(
+            overall_score=score,
+            age_appropriate=True,
+            feedback='ok',
+            strengths=[],
+            improvements_needed=[],
+            needs_revision=score < 8.0
+        )
+
+
+def make_orchestrator(scores, **kwargs):
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    logger.start_session("a brave turtle", "short")
+    return CandidateOrchestrator(
+        scores, show_spinner=False, feedback_logger=logger, quality_strategy='best_of_n', **kwargs
+    )
+
+
+def test_best_candidate_wins_in_one_round():
+    """Candidates should be written and judged concurrently and the best kept"""
+    print("[Testing best-of-N selection]")
+    orchestrator = make_orchestrator([8.2, 9.4, 8.6])
+    try:
+        start = time.perf_counter()
+        story, evaluation, revision_count = orchestrator.create_short_story("a brave turtle")
+        elapsed = time.perf_counter() - start
+        assert story == "Candidate 1." and evaluation.overall_score == 9.4 and revision_count == 0
+        assert orchestrator.agent_calls.count('Storyteller') == 3
+        assert 'RevisionAgent' not in orchestrator.agent_calls
+        # plan, one generate round and one judge round
+        assert elapsed < 4 * CandidateOrchestrator.delay + 0.1
+
+        session = orchestrator.logger.current_session
+        assert [g['type'] for g in session['generations']] == ['candidate'] * 3 + ['final']
+        assert session['metrics']['best_of_n'] == {'candidates': 3, 'accepted': 3}
+        print(f"  [OK] Best of 3 chosen in {elapsed:.2f}s")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_revises_only_when_none_pass():
+    """The best candidate should be revised only when none reaches the bar"""
+    print("[Testing best-of-N revision fallback]")
+    orchestrator = make_orchestrator([6.0, 7.5, 7.0])
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("a brave turtle")
+        assert story == "Revised candidate." and evaluation.overall_score == 9.0 and revision_count == 1
+        assert orchestrator.agent_calls.count('RevisionAgent') == 1
+        assert orchestrator.logger.current_session['metrics']['best_of_n']['accepted'] == 0
+        print("  [OK] One revision of the best candidate")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_token_budget_limits_candidates():
+    """The token budget should cap how many candidates are written"""
+    print("[Testing best-of-N token budget]")
+    orchestrator = make_orchestrator([8.5, 9.0, 9.5, 9.9], candidate_count=4, candidate_token_budget=6000)
+    try:
+        orchestrator.create_short_story("a brave turtle")
+        # about 2,500 tokens per candidate before any usage has been measured
+        assert orchestrator.agent_calls.count('Storyteller') == 2
+        assert orchestrator.logger.current_session['metrics']['best_of_n']['candidates'] == 2
+        print("  [OK] Budget allowed 2 of 4 candidates")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_streamed_candidate_wins_ties():
+    """The streamed first candidate should only be replaced by a higher score"""
+    print("[Testing best-of-N streaming]")
+    orchestrator = make_orchestrator([9.0, 9.0, 8.5])
+    try:
+        streamed = []
+        story, _, _ = orchestrator.create_short_story("a brave turtle", on_delta=streamed.append)
+        assert streamed == ["Candidate 0."] and story == "Candidate 0."
+        print("  [OK] Only the first candidate streamed and kept on a tie")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_losing_streamed_candidate_not_restored():
+    """A streamed draft that lost to another candidate should not replace the revised winner"""
+    print("[Testing best-of-N streaming after revision]")
+    orchestrator = make_orchestrator([7.0, 7.5, 6.0])
+    orchestrator.max_revisions = 1
+    orchestrator.revised_score = 6.5
+    try:
+        streamed = []
+        story, evaluation, revision_count = orchestrator.create_short_story("a brave turtle", on_delta=streamed.append)
+        assert streamed == ["Candidate 0."] and revision_count == 1
+        assert story == "Revised candidate." and evaluation.overall_score == 6.5
+        print("  [OK] The losing streamed draft stayed out")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_best_candidate_wins_in_one_round()
+    test_revises_only_when_none_pass()
+    test_token_budget_limits_candidates()
+    test_streamed_candidate_wins_ties()
+    test_losing_streamed_candidate_not_restored()
+    print("ALL BEST-OF-N TESTS PASSED")
@@ -0,0 +1,125 @@
+"""Test the SQLite feedback index without making API calls"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.utils.feedback_index import FeedbackIndex, import_log_dir
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_feedback_index_logs"
+
+
+def evaluation(score, needs_revision=False):
+    return JudgeEvaluation(
+        overall_score=score,
+        age_appropriate=True,
+        feedback="ok",
+        strengths=[],
+        improvements_needed=[],
+        needs_revision=needs_revision
+    )
+
+
+def plan(category):
+    return NarrativePlan(
+        story_category=category,
+        story_arc="discovery",
+        themes=["friendship"],
+        target_length="short",
+        complexity_level="age 5-10",
+        key_elements=[]
+    )
+
+
+def log_sessions(logger):
+    """Two stories in different categories, one revised by the judge and one by the user"""
+    logger.start_session("A bunny who learns to share", "short")
+    logger.log_narrative_plan(plan("friendship"))
+    logger.log_generation("initial", "draft", evaluation(6.5, needs_revision=True))
+    logger.log_generation("revision", "better", evaluation(8.5), revision_count=1)
+    logger.log_generation("final", "better", evaluation(8.5), revision_count=1)
+    logger.log_user_exit_feedback("Loved it", "better")
+
+    logger.start_session("A dragon on an adventure", "long")
+    logger.log_narrative_plan(plan("adventure"))
+    logger.log_generation("initial", "story", evaluation(9.0))
+    logger.log_generation("user_revision", "story again", evaluation(9.0), user_feedback_input="more dragons")
+    logger.log_user_exit_feedback("More dragons", "story again")
+
+
+def test_incremental_index():
+    """Events logged through FeedbackLogger should be queryable immediately"""
+    print("[Testing incremental feedback index]")
+    for background in (False, True):
+        index = FeedbackIndex(os.path.join(TEST_DIR, "index.db"))
+        logger = FeedbackLogger(log_dir=TEST_DIR, background=background, index=index)
+        try:
+            log_sessions(logger)
+            logger.flush()
+            feedback = logger.get_historical_feedback()
+            assert [entry["feedback"] for entry in feedback][:2] == ["More dragons", "Loved it"]
+
+            distribution = index.score_distribution()
+            assert distribution["friendship"]["histogram"] == {6: 1, 8: 2}
+            assert distribution["friendship"]["mean"] == 7.83
+            assert distribution["adventure"]["min"] == 9.0
+
+            revisions = {row["session_id"]: row for row in index.revisions_per_session(limit=2)}
+            counts = sorted((row["revisions"], row["user_revisions"]) for row in revisions.values())
+            assert counts == [(0, 1), (1, 0)]
+            print(f"  [OK] Index current with background={background}")
+        finally:
+            logger.close()
+            index.close()
+            shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_import_existing_logs():
+    """The importer should index existing logs and be safe to re-run"""
+    print("[Testing feedback log importer]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    index = FeedbackIndex(os.path.join(TEST_DIR, "index.db"))
+    try:
+        log_sessions(logger)
+        logger.close()
+        assert import_log_dir(TEST_DIR, index) == 2
+        assert import_log_dir(TEST_DIR, index) == 2
+        assert index.score_distribution()["friendship"]["count"] == 3
+        assert len(index.recent_feedback()) == 2
+        print("  [OK] 2 sessions imported, re-import idempotent")
+    finally:
+        index.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_empty_index_backfilled():
+    """A new index should pick up sessions logged before it existed"""
+    print("[Testing index backfill]")
+    try:
+        logger = FeedbackLogger(log_dir=TEST_DIR)
+        log_sessions(logger)
+        logger.close()
+
+        index = FeedbackIndex(os.path.join(TEST_DIR, "index.db"))
+        logger = FeedbackLogger(log_dir=TEST_DIR, index=index)
+        assert index.session_count() == 2
+        assert [entry["feedback"] for entry in logger.get_historical_feedback()] == ["More dragons", "Loved it"]
+        logger.close()
+        index.close()
+        print("  [OK] 2 earlier sessions in history")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_incremental_index()
+    test_import_existing_logs()
+    test_empty_index_backfilled()
+    print("ALL FEEDBACK INDEX TESTS PASSED")
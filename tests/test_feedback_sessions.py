@@ -0,0 +1,128 @@
+"""Test concurrent feedback sessions on one logger without making API calls"""
+
+import asyncio
+import re
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import read_session_log
+
+TEST_DIR = "test_feedback_sessions_logs"
+
+
+class EchoOrchestrator(StoryOrchestrator):
+    """Orchestrator whose stories name the request they were written for"""
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0.01)
+        if agent.name == 'NarrativeDirector':
+            return NarrativePlan(
+                story_category='adventure',
+                story_arc='discovery',
+                themes=['friendship'],
+                target_length='short',
+                complexity_level='age 5-10',
+                key_elements=[]
+            )
+        if agent.name == 'Judge':
+            return JudgeEvaluation(
+                overall_score=8.5,
+                age_appropriate=True,
+                feedback='Lovely',
+                strengths=[],
+                improvements_needed=[],
+                needs_revision=False
+            )
+        request = re.search(r'User request: (.*)', prompt).group(1).strip()
+        return f"A story about {request}."
+
+
+def test_unique_session_ids():
+    """Sessions started in the same second should not collide"""
+    print("[Testing unique session IDs]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        sessions = [logger.start_session(f"story {i}", "short") for i in range(50)]
+        assert len({session.session_id for session in sessions}) == 50
+        assert len({session.event_log_file for session in sessions}) == 50
+        assert len(logger.open_sessions) == 50
+        logger.close()
+        assert logger.open_sessions == []
+        print("  [OK] 50 distinct sessions")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_concurrent_stories_share_logger():
+    """Concurrent stories on one orchestrator should each log to their own session"""
+    print("[Testing concurrent stories on one logger]")
+    logger = FeedbackLogger(log_dir=TEST_DIR, background=True)
+    orchestrator = EchoOrchestrator(show_spinner=False, feedback_logger=logger)
+
+    async def write(i):
+        session = logger.start_session(f"dragon number {i}", "short")
+        await orchestrator.create_short_story_async(f"dragon number {i}", session=session)
+        return session
+
+    async def run_many():
+        return await asyncio.gather(*[write(i) for i in range(20)])
+
+    try:
+        sessions = asyncio.run(run_many())
+        logger.flush()
+        for i, session in enumerate(sessions):
+            data = read_session_log(session.event_log_file)
+            assert data == session.data
+            assert data['narrative_plan']['story_category'] == 'adventure'
+            assert [g['type'] for g in data['generations']] == ['initial', 'final']
+            assert all(g['content'] == f"A story about dragon number {i}." for g in data['generations'])
+            assert data['metrics']['judge'] == {'calls': 1, 'calls_saved': 1}
+        print("  [OK] 20 sessions logged independently")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_threads_share_logger():
+    """Threads logging to their own sessions should not interleave events"""
+    print("[Testing threaded sessions]")
+    logger = FeedbackLogger(log_dir=TEST_DIR, background=True)
+    sessions = [logger.start_session(f"story {i}", "long") for i in range(8)]
+
+    def log_chapters(session):
+        for chapter_num in range(1, 51):
+            session.log_generation("chapter", f"{session.session_id} chapter {chapter_num}", chapter_num=chapter_num)
+            session.increment_session_metric("chapters", "written")
+
+    threads = [threading.Thread(target=log_chapters, args=(session,)) for session in sessions]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.flush()
+        for session in sessions:
+            data = read_session_log(session.event_log_file)
+            assert [g['chapter_number'] for g in data['generations']] == list(range(1, 51))
+            assert all(g['content'].startswith(session.session_id) for g in data['generations'])
+            assert data['metrics']['chapters'] == {'written': 50}
+        print("  [OK] 8 threads x 50 chapters")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_unique_session_ids()
+    test_concurrent_stories_share_logger()
+    test_threads_share_logger()
+    print("ALL FEEDBACK SESSION TESTS PASSED")
@@ -1,10 +1,17 @@
 """Test the feedback logging system without making API calls"""
 
 import os
+import sys
 import json
 import shutil
-from feedback_logger import FeedbackLogger
-from models import NarrativePlan, JudgeEvaluation
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.core.models import NarrativePlan, JudgeEvaluation
 
 def test_feedback_logger():
     """Test the FeedbackLogger class"""
@@ -134,6 +141,10 @@ def test_json_structure():
             user_feedback_input=f"Make chapter {i+1} exciting" if i == 1 else None
         )
 
+    # Events are appended to the session log; compaction writes the JSON document
+    assert os.path.exists(logger.event_log_file)
+    assert logger.compact_session() == logger.session_file
+
     # Verify JSON structure
     with open(logger.session_file, 'r') as f:
         data = json.load(f)
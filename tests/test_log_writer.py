@@ -0,0 +1,114 @@
+"""Test background feedback logging without making API calls"""
+
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import bedtime_story_generator.utils.log_writer as log_writer_module
+from bedtime_story_generator.core.models import JudgeEvaluation
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.log_writer import BackgroundWriter
+from bedtime_story_generator.utils.session_log import read_session_log
+
+TEST_DIR = "test_log_writer_feedback_logs"
+
+EVALUATION = JudgeEvaluation(
+    overall_score=8.0,
+    age_appropriate=True,
+    feedback="Lovely",
+    strengths=["warm"],
+    improvements_needed=[],
+    needs_revision=False
+)
+
+
+def test_background_matches_sync():
+    """Background mode should produce the same log as synchronous mode"""
+    print("[Testing background log contents]")
+    logger = FeedbackLogger(log_dir=TEST_DIR, background=True)
+    try:
+        logger.start_session("A sleepy owl", "long")
+        for chapter_num in range(1, 21):
+            logger.log_generation("chapter", f"Chapter {chapter_num}", EVALUATION, chapter_num=chapter_num)
+        logger.log_user_exit_feedback("Lovely", "story")
+        logger.flush()
+        assert read_session_log(logger.event_log_file) == logger.current_session
+        stats = logger.writer.stats
+        assert stats['writes'] == 23 and stats['errors'] == 0
+        print(f"  [OK] {stats['writes']} writes in {stats['batches']} batches")
+    finally:
+        logger.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_slow_disk_does_not_block():
+    """Logging calls should return without waiting for the file write"""
+    print("[Testing slow disk]")
+    real_append = log_writer_module.append_lines
+
+    def slow_append(*args):
+        time.sleep(0.05)
+        real_append(*args)
+
+    log_writer_module.append_lines = slow_append
+    logger = FeedbackLogger(log_dir=TEST_DIR, background=True)
+    try:
+        logger.start_session("A sleepy owl", "long")
+        start = time.perf_counter()
+        for chapter_num in range(1, 21):
+            logger.log_generation("chapter", f"Chapter {chapter_num}", EVALUATION, chapter_num=chapter_num)
+        elapsed = time.perf_counter() - start
+        assert elapsed < 20 * 0.05 / 4
+        logger.close()
+        assert len(read_session_log(logger.event_log_file)['generations']) == 20
+        print(f"  [OK] 20 generations logged in {elapsed * 1000:.1f}ms")
+    finally:
+        logger.close()
+        log_writer_module.append_lines = real_append
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_drop_backpressure():
+    """A full queue should drop writes under the drop policy"""
+    print("[Testing drop backpressure]")
+    entered, release = threading.Event(), threading.Event()
+    real_append = log_writer_module.append_lines
+
+    def blocked_append(*args):
+        entered.set()
+        release.wait()
+        real_append(*args)
+
+    log_writer_module.append_lines = blocked_append
+    writer = BackgroundWriter(max_queue_size=2, backpressure='drop')
+    Path(TEST_DIR).mkdir(exist_ok=True)
+    try:
+        path = str(Path(TEST_DIR) / "log.jsonl")
+        writer.append(path, "first\n")
+        # wait for the writer thread to block on the first write
+        assert entered.wait(5)
+        for i in range(5):
+            writer.append(path, f"line {i}\n")
+        assert writer.stats['dropped'] == 3
+        release.set()
+        writer.close()
+        assert Path(path).read_text().splitlines() == ["first", "line 0", "line 1"]
+        print("  [OK] 3 writes dropped, the rest written in order")
+    finally:
+        release.set()
+        writer.close()
+        log_writer_module.append_lines = real_append
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_background_matches_sync()
+    test_slow_disk_does_not_block()
+    test_drop_backpressure()
+    print("ALL LOG WRITER TESTS PASSED")
@@ -0,0 +1,112 @@
+"""Test rolling narrative memory for long stories without making API calls"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from agents import ModelBehaviorError
+
+from bedtime_story_generator.agents.schemas import CharacterOutput, MemoryUpdateOutput
+from bedtime_story_generator.core.memory import NarrativeMemory, estimate_tokens, fallback_memory_update
+from bedtime_story_generator.core.models import ChapterContext, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_memory_logs"
+
+PLAN = NarrativePlan(
+    story_category="fantasy",
+    story_arc="quest",
+    themes=["courage"],
+    target_length="long",
+    complexity_level="age 7-10",
+    key_elements=["dragon"]
+)
+
+CHAPTER = " ".join(["Pip the dragon flew over the quiet hills and met a new friend."] * 40)
+
+
+class MemoryStub(StoryOrchestrator):
+    """Memory Keeper returns an ever-growing summary to exercise the budget"""
+
+    def __init__(self):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+        self.memory_calls = 0
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        self.memory_calls += 1
+        return MemoryUpdateOutput(
+            story_so_far=" ".join(f"In chapter {i}, Pip helped a friend." for i in range(self.memory_calls * 5)),
+            characters=[
+                CharacterOutput(f'Friend {i}', 'a kind and gentle helper who lives in the hills')
+                for i in range(self.memory_calls)
+            ],
+            open_threads=[f'the mystery of the hill number {i}' for i in range(self.memory_calls)]
+        )
+
+
+def test_fallback_update_respects_budget():
+    """Fallback updates should never exceed the token budget"""
+    print("[Testing fallback memory budget]")
+    memory = NarrativeMemory(token_budget=200)
+    for _ in range(20):
+        memory = fallback_memory_update(memory, CHAPTER)
+    assert memory.chapters_covered == 20
+    assert estimate_tokens(memory.to_prompt()) <= 200
+    print("  [OK] Fallback memory stays within budget")
+
+
+def test_chapter_prompt_stays_flat():
+    """Chapter prompts should stay within a fixed budget however many chapters exist"""
+    print("[Testing chapter prompt growth]")
+    orchestrator = MemoryStub()
+    try:
+        chapters = [f"{CHAPTER} (chapter {i})" for i in range(19)]
+
+        def prompt_for(chapter_count):
+            memory = asyncio.run(orchestrator.get_memory_async("a dragon", chapters[:chapter_count]))
+            context = ChapterContext(chapter_count + 1, chapters[:chapter_count], PLAN, "a dragon", memory)
+            return orchestrator._build_story_prompt("a dragon", PLAN, context)
+
+        base_tokens = estimate_tokens(prompt_for(0))
+        prompt_3 = prompt_for(2)
+        prompt_20 = prompt_for(19)
+        budget = orchestrator.memory_token_budget
+        assert estimate_tokens(prompt_3) <= base_tokens + budget
+        assert estimate_tokens(prompt_20) <= base_tokens + budget
+        # each chapter is only folded in once
+        assert orchestrator.memory_calls == 19
+        print(f"  [OK] chapter 3: ~{estimate_tokens(prompt_3)} tokens, chapter 20: ~{estimate_tokens(prompt_20)} tokens")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+class OffSchemaStub(StoryOrchestrator):
+    """Memory Keeper output that never matches its schema"""
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        raise ModelBehaviorError("Invalid JSON when parsing model output")
+
+
+def test_off_schema_memory_falls_back():
+    """A memory update still off-schema after retries should fall back to the local update"""
+    print("[Testing off-schema memory updates]")
+    orchestrator = OffSchemaStub(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+    try:
+        memory = asyncio.run(orchestrator.get_memory_async("a dragon", [CHAPTER]))
+        assert memory == fallback_memory_update(NarrativeMemory(token_budget=memory.token_budget), CHAPTER)
+        print("  [OK] Fallback memory used")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_fallback_update_respects_budget()
+    test_chapter_prompt_stays_flat()
+    test_off_schema_memory_falls_back()
+    print("ALL NARRATIVE MEMORY TESTS PASSED")
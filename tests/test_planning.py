@@ -0,0 +1,253 @@
+"""Test plan caching and pipelined planning without making API calls"""
+
+import asyncio
+import shutil
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from agents import ModelBehaviorError
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.planning import PlanCache, RequestClassifier, normalize_request, request_terms
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import load_sessions
+
+TEST_DIR = "test_planning_logs"
+PLAN = NarrativePlan("adventure", "discovery", ["sharing", "kindness"], "short", "age 5-10", ["a bunny"])
+# past requests and the category, arc and theme the director gave them
+TRAINING = {
+    ("adventure", "quest", "courage"): [
+        "two rabbits finding treasure", "a pirate crew searching for buried treasure",
+        "a treasure map in grandma's attic", "a fox who finds a treasure chest", "a treasure hunt on a sandy island",
+        "a brave knight climbing a mountain", "a knight who rescues a baby dragon", "explorers on a jungle river",
+    ],
+    ("friendship", "growth", "kindness"): [
+        "a shy turtle making a new friend", "two friends who share their toys", "a lonely robot finds a friend",
+        "a new friend at school", "best friends building a treehouse", "a kitten and a puppy become friends",
+        "a grumpy bear learns to share", "friends who help a lost duckling",
+    ],
+    ("bedtime", "calming", "sleep"): [
+        "a sleepy owl who cannot sleep", "the moon sings the stars to sleep", "a sleepy bunny counting sheep",
+        "a cozy blanket and a sleepy kitten", "the night sky full of sleepy stars", "a lullaby for a sleepy bear",
+        "a quiet night in the sleepy forest", "a sleepy dragon yawning at the moon",
+    ],
+    ("fantasy", "wonder", "imagination"): [
+        "a unicorn with rainbow wings", "a magic wand that grants wishes", "a wizard's magic garden",
+        "a fairy who lives in a teacup", "a magic castle in the clouds", "a unicorn and a magic rainbow",
+    ],
+}
+
+
+def trained_classifier(lengths=("short",), **kwargs):
+    classifier = RequestClassifier(**kwargs)
+    for (category, arc, theme), requests in TRAINING.items():
+        for request in requests:
+            for length in lengths:
+                classifier.add(request, NarrativePlan(
+                    category, arc, [theme], length, "age 5-10", [request],
+                    is_suitable_for_long_form=length == "long", open_endedness_score=8.0 if length == "long" else 0.0
+                ))
+    return classifier
+
+
+class DelayedOrchestrator(StoryOrchestrator):
+    """Orchestrator whose agents each take ``delay`` seconds"""
+
+    delay = 0.1
+
+    def __init__(self, **kwargs):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR), **kwargs)
+        self.prompts = []
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        self.prompts.append((agent.name, prompt))
+        await asyncio.sleep(self.delay)
+        if agent.name == 'NarrativeDirector':
+            return PLAN
+        if agent.name == 'Judge':
+            return JudgeEvaluation(9.0, True, "Lovely.", ["gentle"], [], False)
+        if on_delta:
+            on_delta("Once upon a time.")
+        return "Once upon a time."
+
+    def prompts_for(self, name):
+        return [prompt for agent, prompt in self.prompts if agent == name]
+
+
+class FailingDirectorOrchestrator(DelayedOrchestrator):
+    """Orchestrator whose director gives up after its retries"""
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        if agent.name == 'NarrativeDirector':
+            self.prompts.append((agent.name, prompt))
+            await asyncio.sleep(self.delay)
+            raise ModelBehaviorError("still off-schema")
+        return await super()._run_agent(agent, prompt, on_delta)
+
+
+def test_normalize_request():
+    """Wording around the topic should not change the cache key"""
+    print("[Testing request normalisation]")
+    assert normalize_request("Tell me a bedtime story about a Brave Turtle!") == "a brave turtle"
+    assert normalize_request("  a brave   turtle ") == "a brave turtle"
+    assert normalize_request("Please write a story where two rabbits find treasure.") == "two rabbits find treasure"
+    assert normalize_request("a story-telling owl") == "a story telling owl"
+    print("  [OK] Preamble, case and punctuation removed")
+
+
+def test_plan_cache():
+    """Repeat topics should skip the director, including after a restart"""
+    print("[Testing the plan cache]")
+    orchestrator = DelayedOrchestrator()
+    try:
+        orchestrator.logger.start_session("a brave turtle", "short")
+        orchestrator.create_narrative_plan("a brave turtle", "short")
+        plan = orchestrator.create_narrative_plan("Tell me a story about a brave turtle!", "short")
+        assert plan == PLAN and len(orchestrator.prompts_for('NarrativeDirector')) == 1
+        assert orchestrator.plan_cache.stats == {'hits': 1, 'misses': 1}
+        assert orchestrator.logger.current_session['metrics']['plan_cache'] == {'misses': 1, 'hits': 1}
+        plan.themes.append("changed")
+        assert orchestrator.plan_cache.get("a brave turtle", "short").themes == PLAN.themes
+        assert orchestrator.plan_cache.get("a brave turtle", "long") is None
+        orchestrator.logger.close()
+
+        warmed = PlanCache.from_log_dir(TEST_DIR)
+        assert len(warmed) == 1 and warmed.get("A brave turtle.", "short") == PLAN
+        sessions = [{'user_request': "a brave turtle", 'narrative_plan': asdict(PLAN)}]
+        assert PlanCache.from_sessions(sessions).get("a brave turtle", "short") == PLAN
+        print("  [OK] 1 director call for 2 requests; cache warmed from logs")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_pipelined_planning():
+    """A pipelined story should start drafting before the plan is ready"""
+    print("[Testing pipelined planning]")
+    first_story = {}
+    for planning in ('sequential', 'pipelined'):
+        orchestrator = DelayedOrchestrator(planning=planning)
+        try:
+            orchestrator.logger.start_session("a bunny who shares", "short")
+            story, evaluation, _ = orchestrator.create_short_story("a bunny who shares")
+            assert story == "Once upon a time." and evaluation.overall_score == 9.0
+            metric = orchestrator.logger.current_session['metrics']['time_to_first_story']
+            assert metric['planning'] == planning
+            first_story[planning] = metric['seconds']
+
+            draft_prompt = orchestrator.prompts_for('Storyteller')[0]
+            assert ("Story category" in draft_prompt) == (planning == 'sequential')
+            # the plan still guides judging
+            assert "sharing, kindness" in orchestrator.prompts_for('Judge')[0]
+            assert orchestrator.logger.current_session['narrative_plan']['themes'] == PLAN.themes
+
+            if planning == 'pipelined':
+                # a cached plan is simply used
+                orchestrator.create_short_story("A bunny who shares.")
+                assert "Story category" in orchestrator.prompts_for('Storyteller')[1]
+                assert orchestrator.logger.current_session['metrics']['time_to_first_story']['planning'] == 'sequential'
+        finally:
+            orchestrator.close()
+            shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    delay = DelayedOrchestrator.delay
+    assert first_story['sequential'] >= 2 * delay
+    assert first_story['pipelined'] < 1.5 * delay
+    print(f"  [OK] Time to first story {first_story['sequential']:.2f}s -> {first_story['pipelined']:.2f}s")
+
+
+def test_pipelined_plan_failure():
+    """A director failure after the draft was streamed should keep the draft"""
+    print("[Testing a failed pipelined plan]")
+    orchestrator = FailingDirectorOrchestrator(planning='pipelined')
+    try:
+        orchestrator.logger.start_session("a bunny who shares", "short")
+        shown = []
+        story, evaluation, _ = orchestrator.create_short_story("a bunny who shares", on_delta=shown.append)
+        assert story == "".join(shown) == "Once upon a time." and evaluation.overall_score == 9.0
+        assert len(orchestrator.prompts_for('NarrativeDirector')) == 1
+        session = orchestrator.logger.current_session
+        assert session['metrics']['planning'] == {'fallback': 1}
+        assert session['narrative_plan']['key_elements'] == ["a bunny who shares"]
+        # the fallback is not remembered as the topic's plan
+        assert orchestrator.plan_cache.get("a bunny who shares", "short") is None
+        print("  [OK] Draft judged against a fallback plan")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_request_classifier():
+    """Familiar requests should get a local plan quickly; unfamiliar ones go to the director"""
+    print("[Testing the request classifier]")
+    assert request_terms("Tell me a story about two rabbits finding the treasure") == ["two", "rabbit", "finding", "treasure"]
+    assert RequestClassifier().classify("two rabbits finding treasure", "short") is None
+
+    classifier = trained_classifier()
+    plan = classifier.classify("Tell me a story about three mice finding treasure!", "short")
+    assert (plan.story_category, plan.story_arc, plan.themes) == ("adventure", "quest", ["courage"])
+    assert plan.target_length == "short" and plan.key_elements == ["three mice finding treasure"]
+    assert classifier.classify("a sleepy turtle at night", "short").story_category == "bedtime"
+    assert classifier.classify("a unicorn's magic wishes", "short").story_category == "fantasy"
+    # nothing like it, and a request split between categories
+    assert classifier.classify("a submarine exploring volcanoes", "short") is None
+    assert classifier.classify("a sleepy magic treasure friend", "short") is None
+    assert classifier.stats == {'local': 3, 'deferred': 2} and classifier.local_share() == 0.6
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        classifier.classify("a brave puppy finding treasure in the garden", "short")
+    elapsed = (time.perf_counter() - start) / 1000
+    assert elapsed < 0.001, elapsed
+    print(f"  [OK] 3 of 5 planned locally; {elapsed * 1e6:.0f}us per request")
+
+    # only plans made for the requested length are borrowed
+    assert classifier.classify("three mice finding treasure", "long") is None
+    plan = trained_classifier(lengths=("short", "long")).classify("three mice finding treasure", "long")
+    assert plan.target_length == "long" and plan.is_suitable_for_long_form and plan.open_endedness_score == 8.0
+    print("  [OK] Long stories planned from long-form plans only")
+
+
+def test_orchestrator_plans_locally():
+    """Confident requests should skip the director and be counted in the session metrics"""
+    print("[Testing local planning in the orchestrator]")
+    orchestrator = DelayedOrchestrator(request_classifier=trained_classifier(), planning='pipelined')
+    orchestrator.delay = 0
+    try:
+        for request in ("a mole finding treasure", "a sleepy hedgehog", "a submarine exploring volcanoes"):
+            orchestrator.logger.start_session(request, "short")
+            orchestrator.create_short_story(request)
+        metrics = orchestrator.logger.current_session['metrics']
+        assert metrics['request_classifier'] == {'deferred': 1}
+        assert metrics['time_to_first_story']['planning'] == 'pipelined'
+        # only the unfamiliar request reached the director, and its plan was learned
+        assert len(orchestrator.prompts_for('NarrativeDirector')) == 1
+        assert orchestrator.request_classifier.local_share() == 0.667
+        assert len(orchestrator.request_classifier) == sum(len(requests) for requests in TRAINING.values()) + 1
+        orchestrator.logger.close()
+
+        learned = RequestClassifier.from_log_dir(TEST_DIR, min_examples=3)
+        assert len(learned) == 3
+        assert len(RequestClassifier.from_sessions(load_sessions(TEST_DIR))) == 3
+        assert learned.classify("a hedgehog who is sleepy", "short").story_category == "bedtime"
+        print("  [OK] 2 of 3 requests planned without the director")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_normalize_request()
+    test_plan_cache()
+    test_pipelined_planning()
+    test_pipelined_plan_failure()
+    test_request_classifier()
+    test_orchestrator_plans_locally()
+    print("ALL PLANNING TESTS PASSED")
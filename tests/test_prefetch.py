@@ -0,0 +1,112 @@
+"""Test speculative next-chapter prefetch without making API calls"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.schemas import MemoryUpdateOutput
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_prefetch_logs"
+
+PLAN = NarrativePlan(
+    story_category="fantasy",
+    story_arc="quest",
+    themes=["courage"],
+    target_length="long",
+    complexity_level="age 7-10",
+    key_elements=["dragon"],
+    is_suitable_for_long_form=True,
+    open_endedness_score=8.0
+)
+
+
+class ChapterStub(StoryOrchestrator):
+    """Counts storyteller calls and returns numbered chapters"""
+
+    def __init__(self):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+        self.storyteller_calls = 0
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0.01)
+        if agent.name == 'Judge':
+            return JudgeEvaluation(**{'overall_score': 9.0, 'age_appropriate': True, 'feedback': 'ok',
+                               'strengths': [], 'improvements_needed': [], 'needs_revision': False})
+        if agent.name == 'MemoryKeeper':
+            return MemoryUpdateOutput(story_so_far='A dragon set off.', characters=[], open_threads=[])
+        self.storyteller_calls += 1
+        text = f"Chapter text {self.storyteller_calls}"
+        if on_delta:
+            on_delta(text)
+        return text
+
+
+def test_prefetch_hit_and_discard():
+    """A matching request reuses the prefetch; a different one discards it"""
+    print("[Testing chapter prefetch]")
+    orchestrator = ChapterStub()
+    orchestrator.logger.start_session("a dragon", "long")
+    try:
+        chapter1, _ = orchestrator.generate_next_chapter("a dragon", PLAN, [], 1)
+        orchestrator.prefetch_next_chapter("a dragon", PLAN, [chapter1], 2)
+        chapter2, _ = orchestrator.generate_next_chapter("a dragon", PLAN, [chapter1], 2)
+        assert chapter2 == "Chapter text 2"
+        assert orchestrator.storyteller_calls == 2
+        assert orchestrator.prefetch_stats['hits'] == 1
+        print("  [OK] Prefetched chapter handed over")
+
+        orchestrator.prefetch_next_chapter("a dragon", PLAN, [chapter1, chapter2], 3)
+        streamed = []
+        chapter3, _ = orchestrator.generate_next_chapter(
+            "a dragon", PLAN, [chapter1, chapter2], 3, user_feedback="add a rainbow", on_delta=streamed.append
+        )
+        assert orchestrator.prefetch_stats['discarded'] == 1
+        assert ''.join(streamed) == chapter3
+        print("  [OK] Prefetch discarded when the reader left feedback")
+
+        metrics = orchestrator.logger.current_session['metrics']['prefetch']
+        assert metrics['hit_rate'] == 0.5
+        assert len(orchestrator.logger.current_session['generations']) == 3
+        print("  [OK] Hit rate logged to the session")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_prefetch_per_story():
+    """Stories sharing an orchestrator should keep their own prefetches, up to the cap"""
+    print("[Testing prefetch per story]")
+    orchestrator = ChapterStub()
+    orchestrator.max_prefetches = 2
+    orchestrator.logger.start_session("a dragon", "long")
+    try:
+        orchestrator.prefetch_next_chapter("a dragon", PLAN, [], 1)
+        orchestrator.prefetch_next_chapter("an owl", PLAN, [], 1)
+        orchestrator.generate_next_chapter("an owl", PLAN, [], 1)
+        orchestrator.generate_next_chapter("a dragon", PLAN, [], 1)
+        assert orchestrator.prefetch_stats['hits'] == 2 and orchestrator.storyteller_calls == 2
+        print("  [OK] Both stories' prefetches handed over")
+
+        for story in ("a dragon", "an owl", "a whale"):
+            orchestrator.prefetch_next_chapter(story, PLAN, [], 1)
+        assert orchestrator.prefetch_stats['discarded'] == 1
+        orchestrator.generate_next_chapter("a dragon", PLAN, [], 1)
+        assert orchestrator.prefetch_stats['hits'] == 2
+        print("  [OK] Oldest prefetch discarded past the cap")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_prefetch_hit_and_discard()
+    test_prefetch_per_story()
+    print("ALL PREFETCH TESTS PASSED")
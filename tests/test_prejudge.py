@@ -0,0 +1,129 @@
+"""Test the local pre-judge checks without making API calls"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.agents.schemas import ParagraphReplacementOutput, ParagraphRevisionOutput
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.prejudge import PreJudge, fix_formatting, is_truncated, reading_grade
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_prejudge_logs"
+PARAGRAPH = "Luna and Milo walked to the quiet pond. The moon was round and bright. " * 10
+STORY = "\n\n".join([PARAGRAPH.strip()] * 5 + ["Then they went home and fell asleep."])
+
+
+def test_formatting_fixed_locally():
+    """Markdown and emojis should be stripped without touching the words"""
+    print("[Testing formatting fixes]")
+    text = "# A Sleepy Owl\n\n**Luna** the *brave* owl flew home 🦉\n\n- first\n- second\n\n---\n\nThe end."
+    assert fix_formatting(text) == "Luna the brave owl flew home\n\nfirst\nsecond\n\nThe end."
+    assert fix_formatting(STORY) == STORY
+    print("  [OK] Headings, emphasis, lists, rules and emojis removed")
+
+
+def test_checks():
+    """Length, lexicon, readability and endings should decide obvious failures"""
+    print("[Testing pre-judge checks]")
+    pre_judge = PreJudge()
+    start = time.perf_counter()
+    judgement = pre_judge.check("# Title\n\n" + STORY + " 🌙")
+    elapsed = time.perf_counter() - start
+    assert judgement.verdict == 'inconclusive' and judgement.formatting_fixed and judgement.story == STORY
+    assert judgement.evaluation() is None
+    assert elapsed < 0.05
+
+    short = pre_judge.check("Luna fell asleep.")
+    assert short.verdict == 'fail' and "3 words" in short.problems[0]
+    assert short.evaluation().needs_revision and short.evaluation().prejudged
+
+    scary = pre_judge.check(STORY.replace("bright.", "bright. There was blood on the stone.", 1))
+    evaluation = scary.evaluation()
+    assert not evaluation.age_appropriate
+    assert evaluation.paragraph_issues == [{'paragraph': 1, 'issue': 'remove frightening words (blood)'}]
+
+    truncated = pre_judge.check(STORY.rsplit(" ", 2)[0])
+    assert truncated.verdict == 'fail'
+    assert truncated.paragraph_issues == [{'paragraph': 6, 'issue': 'finish the cut-off ending'}]
+    assert is_truncated("and then the") and not is_truncated('He said, "Goodnight."')
+
+    hard = "Notwithstanding considerable institutional apprehension, extraordinary bureaucratic deliberations continued indefinitely."
+    assert reading_grade(hard) > 8 > reading_grade(STORY)
+    print(f"  [OK] Checked in {elapsed * 1000:.2f}ms; short, scary and truncated stories failed")
+
+
+class CountingJudgeOrchestrator(StoryOrchestrator):
+    """Orchestrator that counts judge calls, serves drafts from a list and finishes cut-off endings"""
+
+    def __init__(self, stories, **kwargs):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR), **kwargs)
+        self.logger.start_session("a sleepy owl", "short")
+        self.stories = list(stories)
+        self.judge_calls = 0
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0)
+        if agent.name == 'NarrativeDirector':
+            return NarrativePlan("adventure", "discovery", ["sharing"], "short", "age 5-10", [])
+        if agent.name == 'Judge':
+            self.judge_calls += 1
+            return JudgeEvaluation(9.0, True, "Lovely.", ["gentle"], [], False)
+        if agent.name == 'TargetedRevisionAgent':
+            return ParagraphRevisionOutput([ParagraphReplacementOutput(6, "Then they went home and fell asleep.")])
+        return self.stories.pop(0)
+
+
+def test_orchestrator_skips_judge():
+    """Failed drafts should be revised without a judge call, formatting fixed without any call"""
+    print("[Testing pre-judge in the quality loop]")
+    orchestrator = CountingJudgeOrchestrator(["**" + STORY.rsplit(" ", 2)[0]], pre_judge=PreJudge())
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("a sleepy owl")
+        assert story == STORY and revision_count == 1 and evaluation.overall_score == 9.0
+        assert orchestrator.judge_calls == 1
+        assert orchestrator.prejudge_stats == {'judge_calls_avoided': 1, 'formatting_fixes': 1}
+        assert orchestrator.logger.current_session['metrics']['prejudge'] == orchestrator.prejudge_stats
+        # placeholder scores never teach the revision policy
+        assert orchestrator.revision_policy.expected_gains() == {}
+        print("  [OK] 1 judge call avoided, 1 formatting fix")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_fake_flaws_avoid_judge_calls():
+    """With flawed fake stories, the pre-judge should avoid judge calls end to end"""
+    print("[Testing pre-judge against flawed fake stories]")
+    orchestrator = StoryOrchestrator(
+        show_spinner=False,
+        feedback_logger=FeedbackLogger(log_dir=TEST_DIR),
+        run_config=fake_run_config(FakeModelConfig(flaw_rate=1.0)),
+        pre_judge=PreJudge()
+    )
+    try:
+        for index in range(6):
+            story, _, _ = orchestrator.create_short_story(f"a sleepy owl, variation {index}")
+            assert "**" not in story and "#" not in story
+        stats = orchestrator.prejudge_stats
+        assert stats['judge_calls_avoided'] > 0 and stats['formatting_fixes'] > 0
+        print(f"  [OK] {stats}")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_formatting_fixed_locally()
+    test_checks()
+    test_orchestrator_skips_judge()
+    test_fake_flaws_avoid_judge_calls()
+    print("ALL PRE-JUDGE TESTS PASSED")
@@ -0,0 +1,76 @@
+"""Test the agent response cache without making API calls"""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents import narrative_director, storyteller, judge
+from bedtime_story_generator.agents.schemas import JudgeEvaluationOutput
+from bedtime_story_generator.core.cache import ResponseCache
+
+TEST_DIR = "test_cache_dir"
+
+
+def test_per_agent_flags():
+    """Director and judge are cached by default, the storyteller never is"""
+    print("[Testing per-agent cache flags]")
+    cache = ResponseCache()
+    assert cache.is_enabled_for(narrative_director)
+    assert cache.is_enabled_for(judge)
+    assert not cache.is_enabled_for(storyteller)
+    assert not ResponseCache(max_temperature=0.2).is_enabled_for(narrative_director)
+    print("  [OK] Flags respected")
+
+
+def test_lru_and_ttl():
+    """Entries are evicted by size and expire after the TTL"""
+    print("[Testing LRU and TTL eviction]")
+    cache = ResponseCache(max_entries=2, ttl_seconds=0.05)
+    cache.set(judge, "a", "A")
+    cache.set(judge, "b", "B")
+    assert cache.get(judge, "a") == "A"
+    cache.set(judge, "c", "C")
+    assert cache.get(judge, "b") is None
+    assert cache.get(judge, "a") == "A"
+    assert cache.get(narrative_director, "a") is None
+    time.sleep(0.06)
+    assert cache.get(judge, "a") is None
+    assert cache.stats["Judge"] == {"hits": 2, "misses": 2}
+    print("  [OK] LRU and TTL eviction work")
+
+
+def test_sqlite_backend():
+    """Entries persist across cache instances through SQLite"""
+    print("[Testing SQLite backend]")
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    os.makedirs(TEST_DIR)
+    db_path = os.path.join(TEST_DIR, "cache.sqlite")
+    try:
+        cache = ResponseCache(db_path=db_path, max_disk_entries=2)
+        evaluation = JudgeEvaluationOutput(8.0, True, "ok", [], [], False, None, [])
+        for prompt, output in [("p1", "one"), ("p2", evaluation), ("p3", "three")]:
+            cache.set(judge, prompt, output)
+            time.sleep(0.001)
+        cache.close()
+
+        reopened = ResponseCache(db_path=db_path)
+        assert reopened.get(judge, "p2") == evaluation
+        assert reopened.get(judge, "p3") == "three"
+        assert reopened.get(judge, "p1") is None
+        reopened.close()
+        print("  [OK] Entries persisted with size eviction")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_per_agent_flags()
+    test_lru_and_ttl()
+    test_sqlite_backend()
+    print("ALL CACHE TESTS PASSED")
@@ -0,0 +1,146 @@
+"""Test the adaptive revision policy without making API calls"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.revision_policy import RevisionPolicy, is_cosmetic
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import load_recent_sessions
+
+TEST_DIR = "test_revision_policy_logs"
+
+
+def evaluation(score, improvements=("more tension in the middle",), needs_revision=None):
+    return JudgeEvaluation(
+        overall_score=score,
+        age_appropriate=True,
+        feedback="ok",
+        strengths=[],
+        improvements_needed=list(improvements),
+        needs_revision=score < 8.0 if needs_revision is None else needs_revision
+    )
+
+
+def plan(category):
+    return NarrativePlan(
+        story_category=category,
+        story_arc="discovery",
+        themes=["friendship"],
+        target_length="short",
+        complexity_level="age 5-10",
+        key_elements=[]
+    )
+
+
+class ScriptedOrchestrator(StoryOrchestrator):
+    """Orchestrator whose judge returns a scripted sequence of evaluations"""
+
+    def __init__(self, category, evaluations, **kwargs):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR), **kwargs)
+        self.category = category
+        self.evaluations = list(evaluations)
+        self.revisions = 0
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0)
+        if agent.name == 'NarrativeDirector':
+            return plan(self.category)
+        if agent.name == 'Judge':
+            return self.evaluations.pop(0)
+        if agent.name == 'RevisionAgent':
+            self.revisions += 1
+            return f"Revision {self.revisions}."
+        return "Draft."
+
+
+def test_decisions():
+    """The policy should skip approved, cosmetic and unprofitable revisions"""
+    print("[Testing revision decisions]")
+    policy = RevisionPolicy(min_gain=0.3)
+    assert policy.decide(evaluation(8.5), "adventure") == 'approved'
+    assert policy.decide(evaluation(6.0), "adventure") == 'revise'
+    assert is_cosmetic(evaluation(7.5, ["Fix a typo in paragraph two", "Smoother word choice"]))
+    assert policy.decide(evaluation(7.5, ["Fix a typo in paragraph two"]), "adventure") == 'cosmetic'
+    assert policy.decide(evaluation(6.0), "adventure", last_gain=0.1) == 'low_gain'
+    assert policy.decide(evaluation(7.5), "adventure", is_chapter=True) == 'approved'
+    unsafe = JudgeEvaluation(7.5, False, "too scary", [], ["typo"], True)
+    assert policy.decide(unsafe, "adventure", last_gain=0.0) == 'revise'
+
+    for _ in range(6):
+        policy.record_gain("mystery", -0.5)
+    assert policy.expected_gain("mystery") < 0.3
+    assert policy.decide(evaluation(6.0), "mystery") == 'low_expected_gain'
+    print("  [OK] approved, revise, cosmetic, low_gain and low_expected_gain")
+
+
+def test_learn_from_logs():
+    """Expected gains should be learned per category from logged sessions"""
+    print("[Testing learning from feedback logs]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        for _ in range(3):
+            logger.start_session("a sleepy owl", "short")
+            logger.log_narrative_plan(plan("bedtime"))
+            logger.log_generation("initial", "draft", evaluation(6.0))
+            logger.log_generation("revision", "better", evaluation(8.0), revision_count=1)
+            logger.log_generation("final", "better", evaluation(8.0), revision_count=1)
+
+            logger.start_session("a ghost story", "short")
+            logger.log_narrative_plan(plan("mystery"))
+            logger.log_generation("initial", "draft", evaluation(7.0))
+            logger.log_generation("revision", "same", evaluation(6.8), revision_count=1)
+        logger.close()
+
+        policy = RevisionPolicy.from_log_dir(TEST_DIR, prior_weight=1.0)
+        gains = policy.expected_gains()
+        assert gains["bedtime"] == {'expected_gain': 1.75, 'revisions': 3}
+        assert gains["mystery"]["revisions"] == 3 and gains["mystery"]["expected_gain"] < 0.3
+        assert RevisionPolicy.from_log_dir("no_such_dir").expected_gains() == {}
+        # one scan of the logs can be shared with the plan cache and classifier
+        sessions = load_recent_sessions(TEST_DIR, max_sessions=2)
+        assert len(sessions) == 2
+        assert RevisionPolicy.from_sessions(sessions, prior_weight=1.0).expected_gains()["bedtime"]["revisions"] == 1
+        print(f"  [OK] Learned {gains}")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_orchestrator_exits_early():
+    """The quality loop should stop once revisions stop paying off"""
+    print("[Testing early exit in the quality loop]")
+    orchestrator = ScriptedOrchestrator("adventure", [evaluation(6.0), evaluation(6.1), evaluation(6.1)])
+    orchestrator.max_revisions = 3
+    try:
+        story, final_evaluation, revision_count = orchestrator.create_short_story("a brave turtle")
+        assert story == "Revision 1." and revision_count == 1
+        assert orchestrator.revision_stats['low_gain'] == 1
+        assert orchestrator.revision_stats['accepted'] == 1
+        print(f"  [OK] Stopped after {revision_count} revision")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+    orchestrator = ScriptedOrchestrator("adventure", [evaluation(7.6, ["Fix punctuation in the dialogue"])])
+    try:
+        story, _, revision_count = orchestrator.create_short_story("a brave turtle")
+        assert story == "Draft." and revision_count == 0 and orchestrator.revisions == 0
+        assert orchestrator.revision_stats['cosmetic'] == 1
+        print("  [OK] Cosmetic-only feedback not revised")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_decisions()
+    test_learn_from_logs()
+    test_orchestrator_exits_early()
+    print("ALL REVISION POLICY TESTS PASSED")
@@ -0,0 +1,165 @@
+"""Test the request scheduler's rate limits, retries and priorities without making API calls"""
+
+import asyncio
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, FakeRateLimitError, fake_run_config
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.scheduler import RequestScheduler, is_retryable
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_scheduler_logs"
+
+
+def flaky(failures, error=FakeRateLimitError):
+    """A call that fails ``failures`` times before succeeding"""
+    calls = []
+
+    async def call():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise error("try again")
+        return "ok"
+    return call, calls
+
+
+def test_retries_with_backoff():
+    """Transient errors should be retried with backoff, others raised at once"""
+    print("[Testing retries with backoff]")
+    scheduler = RequestScheduler(base_delay=0.01, max_retries=3)
+    call, calls = flaky(2)
+    assert asyncio.run(scheduler.run(call)) == "ok" and len(calls) == 3
+    assert scheduler.stats['retries'] == 2 and scheduler.stats['rate_limited'] == 2
+
+    call, calls = flaky(5)
+    try:
+        asyncio.run(scheduler.run(call))
+        assert False, "should give up after max_retries"
+    except FakeRateLimitError:
+        assert len(calls) == 4
+
+    call, calls = flaky(1, ValueError)
+    try:
+        asyncio.run(scheduler.run(call))
+        assert False, "ValueError is not transient"
+    except ValueError:
+        assert len(calls) == 1
+    assert not is_retryable(ValueError()) and is_retryable(asyncio.TimeoutError())
+
+    backoffs = [scheduler.backoff(attempt) for attempt in range(8)]
+    assert all(0 <= delay <= scheduler.max_delay for delay in backoffs)
+    print("  [OK] 2 retries then success; gave up after 3; ValueError not retried")
+
+
+def test_timeouts_retried():
+    """A call that hangs should time out and be retried"""
+    print("[Testing per-call timeouts]")
+    scheduler = RequestScheduler(base_delay=0.01, timeout=0.05)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            await asyncio.sleep(1)
+        return "ok"
+
+    assert asyncio.run(scheduler.run(call)) == "ok"
+    assert scheduler.stats['timeouts'] == 1 and len(attempts) == 2
+    print("  [OK] Timed out once, then succeeded")
+
+
+def test_rate_limits_and_priority():
+    """An empty bucket should hold calls back and release interactive ones first"""
+    print("[Testing token buckets and priority lanes]")
+    scheduler = RequestScheduler(requests_per_minute=600, tokens_per_minute=60000)
+
+    async def scenario():
+        scheduler.requests.level = 0
+        started = []
+
+        async def call(name):
+            async def run():
+                started.append(name)
+            await scheduler.run(run, estimated_tokens=100, priority='interactive' if name.startswith('i') else 'batch')
+
+        start = time.monotonic()
+        # batch work queued first must still wait behind the interactive request
+        tasks = [asyncio.create_task(call(name)) for name in ('b1', 'b2')]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call('i1')))
+        await asyncio.gather(*tasks)
+        return started, time.monotonic() - start
+
+    started, elapsed = asyncio.run(scenario())
+    # at 10 requests a second, three calls from an empty bucket take about 0.3s
+    assert started == ['i1', 'b1', 'b2'], started
+    assert 0.25 < elapsed < 0.6, elapsed
+    assert scheduler.stats['wait_seconds']['batch'] > scheduler.stats['wait_seconds']['interactive']
+
+    scheduler.settle(100, 1100)
+    assert scheduler.tokens.delay(60000) > 0
+    print(f"  [OK] Interactive first; 3 throttled calls took {elapsed:.2f}s")
+
+
+def test_orchestrator_survives_rate_limits():
+    """Stories should complete despite frequent simulated rate limits"""
+    print("[Testing orchestrator under rate limiting]")
+    orchestrator = StoryOrchestrator(
+        show_spinner=False,
+        feedback_logger=FeedbackLogger(log_dir=TEST_DIR),
+        run_config=fake_run_config(FakeModelConfig(error_rate=0.4)),
+        scheduler=RequestScheduler(base_delay=0.005, max_retries=10)
+    )
+    try:
+        for index in range(4):
+            streamed = []
+            story, _, _ = orchestrator.create_short_story(f"a sleepy owl, variation {index}", on_delta=streamed.append)
+            assert story == ''.join(streamed)
+        retries = orchestrator.usage.summary()['total']['retries']
+        assert retries > 0 and orchestrator.scheduler.stats['rate_limited'] == retries
+        print(f"  [OK] 4 stories with {retries} retried calls")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_shared_across_loops():
+    """One scheduler should serve calls from several event loops"""
+    print("[Testing a scheduler shared across loops]")
+    scheduler = RequestScheduler(base_delay=0.05)
+
+    async def paused_calls():
+        # the rate limit pauses the second call, which waits on the loop's condition
+        first, _ = flaky(1)
+        second, _ = flaky(0)
+        return await asyncio.gather(scheduler.run(first), scheduler.run(second))
+
+    assert asyncio.run(paused_calls()) == ["ok", "ok"]
+    # a second loop, as the synchronous methods' background loop would be
+    assert asyncio.run(paused_calls()) == ["ok", "ok"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(paused_calls()))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [["ok", "ok"]] * 3 and scheduler.stats['rate_limited'] == 5
+    print("  [OK] Calls from 5 loops, 3 of them at once")
+
+
+if __name__ == "__main__":
+    test_retries_with_backoff()
+    test_timeouts_retried()
+    test_rate_limits_and_priority()
+    test_orchestrator_survives_rate_limits()
+    test_shared_across_loops()
+    print("ALL SCHEDULER TESTS PASSED")
@@ -0,0 +1,249 @@
+"""Test the HTTP story service against the offline fake model"""
+
+import asyncio
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.server import StoryServer
+from bedtime_story_generator.core.story_state import StoryStore
+from bedtime_story_generator.utils.session_log import load_sessions
+
+TEST_DIR = "test_server_output"
+
+
+class CountingOrchestrator(StoryOrchestrator):
+    """Fake-model orchestrator that records how many stories are written at once"""
+
+    active = 0
+    peak = 0
+
+    async def create_short_story_async(self, *args, **kwargs):
+        CountingOrchestrator.active += 1
+        CountingOrchestrator.peak = max(CountingOrchestrator.peak, CountingOrchestrator.active)
+        try:
+            return await super().create_short_story_async(*args, **kwargs)
+        finally:
+            CountingOrchestrator.active -= 1
+
+
+def make_server(**kwargs):
+    return StoryServer(
+        log_dir=f"{TEST_DIR}/logs",
+        state_dir=f"{TEST_DIR}/states",
+        orchestrator_factory=lambda logger: CountingOrchestrator(
+            show_spinner=False,
+            feedback_logger=logger,
+            run_config=fake_run_config(FakeModelConfig(latency_seconds=0.01, story_words=120))
+        ),
+        **kwargs
+    )
+
+
+async def request(port, method, path, body=None, raw=None, headers=""):
+    """Send one request and return the status and decoded body (events for a stream)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = raw if raw is not None else (json.dumps(body).encode() if body is not None else b"")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n{headers}\r\n".encode() + data
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"text/event-stream" in head:
+        events = []
+        for block in payload.decode().strip().split("\n\n"):
+            name, data = block.split("\n")
+            events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+        return status, events
+    return status, json.loads(payload)
+
+
+def serve(test, **kwargs):
+    """Run an async test against a server on a free port"""
+    async def run():
+        server = make_server(**kwargs)
+        await server.start(port=0)
+        try:
+            await test(server, server.port)
+        finally:
+            await server.close()
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    try:
+        asyncio.run(run())
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_short_stories():
+    """Short stories should come back as JSON or as a stream of events"""
+    print("[Testing short stories over HTTP]")
+
+    async def test(server, port):
+        status, result = await request(port, "POST", "/stories", {"user_request": "a sleepy owl"})
+        assert status == 200 and result["story"] and result["evaluation"]["overall_score"] > 0
+
+        status, events = await request(port, "POST", "/stories", {"user_request": "a sleepy owl", "stream": True})
+        assert status == 200 and events[-1][0] == "done"
+        deltas = [data["text"] for name, data in events if name == "delta"]
+        assert len(deltas) > 1 and "".join(deltas) == events[-1][1]["story"]
+
+        status, events = await request(
+            port, "POST", "/stories", {"user_request": "a brave turtle"}, headers="Accept: text/event-stream\r\n"
+        )
+        assert status == 200 and events[-1][0] == "done"
+        print(f"  [OK] JSON story; streamed story in {len(deltas)} events")
+
+    serve(test)
+
+
+def test_errors():
+    """Bad requests should get clear error statuses"""
+    print("[Testing error responses]")
+
+    async def test(server, port):
+        assert (await request(port, "GET", "/nowhere"))[0] == 404
+        assert (await request(port, "GET", "/stories"))[0] == 405
+        assert (await request(port, "POST", "/stories", {}))[0] == 400
+        assert (await request(port, "POST", "/stories", raw=b"{not json"))[0] == 400
+        assert (await request(port, "POST", "/stories", {"user_request": "x" * 3000}))[0] == 400
+        assert (await request(port, "POST", "/stories", raw=b"x" * 70000))[0] == 413
+        assert (await request(port, "POST", "/long-stories", {"user_request": "owls", "max_chapters": 99}))[0] == 400
+        assert (await request(port, "GET", "/long-stories/story_missing"))[0] == 404
+        # rejected before any text, so a plain error rather than an event stream
+        status, result = await request(port, "POST", "/long-stories/story_missing/chapters", {"stream": True})
+        assert status == 404 and "story_missing" in result["error"]
+        status, health = await request(port, "GET", "/health")
+        assert status == 200 and health["server"]["errors"] == 9
+        print("  [OK] 404, 405, 400 and 413 responses")
+
+    serve(test)
+
+
+def test_long_story_session():
+    """A long story should be written, revised and checkpointed chapter by chapter"""
+    print("[Testing long-story sessions]")
+
+    async def test(server, port):
+        status, story = await request(port, "POST", "/long-stories", {"user_request": "a dragon", "max_chapters": 2})
+        assert status == 201 and story["narrative_plan"]["target_length"] == "long"
+        path = f"/long-stories/{story['story_id']}"
+
+        assert (await request(port, "POST", f"{path}/chapters/revise", {"feedback": "more stars"}))[0] == 409
+        status, events = await request(port, "POST", f"{path}/chapters", {"stream": True})
+        assert status == 200 and events[-1][1]["chapter_number"] == 1
+        status, revised = await request(port, "POST", f"{path}/chapters/revise", {"feedback": "more stars"})
+        assert status == 200 and revised["chapter_number"] == 1
+
+        status, chapter = await request(port, "POST", f"{path}/chapters", {"feedback": "a picnic"})
+        assert status == 200 and chapter["chapter_number"] == 2 and chapter["final"]
+        # moving on checkpointed the revised first chapter
+        state = StoryStore(f"{TEST_DIR}/states").load(story["story_id"])
+        assert state.chapters == [revised["chapter"]]
+
+        status, result = await request(port, "GET", path)
+        assert result["chapters"] == [revised["chapter"]] and result["pending_chapter"] == chapter["chapter"]
+        status, result = await request(port, "POST", f"{path}/end")
+        assert status == 200 and result["complete"] and len(result["chapters"]) == 2
+        assert (await request(port, "POST", f"{path}/chapters"))[0] == 409
+
+        # every request went to the story's one feedback session, under its plan
+        server.logger.flush()
+        logged = list(load_sessions(f"{TEST_DIR}/logs"))
+        assert len(logged) == 1 and logged[0]["narrative_plan"]["target_length"] == "long"
+        types = [generation["type"] for generation in logged[0]["generations"]]
+        assert types.count("chapter") == 2 and "user_revision" in types
+        print("  [OK] Created, streamed, revised, continued and ended in one feedback session")
+
+    serve(test)
+
+
+def test_concurrent_sessions():
+    """Many sessions should share a bounded pool of workers and a capped amount of memory"""
+    print("[Testing concurrent sessions]")
+    CountingOrchestrator.peak = 0
+
+    async def test(server, port):
+        shorts = [request(port, "POST", "/stories", {"user_request": f"a sleepy owl #{index}"}) for index in range(6)]
+        longs = [request(port, "POST", "/long-stories", {"user_request": f"a dragon #{index}"}) for index in range(5)]
+        results = await asyncio.gather(*shorts, *longs)
+        assert all(status in (200, 201) for status, _ in results)
+        assert CountingOrchestrator.peak == 2
+
+        story_ids = [result["story_id"] for _, result in results[6:]]
+        chapters = await asyncio.gather(*[
+            request(port, "POST", f"/long-stories/{story_id}/chapters") for story_id in story_ids
+        ])
+        assert all(status == 200 for status, _ in chapters)
+        status, health = await request(port, "GET", "/health")
+        sessions = health["sessions"]
+        assert sessions["resident_bytes"] <= 4000 and sessions["spills"] >= 2
+        assert sessions["resident_sessions"] + sessions["spilled_sessions"] == 5
+
+        # a spilled story comes back with the chapter still waiting for the reader
+        spilled = next(story_id for story_id in story_ids if story_id not in server.sessions)
+        status, result = await request(port, "GET", f"/long-stories/{spilled}")
+        assert status == 200 and result["chapters"] == [] and result["pending_chapter"]
+        status, chapter = await request(port, "POST", f"/long-stories/{spilled}/chapters")
+        assert status == 200 and chapter["chapter_number"] == 2
+        assert server.sessions.metrics()["reloads"] >= 1
+        print(f"  [OK] 11 stories on 2 workers; {sessions['spills']} sessions spilled and reloadable")
+
+    serve(test, workers=2, max_session_bytes=4000)
+
+
+def test_checkpoint_newer_than_spill():
+    """A story carried on elsewhere after it was spilled should come back from its checkpoint"""
+    print("[Testing stale spilled sessions]")
+
+    async def run():
+        server = make_server()
+        await server.start(port=0)
+        try:
+            status, story = await request(server.port, "POST", "/long-stories", {"user_request": "a dragon"})
+            status, chapter = await request(server.port, "POST", f"/long-stories/{story['story_id']}/chapters")
+        finally:
+            # spills the session, pending chapter and all
+            await server.close()
+
+        # the CLI accepts a chapter of its own after the spill
+        time.sleep(0.01)
+        store = StoryStore(f"{TEST_DIR}/states")
+        store.checkpoint_chapter(store.load(story["story_id"]), "The CLI's chapter.")
+
+        server = make_server()
+        await server.start(port=0)
+        try:
+            status, result = await request(server.port, "GET", f"/long-stories/{story['story_id']}")
+            assert result["chapters"] == ["The CLI's chapter."] and result["pending_chapter"] is None
+            status, chapter = await request(server.port, "POST", f"/long-stories/{story['story_id']}/chapters")
+            assert status == 200 and chapter["chapter_number"] == 2
+            assert server.sessions.metrics()["stale_spills"] == 1
+        finally:
+            await server.close()
+
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+    try:
+        asyncio.run(run())
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+    print("  [OK] Checkpoint preferred over the older spill")
+
+
+if __name__ == "__main__":
+    test_short_stories()
+    test_errors()
+    test_long_story_session()
+    test_concurrent_sessions()
+    test_checkpoint_newer_than_spill()
+    print("ALL SERVER TESTS PASSED")
@@ -0,0 +1,137 @@
+"""Test the append-only session event log without making API calls"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+from bedtime_story_generator.utils.session_log import compact_log_dir, read_session_log
+
+TEST_DIR = "test_session_log_feedback_logs"
+
+EVALUATION = JudgeEvaluation(
+    overall_score=8.0,
+    age_appropriate=True,
+    feedback="Lovely",
+    strengths=["warm"],
+    improvements_needed=[],
+    needs_revision=False
+)
+CALL = {
+    'agent': 'Storyteller', 'model': 'gpt-4o-mini', 'stage': 'generate', 'input_tokens': 100,
+    'output_tokens': 50, 'latency_seconds': 0.5, 'cache_hit': False, 'retry_count': 0
+}
+
+
+def log_long_story(logger, chapters):
+    logger.start_session("A dragon who is afraid of the dark", "long")
+    logger.log_narrative_plan(NarrativePlan(
+        story_category="fantasy",
+        story_arc="quest",
+        themes=["courage"],
+        target_length="long",
+        complexity_level="age 5-10",
+        key_elements=["lantern"]
+    ), calls=[dict(CALL, agent='NarrativeDirector', stage='plan')])
+    for chapter_num in range(1, chapters + 1):
+        logger.log_generation("chapter", "Chapter text. " * 200, EVALUATION, chapter_num=chapter_num, calls=[CALL])
+        logger.increment_session_metric('judge', 'calls')
+
+
+def test_appends_instead_of_rewriting():
+    """Each generation should add one line, not rewrite the session"""
+    print("[Testing append-only writes]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        log_long_story(logger, 1)
+        size_after_one = os.path.getsize(logger.event_log_file)
+        for chapter_num in range(2, 21):
+            logger.log_generation("chapter", "Chapter text. " * 200, EVALUATION, chapter_num=chapter_num)
+        growth = os.path.getsize(logger.event_log_file) - size_after_one
+        # roughly one chapter's worth of bytes per chapter
+        assert growth < 19 * len("Chapter text. " * 200) * 1.5
+        assert not os.path.exists(logger.session_file)
+        print(f"  [OK] 19 chapters appended {growth} bytes")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_reader_matches_session():
+    """Replaying the log should rebuild the in-memory session, usage included"""
+    print("[Testing session log reader]")
+    logger = FeedbackLogger(log_dir=TEST_DIR, fsync='always')
+    try:
+        log_long_story(logger, 3)
+        logger.log_user_exit_feedback("More dragons please", "the whole story")
+        rebuilt = read_session_log(logger.event_log_file)
+        assert rebuilt == logger.current_session
+        assert rebuilt['metrics']['usage']['total']['calls'] == 4
+        assert rebuilt['metrics']['judge'] == {'calls': 3}
+        with open(logger.session_file) as f:
+            assert json.load(f) == rebuilt
+        print("  [OK] Replayed session matches, compacted on exit")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_torn_write_recovery():
+    """A partially written last line should lose only that event"""
+    print("[Testing torn write recovery]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        log_long_story(logger, 2)
+        with open(logger.event_log_file, 'a') as f:
+            f.write('{"event": "generation", "generation": {"conte')
+        rebuilt = read_session_log(logger.event_log_file)
+        assert len(rebuilt['generations']) == 2
+
+        written = compact_log_dir(TEST_DIR)
+        assert written == [logger.session_file]
+        assert compact_log_dir(TEST_DIR) == []
+        print("  [OK] Torn line skipped, directory compacted once")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_historical_feedback_reads_logs():
+    """Historical feedback should include sessions that were never compacted"""
+    print("[Testing historical feedback from event logs]")
+    logger = FeedbackLogger(log_dir=TEST_DIR)
+    try:
+        logger.start_session("A sleepy owl", "short")
+        logger.log_user_exit_feedback("Too short", "story")
+        os.remove(logger.session_file)
+        historical = logger.get_historical_feedback()
+        assert [entry['feedback'] for entry in historical] == ["Too short"]
+        print("  [OK] Feedback read from the event log")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_invalid_fsync_policy():
+    """An unknown fsync policy should be rejected"""
+    print("[Testing fsync policy validation]")
+    try:
+        FeedbackLogger(log_dir=TEST_DIR, fsync='sometimes')
+    except ValueError:
+        print("  [OK] ValueError raised")
+    else:
+        raise AssertionError("expected ValueError")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_appends_instead_of_rewriting()
+    test_reader_matches_session()
+    test_torn_write_recovery()
+    test_historical_feedback_reads_logs()
+    test_invalid_fsync_policy()
+    print("ALL SESSION LOG TESTS PASSED")
@@ -0,0 +1,130 @@
+"""Test the long-story session store's memory cap, spilling and reloading"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.memory import NarrativeMemory
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.session_store import (
+    LongStorySession,
+    SessionStore,
+    decode_long_story,
+    encode_long_story,
+)
+from bedtime_story_generator.core.story_state import StoryState
+
+TEST_DIR = "test_session_store_data"
+DB_PATH = f"{TEST_DIR}/sessions.db"
+PLAN = NarrativePlan("adventure", "quest", ["courage"], "long", "age 5-10", ["a dragon"])
+CHAPTER = "The little dragon flew over the sleepy hills, looking for the lost star. " * 40
+
+
+def make_session(index, chapters=3):
+    state = StoryState(
+        story_id=f"story_{index}",
+        user_request=f"a dragon #{index}",
+        narrative_plan=PLAN,
+        max_chapters=5,
+        chapters=[CHAPTER] * chapters,
+        evaluations=[JudgeEvaluation(9.0, True, "Lovely.", ["gentle"], [], False)] + [None] * (chapters - 1),
+        memory=NarrativeMemory(story_so_far="A dragon looked for a star.", chapters_covered=chapters - 1)
+    )
+    return LongStorySession(state, pending_chapter=CHAPTER, pending_memory=state.memory)
+
+
+def test_round_trip():
+    """Encoding should keep everything needed to carry on, compactly"""
+    print("[Testing session encoding]")
+    session = make_session(1)
+    restored = decode_long_story(encode_long_story(session))
+    assert restored.state == session.state
+    assert restored.pending_chapter == CHAPTER and restored.pending_memory == session.pending_memory
+    assert restored.pending_evaluation is None and restored.active == 0
+    session.feedback_session_id = "long_1"
+    assert decode_long_story(encode_long_story(session)).feedback_session_id == "long_1"
+    print(f"  [OK] {len(encode_long_story(session))} bytes of JSON")
+
+
+def test_spill_and_reload():
+    """Idle sessions past the cap should go to disk and come back on demand"""
+    print("[Testing spilling and reloading]")
+    size = len(encode_long_story(make_session(0)))
+    store = SessionStore(DB_PATH, max_bytes=size * 3)
+    try:
+        for index in range(5):
+            store.add(make_session(index))
+        metrics = store.metrics()
+        assert metrics["resident_sessions"] == 3 and metrics["spilled_sessions"] == 2
+        assert metrics["resident_bytes"] <= size * 3
+        assert "story_0" not in store and "story_4" in store
+
+        # busy sessions are never spilled
+        store.get("story_2").active = 1
+        session = store.get("story_0")
+        assert session.state.chapters == [CHAPTER] * 3 and session.pending_chapter == CHAPTER
+        assert "story_2" in store and "story_3" not in store
+
+        # a session that grew is re-measured
+        session.state.chapters.append(CHAPTER)
+        store.update(session)
+        assert store.resident_bytes <= size * 3 + len(CHAPTER) + 100
+        assert store.get("story_missing") is None
+
+        metrics = store.metrics()
+        assert metrics["reloads"] == 1 and metrics["reload_ms_max"] < 50
+        store.remove("story_1")
+        assert store.get("story_1") is None
+        print(f"  [OK] {metrics['spills']} spills; reloaded in {metrics['reload_ms_max']:.2f}ms")
+    finally:
+        store.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_survives_restart():
+    """Closing the store should spill every session so a new store can reload them"""
+    print("[Testing sessions across restarts]")
+    store = SessionStore(DB_PATH)
+    try:
+        store.add(make_session(1))
+        store.close()
+        store = SessionStore(DB_PATH)
+        assert len(store) == 0
+        session = store.get("story_1")
+        assert session is not None and session.pending_chapter == CHAPTER
+        print("  [OK] Pending chapter kept across a restart")
+    finally:
+        store.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_stale_spill_dropped():
+    """A spill older than the story's checkpoint should be dropped rather than reloaded"""
+    print("[Testing stale spills]")
+    store = SessionStore(DB_PATH)
+    try:
+        store.add(make_session(1))
+        store.add(make_session(2))
+        store.close()
+        store = SessionStore(DB_PATH)
+        assert store.get("story_1", valid_after=time.time() + 1) is None
+        assert store.get("story_1") is None
+        assert store.get("story_2", valid_after=time.time() - 60) is not None
+        assert store.metrics()["stale_spills"] == 1
+        print("  [OK] Spill behind the checkpoint dropped")
+    finally:
+        store.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_spill_and_reload()
+    test_survives_restart()
+    test_stale_spill_dropped()
+    print("ALL SESSION STORE TESTS PASSED")
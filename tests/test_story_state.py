@@ -0,0 +1,128 @@
+"""Test long-story checkpoints and resuming without making API calls"""
+
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.core.memory import NarrativeMemory
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.story_state import StoryStore
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_story_state_dir"
+REQUEST = "A dragon who is afraid of the dark"
+
+
+class CountingOrchestrator(StoryOrchestrator):
+    """Orchestrator that counts the agents it calls"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.agent_calls = Counter()
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        self.agent_calls[agent.name] += 1
+        return await super()._run_agent(agent, prompt, on_delta)
+
+
+def make_orchestrator():
+    return CountingOrchestrator(
+        show_spinner=False,
+        feedback_logger=FeedbackLogger(log_dir=f"{TEST_DIR}/logs"),
+        run_config=fake_run_config(FakeModelConfig(story_words=80))
+    )
+
+
+def plan():
+    return NarrativePlan(
+        story_category="adventure",
+        story_arc="courage",
+        themes=["bravery"],
+        target_length="long",
+        complexity_level="age 5-10",
+        key_elements=["dragon"]
+    )
+
+
+def test_checkpoint_round_trip():
+    """A reloaded story should match the one that was checkpointed"""
+    print("[Testing story checkpoint round trip]")
+    store = StoryStore(f"{TEST_DIR}/states")
+    try:
+        state = store.create(REQUEST, plan(), max_chapters=5)
+        evaluation = JudgeEvaluation(8.5, True, "ok", [], [], False)
+        store.checkpoint_chapter(state, "Chapter one.", evaluation)
+        store.checkpoint_chapter(state, "Chapter two.", None, NarrativeMemory(story_so_far="One.", chapters_covered=1))
+        store.set_next_chapter_feedback(state, "more stars")
+
+        loaded = store.load(state.story_id)
+        assert loaded == state
+        assert loaded.chapters == ["Chapter one.", "Chapter two."]
+        assert loaded.evaluations == [evaluation, None]
+        assert loaded.memory.chapters_covered == 1
+        assert loaded.next_chapter_feedback == "more stars"
+        assert loaded.next_chapter_number == 3
+
+        store.checkpoint_chapter(state, "Chapter three.")
+        assert store.load(state.story_id).next_chapter_feedback is None
+        assert [story.story_id for story in store.list_stories()] == [state.story_id]
+        store.mark_complete(state)
+        assert store.list_stories() == []
+        # the finished story is compacted to a snapshot that loads without a replay
+        assert os.path.exists(f"{TEST_DIR}/states/{state.story_id}.json")
+        assert store.load(state.story_id) == state and state.complete
+        assert store.list_stories(resumable_only=False) == [state]
+        print("  [OK] Chapters, evaluations, memory and feedback restored")
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_resume_skips_planning_and_memory():
+    """Resuming should cost only the next chapter's calls"""
+    print("[Testing resume without re-planning]")
+    store = StoryStore(f"{TEST_DIR}/states")
+    orchestrator = make_orchestrator()
+    try:
+        narrative_plan = orchestrator.init_long_story(REQUEST)
+        state = store.create(REQUEST, narrative_plan)
+        for chapter_num in range(1, 4):
+            chapter, evaluation = orchestrator.generate_next_chapter(
+                REQUEST, narrative_plan, list(state.chapters), chapter_num
+            )
+            memory = orchestrator.latest_memory(REQUEST, state.chapters + [chapter])
+            store.checkpoint_chapter(state, chapter, evaluation, memory)
+        assert state.memory.chapters_covered == 2
+        orchestrator.close()
+
+        resumed_orchestrator = make_orchestrator()
+        try:
+            resumed = store.load(state.story_id)
+            resumed_plan = resumed_orchestrator.resume_long_story(resumed)
+            assert resumed_plan == narrative_plan
+            chapter, _ = resumed_orchestrator.generate_next_chapter(
+                REQUEST, resumed_plan, resumed.chapters, resumed.next_chapter_number
+            )
+            calls = resumed_orchestrator.agent_calls
+            assert calls["NarrativeDirector"] == 0
+            # only the last checkpointed chapter still needs folding into the memory
+            assert calls["MemoryKeeper"] == 1
+            assert calls["Storyteller"] == 1
+            print(f"  [OK] Chapter 4 after resume made {sum(calls.values())} calls: {dict(calls)}")
+        finally:
+            resumed_orchestrator.close()
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_checkpoint_round_trip()
+    test_resume_skips_planning_and_memory()
+    print("ALL STORY STATE TESTS PASSED")
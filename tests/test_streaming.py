@@ -0,0 +1,106 @@
+"""Test streaming story output without making API calls"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_streaming_logs"
+
+PLAN = NarrativePlan(
+    story_category="animals",
+    story_arc="discovery",
+    themes=["sharing"],
+    target_length="short",
+    complexity_level="age 5-10",
+    key_elements=["bunny"]
+)
+
+
+class StreamingStub(StoryOrchestrator):
+    """Streams canned stories word by word; by default the revision scores worse than the draft"""
+
+    def __init__(self, judge_scores=(6.0, 5.0, 5.0)):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+        self.judge_scores = list(judge_scores)
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        if agent.name == 'NarrativeDirector':
+            return PLAN
+        if agent.name == 'Judge':
+            score = self.judge_scores.pop(0)
+            return JudgeEvaluation(**{'overall_score': score, 'age_appropriate': True, 'feedback': 'meh',
+                               'strengths': [], 'improvements_needed': ['more detail'],
+                               'needs_revision': score < 8.0})
+        text = "A revised tale." if agent.name == 'RevisionAgent' else "Once upon a time a bunny shared."
+        if on_delta:
+            for word in text.split(' '):
+                await asyncio.sleep(0)
+                on_delta(word + ' ')
+        return text
+
+
+def test_generate_story_stream():
+    """generate_story_stream should yield the story in pieces"""
+    print("[Testing generate_story_stream]")
+    orchestrator = StreamingStub()
+
+    async def collect():
+        return [d async for d in orchestrator.generate_story_stream("a bunny", PLAN)]
+
+    try:
+        deltas = asyncio.run(collect())
+    finally:
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+    assert len(deltas) > 1
+    assert ''.join(deltas).strip() == "Once upon a time a bunny shared."
+    print(f"  [OK] {len(deltas)} deltas streamed")
+
+
+def test_streamed_draft_kept_when_revision_scores_worse():
+    """A revision should only replace streamed text if it scores better"""
+    print("[Testing streamed draft acceptance]")
+    orchestrator = StreamingStub()
+    orchestrator.max_revisions = 1
+    streamed = []
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("a bunny", on_delta=streamed.append)
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+    assert ''.join(streamed).strip() == story
+    assert evaluation.overall_score == 6.0
+    assert revision_count == 1
+    print("  [OK] Streamed draft kept")
+
+
+def test_streamed_draft_kept_on_tie():
+    """A revision that only ties the streamed draft should not replace it"""
+    print("[Testing streamed draft acceptance on a tie]")
+    orchestrator = StreamingStub(judge_scores=(6.0, 6.0))
+    orchestrator.max_revisions = 1
+    streamed = []
+    try:
+        story, evaluation, revision_count = orchestrator.create_short_story("a bunny", on_delta=streamed.append)
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+    assert ''.join(streamed).strip() == story == "Once upon a time a bunny shared."
+    assert evaluation.overall_score == 6.0
+    assert revision_count == 1
+    print("  [OK] Streamed draft kept on a tie")
+
+
+if __name__ == "__main__":
+    test_generate_story_stream()
+    test_streamed_draft_kept_when_revision_scores_worse()
+    test_streamed_draft_kept_on_tie()
+    print("ALL STREAMING TESTS PASSED")
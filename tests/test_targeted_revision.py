@@ -0,0 +1,138 @@
+"""Test paragraph-level targeted revisions without making API calls"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+# Add src directory to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bedtime_story_generator.agents.providers import FakeModelConfig, fake_run_config
+from bedtime_story_generator.agents.schemas import ParagraphReplacementOutput, ParagraphRevisionOutput
+from bedtime_story_generator.core.models import JudgeEvaluation, NarrativePlan
+from bedtime_story_generator.core.orchestrator import StoryOrchestrator
+from bedtime_story_generator.core.paragraphs import flagged_paragraphs, number_paragraphs, split_paragraphs
+from bedtime_story_generator.utils.feedback_logger import FeedbackLogger
+
+TEST_DIR = "test_targeted_revision_logs"
+STORY = "\n\n".join(f"Paragraph {n} of the story." for n in range(1, 7))
+PLAN = NarrativePlan(
+    story_category="adventure",
+    story_arc="discovery",
+    themes=["sharing"],
+    target_length="short",
+    complexity_level="age 5-10",
+    key_elements=[]
+)
+
+
+def evaluation(*paragraphs):
+    return JudgeEvaluation(
+        overall_score=6.5,
+        age_appropriate=True,
+        feedback="The middle drags.",
+        strengths=[],
+        improvements_needed=["tighten the middle"],
+        needs_revision=True,
+        paragraph_issues=[{"paragraph": n, "issue": f"fix paragraph {n}"} for n in paragraphs]
+    )
+
+
+class RevisionStub(StoryOrchestrator):
+    """Orchestrator whose revision agents return canned edits"""
+
+    def __init__(self, replacements=None):
+        super().__init__(show_spinner=False, feedback_logger=FeedbackLogger(log_dir=TEST_DIR))
+        self.replacements = replacements
+        self.prompts = {}
+
+    async def _run_agent(self, agent, prompt, on_delta=None):
+        await asyncio.sleep(0)
+        self.prompts[agent.name] = prompt
+        if agent.name == 'TargetedRevisionAgent':
+            return ParagraphRevisionOutput(replacements=[
+                ParagraphReplacementOutput(paragraph=n, text=text) for n, text in self.replacements.items()
+            ])
+        return "A completely rewritten story."
+
+
+def test_paragraph_helpers():
+    """Paragraphs should split, number and filter flagged issues"""
+    print("[Testing paragraph helpers]")
+    paragraphs = split_paragraphs("One.\n\n\nTwo.\n  \nThree.")
+    assert paragraphs == ["One.", "Two.", "Three."]
+    assert number_paragraphs(paragraphs) == "[1] One.\n\n[2] Two.\n\n[3] Three."
+    issues = [{"paragraph": 2, "issue": "a"}, {"paragraph": 2, "issue": "b"}, {"paragraph": 9, "issue": "c"}]
+    assert flagged_paragraphs(issues, 3) == {2: ["a", "b"]}
+    print("  [OK] split, numbered and filtered")
+
+
+def test_only_flagged_paragraphs_replaced():
+    """A targeted revision should splice replacements into the original"""
+    print("[Testing targeted revision splice]")
+    orchestrator = RevisionStub({3: "A tighter third paragraph.", 5: "Ignored, not flagged."})
+    try:
+        revised = orchestrator.revise_story(STORY, evaluation(3), "a story", PLAN)
+        paragraphs = split_paragraphs(revised)
+        assert paragraphs[2] == "A tighter third paragraph."
+        assert paragraphs[:2] + paragraphs[3:] == split_paragraphs(STORY)[:2] + split_paragraphs(STORY)[3:]
+        assert "Paragraph 3 issue: fix paragraph 3" in orchestrator.prompts['TargetedRevisionAgent']
+        assert 'RevisionAgent' not in orchestrator.prompts
+        assert orchestrator.revision_mode_stats == {'targeted': 1, 'full': 0}
+        print("  [OK] Only paragraph 3 rewritten")
+    finally:
+        orchestrator.close()
+        shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def test_full_rewrite_fallbacks():
+    """Widespread issues, unusable edits and user feedback should rewrite the whole story"""
+    print("[Testing full rewrite fallbacks]")
+    cases = [
+        (evaluation(1, 2, 3, 4), {1: "x"}, None),
+        (evaluation(2), {}, None),
+        (evaluation(), {1: "x"}, None),
+        (evaluation(2), {2: "x"}, "make it funnier"),
+    ]
+    for case_evaluation, replacements, user_feedback in cases:
+        orchestrator = RevisionStub(replacements)
+        try:
+            revised = orchestrator.revise_story(STORY, case_evaluation, "a story", PLAN, user_feedback)
+            assert revised == "A completely rewritten story."
+            assert orchestrator.revision_mode_stats['full'] == 1
+        finally:
+            orchestrator.close()
+            shutil.rmtree(TEST_DIR, ignore_errors=True)
+    print(f"  [OK] {len(cases)} cases fell back to a full rewrite")
+
+
+def test_fake_provider_targeted_revisions():
+    """End to end, targeted revisions should cost far fewer output tokens"""
+    print("[Testing targeted revision token savings]")
+    output_tokens = {}
+    for mode in ('full', 'targeted'):
+        orchestrator = StoryOrchestrator(
+            show_spinner=False,
+            feedback_logger=FeedbackLogger(log_dir=TEST_DIR),
+            run_config=fake_run_config(FakeModelConfig(revision_rate=1.0))
+        )
+        orchestrator.revision_mode = mode
+        try:
+            orchestrator.create_short_story("a sleepy owl")
+            output_tokens[mode] = orchestrator.usage.summary()['by_stage']['revise']['output_tokens']
+            assert orchestrator.revision_mode_stats[mode] == 1
+        finally:
+            orchestrator.close()
+            shutil.rmtree(TEST_DIR, ignore_errors=True)
+    assert output_tokens['targeted'] * 4 < output_tokens['full']
+    print(f"  [OK] Revision output tokens {output_tokens['full']} -> {output_tokens['targeted']}")
+
+
+if __name__ == "__main__":
+    test_paragraph_helpers()
+    test_only_flagged_paragraphs_replaced()
+    test_full_rewrite_fallbacks()
+    test_fake_provider_targeted_revisions()
+    print("ALL TARGETED REVISION TESTS PASSED")